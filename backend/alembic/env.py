@@ -13,7 +13,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from app.core.config import get_settings
-from app.core.database import engine
+from app.core.search import SEARCH_TABLE
 from app.models import *  # noqa: F401, F403 - Import all models for autogenerate
 from sqlmodel import SQLModel
 
@@ -34,6 +34,15 @@ config.set_main_option("sqlalchemy.url", settings.database_url)
 # for 'autogenerate' support
 target_metadata = SQLModel.metadata
 
+
+
+def include_name(name, type_, parent_names):
+    # The listing search index (and its FTS5 shadow tables) is managed outside the metadata.
+    if type_ == "table" and name.startswith(SEARCH_TABLE):
+        return False
+    return True
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -58,6 +67,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_name=include_name,
     )
 
     with context.begin_transaction():
@@ -79,7 +89,7 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata, include_name=include_name
         )
 
         with context.begin_transaction():
@@ -0,0 +1,69 @@
+"""servicelisting search index
+
+Revision ID: 7db186819efd
+Revises: a981455cd21f
+Create Date: 2026-10-18 18:32:10.514207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7db186819efd'
+down_revision: Union[str, None] = 'a981455cd21f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Written out rather than imported from app.core.search, so this revision keeps building
+# the schema it was written for whatever that module later becomes.
+PG_DOCUMENT = (
+    "setweight(to_tsvector('english', coalesce(l.title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(c.name, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(l.description, '')), 'C')"
+)
+
+
+def upgrade() -> None:
+    # tsvector + GIN on PostgreSQL, FTS5 virtual table on SQLite.
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute(
+            """
+            CREATE TABLE IF NOT EXISTS servicelisting_search (
+                listing_id INTEGER PRIMARY KEY REFERENCES servicelisting(id) ON DELETE CASCADE,
+                document tsvector NOT NULL
+            )
+            """
+        )
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_servicelisting_search_document "
+            "ON servicelisting_search USING GIN (document)"
+        )
+        op.execute(
+            f"""
+            INSERT INTO servicelisting_search (listing_id, document)
+            SELECT l.id, {PG_DOCUMENT} FROM servicelisting l
+            LEFT JOIN servicecategory c ON c.id = l.category_id
+            """
+        )
+    else:
+        # Column order matters for the bm25() weights used by the search query.
+        op.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS servicelisting_search "
+            "USING fts5(title, category, description, tokenize='porter unicode61')"
+        )
+        op.execute(
+            """
+            INSERT INTO servicelisting_search (rowid, title, category, description)
+            SELECT l.id, l.title, coalesce(c.name, ''), l.description FROM servicelisting l
+            LEFT JOIN servicecategory c ON c.id = l.category_id
+            """
+        )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS servicelisting_search")
@@ -1,48 +1,353 @@
-from typing import Annotated
+import json
+import logging
+import math
+from collections.abc import Awaitable, Callable, Iterable
+from typing import Annotated, Any
 
-from fastapi import Depends, HTTPException, Request, status
+from fastapi import Depends, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer
-from sqlmodel import Session, select
+from sqlalchemy import event
+from sqlalchemy.orm import Session as OrmSession
+from sqlalchemy.orm import object_session
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from ..core import database
+from ..core.cache import TTLCache, get_redis, publish_invalidation, register_invalidation
 from ..core.config import get_settings
-from ..core.database import get_session
+from ..core.database import get_async_session, get_read_session, get_session
+from ..core.geo import NearFilter
+from ..core.ratelimit import hit, parse_rate
 from ..core.security import decode_token
-from ..models.user import User
+from ..models.user import User, UserRole
 
-settings = get_settings()
+logger = logging.getLogger(__name__)
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.api_v1_prefix}/auth/login")
+
+class _PrefixedPasswordBearer(OAuth2PasswordBearer):
+    """Password bearer whose documented token URL follows the configured API prefix."""
+
+    @property
+    def model(self) -> Any:
+        self._model.flows.password.tokenUrl = f"{get_settings().api_v1_prefix}/auth/login"
+        return self._model
+
+    @model.setter
+    def model(self, value: Any) -> None:
+        self._model = value
+
+
+oauth2_scheme = _PrefixedPasswordBearer(tokenUrl="/auth/login", scheme_name="OAuth2PasswordBearer")
+
+# Principals are cached as column snapshots (never including the password hash) and
+# rebuilt into detached ``User`` objects, so no ORM state is shared between requests.
+principal_cache = TTLCache(
+    max_entries=lambda: get_settings().principal_cache_max_entries,
+    ttl_seconds=lambda: get_settings().principal_cache_ttl_seconds,
+)
+
+
+def _principal_key(user_id: int) -> str:
+    return f"principal:{user_id}"
+
+
+def _load_cached_principal(user_id: int) -> dict[str, Any] | None:
+    settings = get_settings()
+    snapshot = principal_cache.get(user_id)
+    if snapshot is not None or not settings.principal_cache_use_redis:
+        return snapshot
+
+    try:
+        raw = get_redis().get(_principal_key(user_id))
+    except Exception:  # Redis is an optimisation; fall back to the database.
+        logger.warning("Principal cache lookup in Redis failed", exc_info=True)
+        return None
+    if raw is None:
+        return None
+    snapshot = json.loads(raw)
+    principal_cache.set(user_id, snapshot)
+    return snapshot
+
+
+def _store_principal(user: User) -> None:
+    settings = get_settings()
+    snapshot = user.model_dump(mode="json", exclude={"password_hash"})
+    principal_cache.set(user.id, snapshot)
+    if settings.principal_cache_use_redis:
+        try:
+            get_redis().set(
+                _principal_key(user.id),
+                json.dumps(snapshot),
+                ex=settings.principal_cache_ttl_seconds,
+            )
+        except Exception:
+            logger.warning("Principal cache write to Redis failed", exc_info=True)
+
+
+def invalidate_principal(user_id: int) -> None:
+    """Forget a user's cached principal in Redis and in every worker's in-process cache."""
+    # Redis first, so no worker refills its local copy from the stale shared one.
+    if get_settings().principal_cache_use_redis:
+        try:
+            get_redis().delete(_principal_key(user_id))
+        except Exception:
+            logger.warning("Principal cache invalidation in Redis failed", exc_info=True)
+    publish_invalidation("principal", str(user_id))
+
+
+register_invalidation("principal", lambda key: principal_cache.delete(int(key)))
+
+
+def track_principal_writes(session: OrmSession, user_ids: Iterable[int]) -> None:
+    """Drop these users' cached principals when ``session`` commits.
+
+    For core UPDATE/DELETE statements on users, which skip the per-object mapper events below.
+    """
+    session.info.setdefault("principal_users", set()).update(user_ids)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _user_changed(mapper, connection, target: User) -> None:
+    session = object_session(target)
+    if session is not None:
+        track_principal_writes(session, (target.id,))
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _invalidate_committed_principals(session: OrmSession) -> None:
+    # After commit, so a request racing the write can't re-cache the row as it was before.
+    for user_id in session.info.pop("principal_users", ()):
+        invalidate_principal(user_id)
+
+
+@event.listens_for(OrmSession, "after_rollback")
+def _forget_rolled_back_principals(session: OrmSession) -> None:
+    session.info.pop("principal_users", None)
+
+
+# Users who committed a write within the stickiness window; their reads go to the primary.
+recent_writers = TTLCache(
+    max_entries=100_000, ttl_seconds=lambda: get_settings().read_your_writes_seconds
+)
+
+
+def _recent_write_key(user_id: int) -> str:
+    return f"recent-write:{user_id}"
+
+
+def mark_recent_write(user_id: int) -> None:
+    settings = get_settings()
+    recent_writers.set(user_id, True)
+    if settings.read_your_writes_use_redis:
+        try:
+            get_redis().set(
+                _recent_write_key(user_id), 1, px=int(settings.read_your_writes_seconds * 1000)
+            )
+        except Exception:
+            logger.warning("Recording recent write in Redis failed", exc_info=True)
+
+
+def wrote_recently(user_id: int) -> bool:
+    if recent_writers.get(user_id):
+        return True
+    if get_settings().read_your_writes_use_redis:
+        try:
+            return bool(get_redis().exists(_recent_write_key(user_id)))
+        except Exception:
+            logger.warning("Recent write lookup in Redis failed", exc_info=True)
+            return True
+    return False
+
+
+@event.listens_for(OrmSession, "after_flush")
+def _flag_session_write(session: OrmSession, flush_context) -> None:
+    session.info["has_writes"] = True
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _remember_recent_writer(session: OrmSession) -> None:
+    user_id = session.info.get("user_id")
+    if session.info.pop("has_writes", False) and user_id is not None:
+        mark_recent_write(user_id)
+
+
+def _bearer_subject(request: Request) -> int | None:
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return int(decode_token(token, expected_type="access")["sub"])
+    except (HTTPException, KeyError, ValueError):
+        return None
+
+
+async def _rate_limit_key(request: Request, key: str) -> str | None:
+    if key == "ip":
+        return request.client.host if request.client else None
+    if key == "user":
+        user_id = _bearer_subject(request)
+        return str(user_id) if user_id is not None else None
+    if key == "phone":
+        # FastAPI has already read the body for the endpoint, so these are cached re-reads.
+        if request.headers.get("content-type", "").startswith("application/json"):
+            body = await request.json()
+            phone = body.get("phone") if isinstance(body, dict) else None
+        else:
+            form = await request.form()
+            phone = form.get("username") or form.get("phone")
+        return phone.strip() if isinstance(phone, str) and phone.strip() else None
+    raise ValueError(f"Unknown rate limit key {key!r}")
+
+
+def rate_limit(route: str) -> Callable[[Request], Awaitable[None]]:
+    """Dependency enforcing ``Settings.rate_limits[route]``, answering 429 once a bucket is empty.
+
+    Pass it in the route decorator's ``dependencies`` so it runs before the handler's own
+    parameters (sessions, password hashing) are resolved.
+    """
+
+    async def check_rate_limit(request: Request) -> None:
+        settings = get_settings()
+        if not settings.rate_limit_enabled:
+            return
+        for key, spec in settings.rate_limits.get(route, {}).items():
+            value = await _rate_limit_key(request, key)
+            if value is None:
+                continue
+            bucket = f"ratelimit:{route}:{key}:{value}"
+            if settings.rate_limit_use_redis:
+                retry_after = await run_in_threadpool(hit, bucket, parse_rate(spec))
+            else:
+                retry_after = hit(bucket, parse_rate(spec))
+            if retry_after:
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail="Too many requests",
+                    headers={"Retry-After": str(math.ceil(retry_after))},
+                )
+
+    return check_rate_limit
 
 
 def get_db():
     yield from get_session()
 
 
-def get_current_user(
-    token: Annotated[str, Depends(oauth2_scheme)],
-    session: Annotated[Session, Depends(get_db)],
-) -> User:
+def get_read_db(request: Request):
+    """Session for read-only handlers: the replica, unless the caller just wrote something."""
+    read_engine = database.get_read_engine()
+    user_id = _bearer_subject(request) if read_engine is not None else None
+    if read_engine is None or (user_id is not None and wrote_recently(user_id)):
+        yield from get_session()
+    else:
+        yield from get_read_session()
+
+
+def get_export_db() -> Session:
+    """A session that outlives the handler, for streamed responses.
+
+    Dependencies with ``yield`` are torn down before the body is sent, so the streaming
+    generator takes ownership of this one and closes it once the last row is out.
+    """
+    return Session(database.get_read_engine() or database.get_engine())
+
+
+def get_session_factory() -> Callable[[], Session]:
+    """Fresh sessions for work that outlives the request, such as WebSocket receipt batches."""
+    return lambda: Session(database.get_engine())
+
+
+async def get_async_db():
+    async for session in get_async_session():
+        yield session
+
+
+def _token_user_id(token: str) -> int:
     payload = decode_token(token, expected_type="access")
     user_id = payload.get("sub")
     if not user_id:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload")
+    return int(user_id)
+
+
+def _cached_principal(user_id: int) -> User | None:
+    snapshot = _load_cached_principal(user_id)
+    if snapshot is None:
+        return None
+    return User.model_validate(snapshot, update={"password_hash": ""})
 
-    user = session.get(User, user_id)
+
+def _ensure_active(user: User | None) -> User:
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
-
     if not user.is_active:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Inactive user")
+    return user
+
+
+def authenticate_token(token: str, session: Session) -> User:
+    user_id = _token_user_id(token)
+    session.info["user_id"] = user_id
+    user = _cached_principal(user_id)
+    if user is None:
+        user = session.get(User, user_id)
+        if user:
+            _store_principal(user)
+    return _ensure_active(user)
+
 
+async def authenticate_token_async(token: str, session: AsyncSession) -> User:
+    """``authenticate_token`` on the async session, without borrowing a threadpool thread.
+
+    Only the optional Redis tier of the principal cache is blocking I/O, so only that goes
+    through the threadpool.
+    """
+    settings = get_settings()
+    user_id = _token_user_id(token)
+    # The commit hooks are registered on ORM sessions, i.e. the async session's sync_session.
+    session.sync_session.info["user_id"] = user_id
+    if settings.principal_cache_use_redis:
+        user = await run_in_threadpool(_cached_principal, user_id)
+    else:
+        user = _cached_principal(user_id)
+    if user is None:
+        user = await session.get(User, user_id)
+        if user and settings.principal_cache_use_redis:
+            await run_in_threadpool(_store_principal, user)
+        elif user:
+            _store_principal(user)
+    return _ensure_active(user)
+
+
+def _require_provider(user: User) -> User:
+    if user.role != UserRole.SERVICE_PROVIDER:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Only providers can perform this action"
+        )
     return user
 
 
+def get_current_user(
+    token: Annotated[str, Depends(oauth2_scheme)],
+    session: Annotated[Session, Depends(get_db)],
+) -> User:
+    return authenticate_token(token, session)
+
+
 def get_current_active_provider(
     current_user: Annotated[User, Depends(get_current_user)],
 ) -> User:
-    if current_user.role != "SERVICE_PROVIDER":
+    return _require_provider(current_user)
+
+
+def get_current_admin(
+    current_user: Annotated[User, Depends(get_current_user)],
+) -> User:
+    if current_user.role != UserRole.ADMIN:
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN, detail="Only providers can perform this action"
+            status_code=status.HTTP_403_FORBIDDEN, detail="Only admins can perform this action"
         )
     return current_user
 
@@ -52,3 +357,40 @@ def get_current_active_user(
 ) -> User:
     return current_user
 
+
+# The async routers' principal: authenticated on the request's AsyncSession, and every link is
+# ``async def`` so FastAPI runs it on the event loop rather than in the threadpool.
+async def get_current_user_async(
+    token: Annotated[str, Depends(oauth2_scheme)],
+    session: Annotated[AsyncSession, Depends(get_async_db)],
+) -> User:
+    return await authenticate_token_async(token, session)
+
+
+async def get_current_active_user_async(
+    current_user: Annotated[User, Depends(get_current_user_async)],
+) -> User:
+    return current_user
+
+
+async def get_current_active_provider_async(
+    current_user: Annotated[User, Depends(get_current_user_async)],
+) -> User:
+    return _require_provider(current_user)
+
+
+def get_near_filter(
+    near: str | None = Query(default=None, description="Search centre as `lat,lon`"),
+    radius_km: float = Query(default=10, gt=0, le=200),
+) -> NearFilter | None:
+    if near is None:
+        return None
+    try:
+        latitude, longitude = (float(part) for part in near.split(","))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="near must be `lat,lon`"
+        ) from None
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="near out of range")
+    return NearFilter(latitude, longitude, radius_km)
@@ -2,27 +2,104 @@ from datetime import timedelta
 import re
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
 from sqlmodel import Session, select
 
 from ...core.config import get_settings
 from ...core.database import get_session
-from ...core.security import create_token, decode_token, get_password_hash, verify_password
-from ...models.address import Address, AddressCreate
-from ...models.availability import Availability, AvailabilityCreate, DayOfWeek
+from ...core.security import (
+    create_token,
+    decode_token,
+    get_password_hash_async,
+    verify_password_async,
+)
+from ...core.slots import track_slot_providers
+from ...models.address import Address
+from ...models.availability import Availability
 from ...models.user import User, UserCreate, UserRead, UserRole
+from ..deps import rate_limit
 
 router = APIRouter(prefix="/auth", tags=["auth"])
-settings = get_settings()
 
 
-@router.post("/register", response_model=UserRead, status_code=status.HTTP_201_CREATED)
-def register_user(payload: UserCreate, session: Session = Depends(get_session)) -> User:
-    phone_value = payload.phone.strip()
-    existing_phone = session.exec(select(User).where(User.phone == phone_value)).first()
-    if existing_phone:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Phone already in use")
+def _get_user_by_phone(session: Session, phone_value: str) -> User | None:
+    return session.exec(select(User).where(User.phone == phone_value)).first()
+
+
+def _duplicate_user(error: IntegrityError) -> HTTPException:
+    # SQLite names the column ("user.email"), PostgreSQL the index ("ix_user_email").
+    field = "Email" if "email" in str(error.orig).lower() else "Phone"
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"{field} already in use")
+
+
+def _create_user(
+    session: Session,
+    payload: UserCreate,
+    phone_value: str,
+    email_value: str | None,
+    password_hash: str,
+) -> UserRead:
+    """Insert the user, address and availability in one transaction.
+
+    Duplicate phones or emails surface as unique-constraint violations on the flush, so
+    nothing is left half-created and no lookup precedes the insert.
+    """
+    user = User(
+        phone=phone_value,
+        email=email_value,
+        password_hash=password_hash,
+        first_name=payload.first_name,
+        last_name=payload.last_name,
+        avatar_url=payload.avatar_url,
+        bio=payload.bio,
+        role=payload.role if payload.role else UserRole.SERVICE_SEEKER,
+    )
+    session.add(user)
+    try:
+        session.flush()
+    except IntegrityError as error:
+        session.rollback()
+        raise _duplicate_user(error) from error
+
+    if payload.address:
+        session.add(Address(user_id=user.id, **payload.address.model_dump()))
+
+    # Availability only applies to providers; one multi-row INSERT for the whole week.
+    if payload.availability and user.role == UserRole.SERVICE_PROVIDER:
+        session.exec(
+            insert(Availability),
+            params=[
+                Availability(user_id=user.id, **window.model_dump()).model_dump(exclude={"id"})
+                for window in payload.availability
+            ],
+        )
+        track_slot_providers(session, [user.id])
 
+    # Every column is known after the flush, so the response needs no refresh afterwards.
+    created = UserRead.model_validate(user)
+    session.commit()
+    return created
+
+
+@router.post(
+    "/register",
+    response_model=UserRead,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(rate_limit("auth.register"))],
+)
+async def register_user(
+    payload: UserCreate, session: Session = Depends(get_session)
+) -> UserRead:
+    if payload.role == UserRole.ADMIN:
+        # Admins are granted out of band (python -m app.core.admins), never self-registered.
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Admin accounts cannot be registered"
+        )
+
+    phone_value = payload.phone.strip()
     if len(phone_value) != 11 or not phone_value.isdigit():
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -38,70 +115,26 @@ def register_user(payload: UserCreate, session: Session = Depends(get_session))
             detail="Password must be at least 8 characters with a capital letter, number, and symbol",
         )
 
-    if payload.email:
-        email_value = payload.email.lower().strip()
-        existing_email = session.exec(select(User).where(User.email == email_value)).first()
-        if existing_email:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already in use")
-    else:
-        email_value = None
-
-    user = User(
-        phone=phone_value,
-        email=email_value,
-        password_hash=get_password_hash(payload.password),
-        first_name=payload.first_name,
-        last_name=payload.last_name,
-        avatar_url=payload.avatar_url,
-        bio=payload.bio,
-        role=payload.role if payload.role else UserRole.SERVICE_SEEKER,
+    email_value = payload.email.lower().strip() if payload.email else None
+    password_hash = await get_password_hash_async(payload.password)
+    return await run_in_threadpool(
+        _create_user, session, payload, phone_value, email_value, password_hash
     )
-    session.add(user)
-    session.commit()
-    session.refresh(user)
 
-    # Create address if provided
-    if payload.address:
-        address = Address(
-            user_id=user.id,
-            street=payload.address.street,
-            city=payload.address.city,
-            state=payload.address.state,
-            postal_code=payload.address.postal_code,
-            notes=payload.address.notes,
-        )
-        session.add(address)
-        session.commit()
 
-    # Create availability records if provided (for service providers)
-    if payload.availability and user.role == UserRole.SERVICE_PROVIDER:
-        for avail_data in payload.availability:
-            availability = Availability(
-                user_id=user.id,
-                day_of_week=avail_data.day_of_week,
-                start_time=avail_data.start_time,
-                end_time=avail_data.end_time,
-                is_available=avail_data.is_available,
-            )
-            session.add(availability)
-        session.commit()
-
-    session.refresh(user)
-    return user
-
-
-@router.post("/login")
-def login(
+@router.post("/login", dependencies=[Depends(rate_limit("auth.login"))])
+async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
     session: Session = Depends(get_session),
 ):
-    user = session.exec(select(User).where(User.phone == form_data.username.strip())).first()
-    if not user or not verify_password(form_data.password, user.password_hash):
+    user = await run_in_threadpool(_get_user_by_phone, session, form_data.username.strip())
+    if not user or not await verify_password_async(form_data.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect phone or password",
         )
 
+    settings = get_settings()
     access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
     refresh_token_expires = timedelta(minutes=settings.refresh_token_expire_minutes)
 
@@ -123,7 +156,7 @@ def refresh_token(refresh_token: str, session: Session = Depends(get_session)):
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
 
-    access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
+    access_token_expires = timedelta(minutes=get_settings().access_token_expire_minutes)
     new_access = create_token(str(user.id), access_token_expires, "access")
     return {"access_token": new_access, "token_type": "bearer"}
 
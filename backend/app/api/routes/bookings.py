@@ -1,7 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime, timedelta, timezone
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from ...core.export import ExportFormat, created_between, export_response
+from ...core.responses import rows_response
+from ...core.slots import fits_availability
+from ...models.availability import Availability
 from ...models.booking import (
+    BLOCKING_STATUSES,
+    BOOKING_OVERLAP_CONSTRAINT,
+    MAX_BOOKING_HOURS,
     BookingRequest,
     BookingRequestCreate,
     BookingRequestRead,
@@ -10,45 +23,120 @@ from ...models.booking import (
 )
 from ...models.service import ServiceListing
 from ...models.user import User
-from ..deps import get_current_active_user, get_db
+from ..deps import (
+    get_async_db,
+    get_current_active_user,
+    get_current_active_user_async,
+    get_current_admin,
+    get_db,
+    get_export_db,
+    get_read_db,
+)
 
 router = APIRouter(prefix="/bookings", tags=["bookings"])
+async_router = APIRouter(prefix="/bookings", tags=["bookings"])
 
+EXCLUSION_VIOLATION = "23P01"
 
-@router.post("/", response_model=BookingRequestRead, status_code=status.HTTP_201_CREATED)
-def create_booking(
-    payload: BookingRequestCreate,
-    current_user: User = Depends(get_current_active_user),
-    session: Session = Depends(get_db),
+VALID_TRANSITIONS = {
+    BookingStatus.REQUESTED: {BookingStatus.ACCEPTED, BookingStatus.CANCELLED},
+    BookingStatus.ACCEPTED: {BookingStatus.IN_PROGRESS, BookingStatus.CANCELLED},
+    BookingStatus.IN_PROGRESS: {BookingStatus.COMPLETED, BookingStatus.CANCELLED},
+    BookingStatus.COMPLETED: set(),
+    BookingStatus.CANCELLED: set(),
+}
+
+BOOKING_READ_COLUMNS = tuple(
+    getattr(BookingRequest, name) for name in BookingRequestRead.model_fields
+)
+
+
+def _new_booking(
+    payload: BookingRequestCreate, listing: ServiceListing | None, current_user: User
 ) -> BookingRequest:
-    listing = session.get(ServiceListing, payload.listing_id)
     if not listing or listing.provider_id != payload.provider_id:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid listing/provider")
+    if not 0 < payload.duration_hours <= MAX_BOOKING_HOURS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"duration_hours must be between 0 and {MAX_BOOKING_HOURS}",
+        )
+
+    scheduled_at = payload.scheduled_at
+    if scheduled_at.tzinfo is not None:
+        # Stored as naive UTC, like every other timestamp in the schema.
+        scheduled_at = scheduled_at.astimezone(timezone.utc).replace(tzinfo=None)
 
-    booking = BookingRequest(
+    return BookingRequest(
         listing_id=payload.listing_id,
         provider_id=payload.provider_id,
         requester_id=current_user.id,
-        scheduled_at=payload.scheduled_at,
+        scheduled_at=scheduled_at,
         duration_hours=payload.duration_hours,
         location=payload.location,
         notes=payload.notes,
         total_price=payload.total_price,
     )
-    session.add(booking)
-    session.commit()
-    session.refresh(booking)
-    return BookingRequestRead.model_validate(booking)
 
 
-@router.get("/", response_model=list[BookingRequestRead])
-def list_bookings(
-    role: str = "requester",
-    status_filter: BookingStatus | None = None,
-    current_user: User = Depends(get_current_active_user),
-    session: Session = Depends(get_db),
-) -> list[BookingRequest]:
-    query = select(BookingRequest)
+def _slot_taken() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT, detail="Provider already booked for that time"
+    )
+
+
+def _is_overlap(error: IntegrityError) -> bool:
+    """Whether the overlap exclusion constraint raised ``error``, not some other constraint."""
+    # psycopg2 exposes the SQLSTATE as ``pgcode``, SQLAlchemy's asyncpg adapter as ``sqlstate``.
+    sqlstate = getattr(error.orig, "pgcode", None) or getattr(error.orig, "sqlstate", None)
+    return sqlstate == EXCLUSION_VIOLATION or BOOKING_OVERLAP_CONSTRAINT in str(error.orig)
+
+
+def _booking_end(booking: BookingRequest) -> datetime:
+    return booking.scheduled_at + timedelta(hours=booking.duration_hours)
+
+
+def _lock_provider_schedule(provider_id: int):
+    """A no-op UPDATE on the provider row that serializes bookings for that provider.
+
+    On PostgreSQL it takes the row lock; on SQLite it takes the database write lock before the
+    overlap check reads anything, so two concurrent requests can't both see a free slot.
+    """
+    return update(User).where(User.id == provider_id).values(updated_at=User.updated_at)
+
+
+def _availability_query(provider_id: int):
+    return select(Availability).where(Availability.user_id == provider_id)
+
+
+def _overlap_query(booking: BookingRequest):
+    # Only bookings starting within MAX_BOOKING_HOURS before this one can reach into it, so
+    # the (provider_id, scheduled_at) index bounds the scan on both sides.
+    return (
+        select(BookingRequest.scheduled_at, BookingRequest.duration_hours)
+        .where(BookingRequest.provider_id == booking.provider_id)
+        .where(BookingRequest.scheduled_at < _booking_end(booking))
+        .where(
+            BookingRequest.scheduled_at > booking.scheduled_at - timedelta(hours=MAX_BOOKING_HOURS)
+        )
+        .where(BookingRequest.status.in_(BLOCKING_STATUSES))
+    )
+
+
+def _ensure_bookable(booking: BookingRequest, windows: list[Availability], existing) -> None:
+    start, end = booking.scheduled_at, _booking_end(booking)
+    if not fits_availability(windows, start, end):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Outside the provider's availability",
+        )
+    for other_start, other_hours in existing:
+        if other_start < end and start < other_start + timedelta(hours=other_hours):
+            raise _slot_taken()
+
+
+def _bookings_query(current_user: User, role: str, status_filter: BookingStatus | None):
+    query = select(*BOOKING_READ_COLUMNS)
     if role == "provider":
         query = query.where(BookingRequest.provider_id == current_user.id)
     else:
@@ -56,19 +144,12 @@ def list_bookings(
 
     if status_filter:
         query = query.where(BookingRequest.status == status_filter)
+    return query
 
-    bookings = session.exec(query).all()
-    return [BookingRequestRead.model_validate(item) for item in bookings]
 
-
-@router.patch("/{booking_id}/status", response_model=BookingRequestRead)
-def update_booking_status(
-    booking_id: int,
-    payload: BookingStatusUpdate,
-    current_user: User = Depends(get_current_active_user),
-    session: Session = Depends(get_db),
+def _apply_status_update(
+    booking: BookingRequest | None, payload: BookingStatusUpdate, current_user: User
 ) -> BookingRequest:
-    booking = session.get(BookingRequest, booking_id)
     if not booking:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Booking not found")
 
@@ -78,20 +159,123 @@ def update_booking_status(
     if not (is_provider or is_requester):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allowed")
 
-    valid_transitions = {
-        BookingStatus.REQUESTED: {BookingStatus.ACCEPTED, BookingStatus.CANCELLED},
-        BookingStatus.ACCEPTED: {BookingStatus.IN_PROGRESS, BookingStatus.CANCELLED},
-        BookingStatus.IN_PROGRESS: {BookingStatus.COMPLETED, BookingStatus.CANCELLED},
-        BookingStatus.COMPLETED: set(),
-        BookingStatus.CANCELLED: set(),
-    }
-
-    if payload.new_status not in valid_transitions[booking.status]:
+    if payload.new_status not in VALID_TRANSITIONS[booking.status]:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid status transition")
 
     booking.status = payload.new_status
+    return booking
+
+
+@router.post("/", response_model=BookingRequestRead, status_code=status.HTTP_201_CREATED)
+def create_booking(
+    payload: BookingRequestCreate,
+    current_user: User = Depends(get_current_active_user),
+    session: Session = Depends(get_db),
+) -> BookingRequest:
+    booking = _new_booking(payload, session.get(ServiceListing, payload.listing_id), current_user)
+    session.exec(_lock_provider_schedule(booking.provider_id))
+    windows = session.exec(_availability_query(booking.provider_id)).all()
+    _ensure_bookable(booking, windows, session.exec(_overlap_query(booking)).all())
+    session.add(booking)
+    try:
+        session.commit()
+    except IntegrityError as error:
+        session.rollback()
+        # The PostgreSQL exclusion constraint caught an overlap the lock didn't.
+        if not _is_overlap(error):
+            raise
+        raise _slot_taken() from None
+    session.refresh(booking)
+    return BookingRequestRead.model_validate(booking)
+
+
+@router.get("/", response_model=list[BookingRequestRead])
+def list_bookings(
+    role: str = "requester",
+    status_filter: BookingStatus | None = None,
+    current_user: User = Depends(get_current_active_user),
+    session: Session = Depends(get_read_db),
+) -> Response:
+    return rows_response(session.exec(_bookings_query(current_user, role, status_filter)).all())
+
+
+@router.get("/export", response_class=StreamingResponse)
+def export_bookings(
+    export_format: ExportFormat = Query(default=ExportFormat.NDJSON, alias="format"),
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    admin: User = Depends(get_current_admin),
+    session: Session = Depends(get_export_db),
+) -> StreamingResponse:
+    """Every booking created in ``[created_from, created_to)``, streamed as NDJSON or CSV."""
+    query = created_between(
+        select(*BookingRequest.__table__.columns),
+        BookingRequest.created_at,
+        created_from,
+        created_to,
+    ).order_by(BookingRequest.created_at, BookingRequest.id)
+    return export_response(session, query, export_format, "bookings")
+
+
+@router.patch("/{booking_id}/status", response_model=BookingRequestRead)
+def update_booking_status(
+    booking_id: int,
+    payload: BookingStatusUpdate,
+    current_user: User = Depends(get_current_active_user),
+    session: Session = Depends(get_db),
+) -> BookingRequest:
+    booking = _apply_status_update(session.get(BookingRequest, booking_id), payload, current_user)
     session.add(booking)
     session.commit()
     session.refresh(booking)
     return BookingRequestRead.model_validate(booking)
 
+
+@async_router.post("/", response_model=BookingRequestRead, status_code=status.HTTP_201_CREATED)
+async def create_booking_async(
+    payload: BookingRequestCreate,
+    current_user: User = Depends(get_current_active_user_async),
+    session: AsyncSession = Depends(get_async_db),
+) -> BookingRequest:
+    listing = await session.get(ServiceListing, payload.listing_id)
+    booking = _new_booking(payload, listing, current_user)
+    await session.exec(_lock_provider_schedule(booking.provider_id))
+    windows = (await session.exec(_availability_query(booking.provider_id))).all()
+    _ensure_bookable(booking, windows, (await session.exec(_overlap_query(booking))).all())
+    session.add(booking)
+    try:
+        await session.commit()
+    except IntegrityError as error:
+        await session.rollback()
+        if not _is_overlap(error):
+            raise
+        raise _slot_taken() from None
+    await session.refresh(booking)
+    return BookingRequestRead.model_validate(booking)
+
+
+@async_router.get("/", response_model=list[BookingRequestRead])
+async def list_bookings_async(
+    role: str = "requester",
+    status_filter: BookingStatus | None = None,
+    current_user: User = Depends(get_current_active_user_async),
+    session: AsyncSession = Depends(get_async_db),
+) -> Response:
+    rows = (await session.exec(_bookings_query(current_user, role, status_filter))).all()
+    return rows_response(rows)
+
+
+@async_router.patch("/{booking_id}/status", response_model=BookingRequestRead)
+async def update_booking_status_async(
+    booking_id: int,
+    payload: BookingStatusUpdate,
+    current_user: User = Depends(get_current_active_user_async),
+    session: AsyncSession = Depends(get_async_db),
+) -> BookingRequest:
+    booking = _apply_status_update(
+        await session.get(BookingRequest, booking_id), payload, current_user
+    )
+    session.add(booking)
+    await session.commit()
+    await session.refresh(booking)
+    return BookingRequestRead.model_validate(booking)
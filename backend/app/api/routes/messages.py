@@ -1,13 +1,302 @@
+import asyncio
+import logging
+from collections.abc import Callable
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, WebSocket, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import case, update
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from ...models.message import Message, MessageCreate, MessageThread, MessageThreadCreate
+from ...core.config import get_settings
+from ...core.realtime import message_hub
+from ...models.message import (
+    PREVIEW_LENGTH,
+    InboxThread,
+    Message,
+    MessageCreate,
+    MessageThread,
+    MessageThreadCreate,
+    ReadReceiptCreate,
+    ReadReceiptResult,
+)
 from ...models.user import User
-from ..deps import get_current_active_user, get_db
+from ..deps import (
+    authenticate_token,
+    get_async_db,
+    get_current_active_user,
+    get_current_active_user_async,
+    get_db,
+    get_read_db,
+    get_session_factory,
+)
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/messages", tags=["messages"])
+async_router = APIRouter(prefix="/messages", tags=["messages"])
+
+
+def _existing_thread_query(current_user: User, payload: MessageThreadCreate):
+    return (
+        select(MessageThread)
+        .where(MessageThread.initiator_id == current_user.id)
+        .where(MessageThread.receiver_id == payload.receiver_id)
+    )
+
+
+def _threads_query(current_user: User):
+    return select(MessageThread).where(
+        (MessageThread.initiator_id == current_user.id) | (MessageThread.receiver_id == current_user.id)
+    )
+
+
+def _inbox_query(current_user: User, limit: int, before: int | None):
+    is_initiator = MessageThread.initiator_id == current_user.id
+    query = select(
+        MessageThread.id,
+        MessageThread.booking_id,
+        case((is_initiator, MessageThread.receiver_id), else_=MessageThread.initiator_id).label(
+            "counterpart_id"
+        ),
+        MessageThread.last_message_at,
+        MessageThread.last_message_id,
+        MessageThread.last_message_sender_id,
+        MessageThread.last_message_preview,
+        case(
+            (is_initiator, MessageThread.initiator_unread_count),
+            else_=MessageThread.receiver_unread_count,
+        ).label("unread_count"),
+    ).where(is_initiator | (MessageThread.receiver_id == current_user.id))
+    if before is not None:
+        cursor_at = (
+            select(MessageThread.last_message_at)
+            .where(MessageThread.id == before)
+            .scalar_subquery()
+        )
+        query = query.where(
+            (MessageThread.last_message_at < cursor_at)
+            | ((MessageThread.last_message_at == cursor_at) & (MessageThread.id < before))
+        )
+    return query.order_by(MessageThread.last_message_at.desc(), MessageThread.id.desc()).limit(
+        limit + 1
+    )
+
+
+def _inbox_page(rows, limit: int, response: Response) -> list[InboxThread]:
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = str(rows[-1].id)
+    return [InboxThread.model_validate(row._mapping) for row in rows]
+
+
+def _record_message(thread: MessageThread, message: Message):
+    """Move the thread's inbox state forward for ``message`` in one atomic UPDATE.
+
+    The recipient's unread counter is incremented in SQL so concurrent posts can't lose counts.
+    """
+    values = {
+        "last_message_at": message.sent_at,
+        "last_message_id": message.id,
+        "last_message_sender_id": message.sender_id,
+        "last_message_preview": message.content[:PREVIEW_LENGTH],
+    }
+    if message.sender_id == thread.initiator_id:
+        values["receiver_unread_count"] = MessageThread.receiver_unread_count + 1
+    else:
+        values["initiator_unread_count"] = MessageThread.initiator_unread_count + 1
+    return update(MessageThread).where(MessageThread.id == thread.id).values(**values)
+
+
+def _unread_column(thread: MessageThread, user_id: int):
+    if user_id == thread.initiator_id:
+        return MessageThread.initiator_unread_count
+    return MessageThread.receiver_unread_count
+
+
+def _mark_read_statement(thread: MessageThread, reader_id: int, high_water_mark: Message | None):
+    """Bulk UPDATE marking every message up to ``high_water_mark`` read for ``reader_id``."""
+    if high_water_mark is None or high_water_mark.thread_id != thread.id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Message not found")
+    return (
+        update(Message)
+        .where(Message.thread_id == thread.id)
+        .where(Message.sender_id != reader_id)
+        .where(Message.read_at.is_(None))
+        .where(
+            (Message.sent_at < high_water_mark.sent_at)
+            | ((Message.sent_at == high_water_mark.sent_at) & (Message.id <= high_water_mark.id))
+        )
+        .values(read_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _decrement_unread_statement(thread: MessageThread, reader_id: int, marked: int):
+    counter = _unread_column(thread, reader_id)
+    return (
+        update(MessageThread)
+        .where(MessageThread.id == thread.id)
+        .values({counter: case((counter > marked, counter - marked), else_=0)})
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _read_receipt_result(
+    thread: MessageThread, reader_id: int, up_to_message_id: int, marked: int
+) -> ReadReceiptResult:
+    if marked:
+        message_hub.publish(
+            {thread.initiator_id, thread.receiver_id} - {reader_id},
+            {
+                "type": "read",
+                "thread_id": thread.id,
+                "reader_id": reader_id,
+                "up_to_message_id": up_to_message_id,
+            },
+        )
+    unread = (
+        thread.initiator_unread_count
+        if reader_id == thread.initiator_id
+        else thread.receiver_unread_count
+    )
+    return ReadReceiptResult(
+        thread_id=thread.id,
+        up_to_message_id=up_to_message_id,
+        marked_read=marked,
+        unread_count=unread,
+    )
+
+
+def _mark_thread_read(
+    session: Session, thread_id: int, current_user: User, up_to_message_id: int
+) -> ReadReceiptResult:
+    thread = _ensure_participant(session.get(MessageThread, thread_id), current_user)
+    high_water_mark = session.get(Message, up_to_message_id)
+    marked = session.exec(_mark_read_statement(thread, current_user.id, high_water_mark)).rowcount
+    if marked:
+        session.exec(_decrement_unread_statement(thread, current_user.id, marked))
+    session.commit()
+    session.refresh(thread)
+    return _read_receipt_result(thread, current_user.id, up_to_message_id, marked)
+
+
+class ReadReceiptBuffer:
+    """Coalesces read receipts arriving on one socket into one write per thread.
+
+    Scrolling through a long chat sends a receipt per message; only the highest id per thread
+    matters, so receipts are held for ``ws_read_receipt_delay_seconds`` and then written once.
+    Writes are serialized by a lock and each opens its own session, since a timer flush and the
+    socket-close flush can otherwise overlap on threadpool threads.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session], user: User) -> None:
+        self.session_factory = session_factory
+        self.user = user
+        self.pending: dict[int, int] = {}
+        self._timer: asyncio.Task | None = None
+        self._lock = asyncio.Lock()
+
+    async def handle(self, connection, event: dict) -> None:
+        if event.get("type") != "read":
+            return
+        try:
+            thread_id = int(event["thread_id"])
+            up_to = int(event["up_to_message_id"])
+        except (KeyError, TypeError, ValueError):
+            return
+        self.pending[thread_id] = max(up_to, self.pending.get(thread_id, up_to))
+        if self._timer is None:
+            self._timer = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(get_settings().ws_read_receipt_delay_seconds)
+        self._timer = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        async with self._lock:
+            # Taken under the lock: receipts arriving during a write wait for the next batch.
+            batch, self.pending = self.pending, {}
+            if batch:
+                await run_in_threadpool(self._write, batch)
+
+    def _write(self, batch: dict[int, int]) -> None:
+        with self.session_factory() as session:
+            for thread_id, up_to in batch.items():
+                try:
+                    _mark_thread_read(session, thread_id, self.user, up_to)
+                except HTTPException as exc:
+                    session.rollback()
+                    logger.debug("Dropped read receipt for thread %s: %s", thread_id, exc.detail)
+
+
+def _history_query(thread_id: int, limit: int, before: int | None, after: int | None):
+    """Keyset page of a thread's messages, ordered by ``(sent_at, id)``.
+
+    Cursors are message ids; each one is resolved to its ``(sent_at, id)`` key inside the same
+    statement so the ``ix_message_thread_sent_id`` index serves both the seek and the order.
+    """
+    if before is not None and after is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Use either before or after, not both"
+        )
+    query = select(Message).where(Message.thread_id == thread_id)
+    cursor = after if after is not None else before
+    if cursor is not None:
+        cursor_sent_at = (
+            select(Message.sent_at)
+            .where(Message.id == cursor, Message.thread_id == thread_id)
+            .scalar_subquery()
+        )
+        if after is not None:
+            query = query.where(
+                (Message.sent_at > cursor_sent_at)
+                | ((Message.sent_at == cursor_sent_at) & (Message.id > cursor))
+            )
+        else:
+            query = query.where(
+                (Message.sent_at < cursor_sent_at)
+                | ((Message.sent_at == cursor_sent_at) & (Message.id < cursor))
+            )
+    if after is not None:
+        query = query.order_by(Message.sent_at, Message.id)
+    else:
+        query = query.order_by(Message.sent_at.desc(), Message.id.desc())
+    return query.limit(limit + 1)
+
+
+def _history_page(rows, limit: int, after: int | None, response: Response) -> list[Message]:
+    rows = list(rows)
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if after is None:
+        # Newest-first from the database; clients always get oldest-first.
+        rows.reverse()
+        if has_more:
+            response.headers["X-Next-Cursor"] = str(rows[0].id)
+    elif has_more:
+        response.headers["X-Next-Cursor"] = str(rows[-1].id)
+    return rows
+
+
+def _publish_message(thread: MessageThread, message: Message) -> None:
+    message_hub.publish(
+        {thread.initiator_id, thread.receiver_id},
+        {"type": "message", "message": message.model_dump(mode="json")},
+    )
+
+
+def _ensure_participant(thread: MessageThread | None, current_user: User) -> MessageThread:
+    if not thread:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Thread not found")
+    if current_user.id not in {thread.initiator_id, thread.receiver_id}:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allowed")
+    return thread
 
 
 @router.post("/threads", response_model=MessageThread, status_code=status.HTTP_201_CREATED)
@@ -16,11 +305,7 @@ def create_thread(
     current_user: User = Depends(get_current_active_user),
     session: Session = Depends(get_db),
 ) -> MessageThread:
-    existing = session.exec(
-        select(MessageThread)
-        .where(MessageThread.initiator_id == current_user.id)
-        .where(MessageThread.receiver_id == payload.receiver_id)
-    ).first()
+    existing = session.exec(_existing_thread_query(current_user, payload)).first()
     if existing:
         return existing
 
@@ -36,15 +321,26 @@ def create_thread(
 
 
 @router.get("/threads", response_model=list[MessageThread])
-def list_threads(current_user: User = Depends(get_current_active_user), session: Session = Depends(get_db)):
-    threads = session.exec(
-        select(MessageThread).where(
-            (MessageThread.initiator_id == current_user.id) | (MessageThread.receiver_id == current_user.id)
-        )
-    ).all()
+def list_threads(
+    current_user: User = Depends(get_current_active_user),
+    session: Session = Depends(get_read_db),
+):
+    threads = session.exec(_threads_query(current_user)).all()
     return threads
 
 
+@router.get("/inbox", response_model=list[InboxThread])
+def get_inbox(
+    response: Response,
+    limit: int = Query(default=50, ge=1, le=200),
+    before: int | None = Query(default=None, description="Cursor from the X-Next-Cursor header"),
+    current_user: User = Depends(get_current_active_user),
+    session: Session = Depends(get_read_db),
+) -> list[InboxThread]:
+    rows = session.exec(_inbox_query(current_user, limit, before)).all()
+    return _inbox_page(rows, limit, response)
+
+
 @router.post("/threads/{thread_id}/messages", response_model=Message, status_code=status.HTTP_201_CREATED)
 def post_message(
     thread_id: int,
@@ -52,34 +348,166 @@ def post_message(
     current_user: User = Depends(get_current_active_user),
     session: Session = Depends(get_db),
 ) -> Message:
-    thread = session.get(MessageThread, thread_id)
-    if not thread:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Thread not found")
-
-    if current_user.id not in {thread.initiator_id, thread.receiver_id}:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allowed")
+    thread = _ensure_participant(session.get(MessageThread, thread_id), current_user)
 
     message = Message(thread_id=thread_id, sender_id=current_user.id, content=payload.content)
-    thread.last_message_at = datetime.utcnow()
     session.add(message)
-    session.add(thread)
+    session.flush()
+    session.exec(_record_message(thread, message))
     session.commit()
     session.refresh(message)
+    _publish_message(thread, message)
     return message
 
 
 @router.get("/threads/{thread_id}/messages", response_model=list[Message])
 def get_messages(
     thread_id: int,
+    response: Response,
+    limit: int = Query(default=50, ge=1, le=200),
+    before: int | None = Query(default=None, description="Page of messages older than this id"),
+    after: int | None = Query(
+        default=None, description="Messages newer than this id, e.g. the last one a client holds"
+    ),
     current_user: User = Depends(get_current_active_user),
-    session: Session = Depends(get_db),
+    session: Session = Depends(get_read_db),
 ) -> list[Message]:
-    thread = session.get(MessageThread, thread_id)
-    if not thread:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Thread not found")
-    if current_user.id not in {thread.initiator_id, thread.receiver_id}:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allowed")
+    _ensure_participant(session.get(MessageThread, thread_id), current_user)
+
+    rows = session.exec(_history_query(thread_id, limit, before, after)).all()
+    return _history_page(rows, limit, after, response)
+
+
+@router.post("/threads/{thread_id}/read", response_model=ReadReceiptResult)
+def mark_thread_read(
+    thread_id: int,
+    payload: ReadReceiptCreate,
+    current_user: User = Depends(get_current_active_user),
+    session: Session = Depends(get_db),
+) -> ReadReceiptResult:
+    return _mark_thread_read(session, thread_id, current_user, payload.up_to_message_id)
+
+
+@router.websocket("/ws")
+async def messages_websocket(
+    websocket: WebSocket,
+    token: str = Query(...),
+    session: Session = Depends(get_db),
+    session_factory: Callable[[], Session] = Depends(get_session_factory),
+) -> None:
+    try:
+        user = await run_in_threadpool(authenticate_token, token, session)
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    finally:
+        # Don't hold a pooled connection for the lifetime of the socket.
+        await run_in_threadpool(session.close)
 
-    messages = session.exec(select(Message).where(Message.thread_id == thread_id)).all()
-    return messages
+    receipts = ReadReceiptBuffer(session_factory, user)
+    await websocket.accept()
+    try:
+        await message_hub.serve(websocket, user.id, on_event=receipts.handle)
+    finally:
+        await receipts.flush()
+
+
+@async_router.post("/threads", response_model=MessageThread, status_code=status.HTTP_201_CREATED)
+async def create_thread_async(
+    payload: MessageThreadCreate,
+    current_user: User = Depends(get_current_active_user_async),
+    session: AsyncSession = Depends(get_async_db),
+) -> MessageThread:
+    existing = (await session.exec(_existing_thread_query(current_user, payload))).first()
+    if existing:
+        return existing
+
+    thread = MessageThread(
+        initiator_id=current_user.id,
+        receiver_id=payload.receiver_id,
+        booking_id=payload.booking_id,
+    )
+    session.add(thread)
+    await session.commit()
+    await session.refresh(thread)
+    return thread
+
+
+@async_router.get("/threads", response_model=list[MessageThread])
+async def list_threads_async(
+    current_user: User = Depends(get_current_active_user_async),
+    session: AsyncSession = Depends(get_async_db),
+):
+    return (await session.exec(_threads_query(current_user))).all()
+
+
+@async_router.get("/inbox", response_model=list[InboxThread])
+async def get_inbox_async(
+    response: Response,
+    limit: int = Query(default=50, ge=1, le=200),
+    before: int | None = Query(default=None, description="Cursor from the X-Next-Cursor header"),
+    current_user: User = Depends(get_current_active_user_async),
+    session: AsyncSession = Depends(get_async_db),
+) -> list[InboxThread]:
+    rows = (await session.exec(_inbox_query(current_user, limit, before))).all()
+    return _inbox_page(rows, limit, response)
+
+
+@async_router.post(
+    "/threads/{thread_id}/messages", response_model=Message, status_code=status.HTTP_201_CREATED
+)
+async def post_message_async(
+    thread_id: int,
+    payload: MessageCreate,
+    current_user: User = Depends(get_current_active_user_async),
+    session: AsyncSession = Depends(get_async_db),
+) -> Message:
+    thread = _ensure_participant(await session.get(MessageThread, thread_id), current_user)
+
+    message = Message(thread_id=thread_id, sender_id=current_user.id, content=payload.content)
+    session.add(message)
+    await session.flush()
+    await session.exec(_record_message(thread, message))
+    await session.commit()
+    await session.refresh(message)
+    await run_in_threadpool(_publish_message, thread, message)
+    return message
+
+
+@async_router.post("/threads/{thread_id}/read", response_model=ReadReceiptResult)
+async def mark_thread_read_async(
+    thread_id: int,
+    payload: ReadReceiptCreate,
+    current_user: User = Depends(get_current_active_user_async),
+    session: AsyncSession = Depends(get_async_db),
+) -> ReadReceiptResult:
+    thread = _ensure_participant(await session.get(MessageThread, thread_id), current_user)
+    high_water_mark = await session.get(Message, payload.up_to_message_id)
+    marked = (
+        await session.exec(_mark_read_statement(thread, current_user.id, high_water_mark))
+    ).rowcount
+    if marked:
+        await session.exec(_decrement_unread_statement(thread, current_user.id, marked))
+    await session.commit()
+    await session.refresh(thread)
+    return await run_in_threadpool(
+        _read_receipt_result, thread, current_user.id, payload.up_to_message_id, marked
+    )
+
+
+@async_router.get("/threads/{thread_id}/messages", response_model=list[Message])
+async def get_messages_async(
+    thread_id: int,
+    response: Response,
+    limit: int = Query(default=50, ge=1, le=200),
+    before: int | None = Query(default=None, description="Page of messages older than this id"),
+    after: int | None = Query(
+        default=None, description="Messages newer than this id, e.g. the last one a client holds"
+    ),
+    current_user: User = Depends(get_current_active_user_async),
+    session: AsyncSession = Depends(get_async_db),
+) -> list[Message]:
+    _ensure_participant(await session.get(MessageThread, thread_id), current_user)
 
+    rows = (await session.exec(_history_query(thread_id, limit, before, after))).all()
+    return _history_page(rows, limit, after, response)
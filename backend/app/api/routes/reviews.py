@@ -0,0 +1,85 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
+
+from ...core.ratings import add_rating_statement
+from ...core.responses import keyset_page
+from ...models.booking import BookingRequest, BookingStatus
+from ...models.review import Review, ReviewCreate, ReviewRead
+from ...models.user import User
+from ..deps import get_current_active_user, get_db, get_read_db, track_principal_writes
+
+router = APIRouter(prefix="/reviews", tags=["reviews"])
+
+REVIEW_READ_COLUMNS = tuple(getattr(Review, name) for name in ReviewRead.model_fields)
+
+
+def _new_review(
+    payload: ReviewCreate, booking: BookingRequest | None, current_user: User
+) -> Review:
+    if not booking:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Booking not found")
+    if current_user.id == booking.requester_id:
+        reviewee_id = booking.provider_id
+    elif current_user.id == booking.provider_id:
+        reviewee_id = booking.requester_id
+    else:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allowed")
+    if booking.status != BookingStatus.COMPLETED:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Only completed bookings can be reviewed",
+        )
+    return Review(
+        booking_id=booking.id,
+        reviewer_id=current_user.id,
+        reviewee_id=reviewee_id,
+        rating=payload.rating,
+        comment=payload.comment,
+    )
+
+
+@router.post("/", response_model=ReviewRead, status_code=status.HTTP_201_CREATED)
+def create_review(
+    payload: ReviewCreate,
+    current_user: User = Depends(get_current_active_user),
+    session: Session = Depends(get_db),
+) -> Review:
+    review = _new_review(payload, session.get(BookingRequest, payload.booking_id), current_user)
+    session.add(review)
+    try:
+        session.flush()
+    except IntegrityError:
+        session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="Booking already reviewed"
+        ) from None
+    session.exec(add_rating_statement(review.reviewee_id, review.rating))
+    # The aggregate UPDATE skips the mapper events, so the reviewee is tracked by hand.
+    track_principal_writes(session, (review.reviewee_id,))
+    session.commit()
+    session.refresh(review)
+    return ReviewRead.model_validate(review)
+
+
+@router.get("/", response_model=list[ReviewRead])
+def list_reviews(
+    user_id: int,
+    limit: int = Query(default=20, ge=1, le=100),
+    after: int | None = Query(default=None, description="Cursor from the X-Next-Cursor header"),
+    session: Session = Depends(get_read_db),
+) -> Response:
+    """Reviews received by ``user_id``, newest first."""
+    query = select(*REVIEW_READ_COLUMNS).where(Review.reviewee_id == user_id)
+    if after is not None:
+        query = query.where(Review.id < after)
+    rows = session.exec(query.order_by(Review.id.desc()).limit(limit + 1)).all()
+    return keyset_page(rows, limit)
+
+
+@router.get("/{review_id}", response_model=ReviewRead)
+def get_review(review_id: int, session: Session = Depends(get_read_db)) -> Review:
+    review = session.get(Review, review_id)
+    if not review:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Review not found")
+    return ReviewRead.model_validate(review)
@@ -1,20 +1,85 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import hashlib
+import json
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from ...core.bulk_import import BulkImporter, ndjson_lines
+from ...core.cache import Snapshot, publish_invalidation, register_invalidation
+from ...core.config import get_settings
+from ...core.export import ExportFormat, created_between, export_response
+from ...core.geo import NearFilter, haversine_km, near_condition
+from ...core.responses import keyset_page, rows_response
+from ...core.search import search_listings
+from ...models.address import Address
 from ...models.service import (
+    BatchImportResult,
     ServiceCategory,
     ServiceListing,
     ServiceListingCreate,
     ServiceListingRead,
 )
-from ..deps import get_current_active_provider, get_current_active_user, get_db
+from ...models.user import User
+from ..deps import (
+    get_async_db,
+    get_current_active_provider,
+    get_current_active_provider_async,
+    get_current_admin,
+    get_current_active_user,
+    get_db,
+    get_export_db,
+    get_near_filter,
+    get_read_db,
+)
 
 router = APIRouter(prefix="/services", tags=["services"])
+async_router = APIRouter(prefix="/services", tags=["services"])
+
+# Serialized category list and its ETag, shared by every request until a category is created
+# or, failing that, for as long as clients may cache the response themselves.
+categories_snapshot = Snapshot(
+    max_age_seconds=lambda: get_settings().categories_cache_max_age_seconds
+)
+register_invalidation("categories", categories_snapshot.invalidate)
+
+# Only the columns ServiceListingRead exposes, so list queries skip the joined provider load.
+LISTING_READ_COLUMNS = tuple(
+    getattr(ServiceListing, name) for name in ServiceListingRead.model_fields
+)
+
+
+def _build_categories_snapshot(session: Session) -> tuple[bytes, str]:
+    categories = session.exec(select(ServiceCategory).order_by(ServiceCategory.id)).all()
+    body = json.dumps(
+        [category.model_dump(mode="json") for category in categories], separators=(",", ":")
+    ).encode()
+    return body, f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
 
 
 @router.get("/categories", response_model=list[ServiceCategory])
-def list_categories(session: Session = Depends(get_db)) -> list[ServiceCategory]:
-    return session.exec(select(ServiceCategory)).all()
+def list_categories(
+    if_none_match: str | None = Header(default=None),
+    session: Session = Depends(get_db),
+) -> Response:
+    body, etag = categories_snapshot.get_or_build(lambda: _build_categories_snapshot(session))
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={get_settings().categories_cache_max_age_seconds}",
+    }
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @router.post("/categories", response_model=ServiceCategory, status_code=status.HTTP_201_CREATED)
@@ -28,13 +93,106 @@ def create_category(
     session.add(payload)
     session.commit()
     session.refresh(payload)
+    publish_invalidation("categories")
     return payload
 
 
+def _listings_query(
+    limit: int,
+    after: int | None,
+    category_id: int | None,
+    min_price: float | None,
+    max_price: float | None,
+    coverage_area: str | None,
+    near: NearFilter | None = None,
+):
+    query = select(*LISTING_READ_COLUMNS).where(ServiceListing.is_active == True)  # noqa: E712
+    if category_id is not None:
+        query = query.where(ServiceListing.category_id == category_id)
+    if min_price is not None:
+        query = query.where(ServiceListing.base_price >= min_price)
+    if max_price is not None:
+        query = query.where(ServiceListing.base_price <= max_price)
+    if coverage_area:
+        query = query.where(ServiceListing.coverage_area.ilike(coverage_area.strip()))
+    if near is not None:
+        # Providers whose address is within the search radius, then each listing's own
+        # service radius against that same distance.
+        query = query.where(
+            ServiceListing.provider_id.in_(
+                select(Address.user_id).where(
+                    near_condition(Address.geohash, Address.latitude, Address.longitude, near)
+                )
+            )
+        )
+        distance = (
+            select(
+                haversine_km(Address.latitude, Address.longitude, near.latitude, near.longitude)
+            )
+            .where(Address.user_id == ServiceListing.provider_id)
+            .scalar_subquery()
+        )
+        query = query.where(
+            ServiceListing.service_radius_km.is_(None)
+            | (ServiceListing.service_radius_km >= distance)
+        )
+    if after is not None:
+        query = query.where(ServiceListing.id > after)
+    return query.order_by(ServiceListing.id).limit(limit + 1)
+
+
+def _owned_listing(listing: ServiceListing | None, provider: User) -> ServiceListing:
+    if not listing or listing.provider_id != provider.id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Listing not found")
+    return listing
+
+
 @router.get("/listings", response_model=list[ServiceListingRead])
-def list_listings(session: Session = Depends(get_db)) -> list[ServiceListing]:
-    listings = session.exec(select(ServiceListing).where(ServiceListing.is_active == True)).all()  # noqa: E712
-    return [ServiceListingRead.model_validate(item) for item in listings]
+def list_listings(
+    limit: int = Query(default=50, ge=1, le=200),
+    after: int | None = Query(default=None, description="Cursor from the X-Next-Cursor header"),
+    category_id: int | None = None,
+    min_price: float | None = Query(default=None, ge=0),
+    max_price: float | None = Query(default=None, ge=0),
+    coverage_area: str | None = None,
+    near: NearFilter | None = Depends(get_near_filter),
+    session: Session = Depends(get_read_db),
+) -> Response:
+    query = _listings_query(
+        limit, after, category_id, min_price, max_price, coverage_area, near
+    )
+    return keyset_page(session.exec(query).all(), limit)
+
+
+@router.get("/listings/search", response_model=list[ServiceListingRead])
+def search_listings_endpoint(
+    q: str = Query(min_length=1, max_length=200),
+    limit: int = Query(default=20, ge=1, le=100),
+    offset: int = Query(default=0, ge=0, le=1000),
+    session: Session = Depends(get_read_db),
+) -> Response:
+    rows = search_listings(session, q, LISTING_READ_COLUMNS, limit=limit + 1, offset=offset)
+    if len(rows) > limit:
+        return rows_response(rows[:limit], {"X-Next-Offset": str(offset + limit)})
+    return rows_response(rows)
+
+
+@router.get("/listings/export", response_class=StreamingResponse)
+def export_listings(
+    export_format: ExportFormat = Query(default=ExportFormat.NDJSON, alias="format"),
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    admin: User = Depends(get_current_admin),
+    session: Session = Depends(get_export_db),
+) -> StreamingResponse:
+    """Every listing, active or not, created in ``[created_from, created_to)``."""
+    query = created_between(
+        select(*ServiceListing.__table__.columns),
+        ServiceListing.created_at,
+        created_from,
+        created_to,
+    ).order_by(ServiceListing.created_at, ServiceListing.id)
+    return export_response(session, query, export_format, "listings")
 
 
 @router.post("/listings", response_model=ServiceListingRead, status_code=status.HTTP_201_CREATED)
@@ -50,6 +208,39 @@ def create_listing(
     return ServiceListingRead.model_validate(listing)
 
 
+@router.post(
+    "/listings:batch",
+    response_model=BatchImportResult,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/x-ndjson": {"schema": {"type": "string"}}},
+        }
+    },
+)
+async def import_listings_batch(
+    request: Request,
+    admin: User = Depends(get_current_admin),
+    session: Session = Depends(get_db),
+) -> BatchImportResult:
+    """Bulk-create listings and availability windows for many providers from NDJSON.
+
+    The body is read as it streams in and handled ``batch_import_chunk_size`` lines at a time,
+    so memory stays bounded however large the import is. See ``app.core.bulk_import``.
+    """
+    chunk_size = get_settings().batch_import_chunk_size
+    importer = BulkImporter(session)
+    chunk: list[tuple[int, bytes]] = []
+    async for line in ndjson_lines(request.stream()):
+        chunk.append(line)
+        if len(chunk) >= chunk_size:
+            await run_in_threadpool(importer.import_chunk, chunk)
+            chunk = []
+    if chunk:
+        await run_in_threadpool(importer.import_chunk, chunk)
+    return importer.result
+
+
 @router.patch("/listings/{listing_id}", response_model=ServiceListingRead)
 def update_listing(
     listing_id: int,
@@ -57,10 +248,7 @@ def update_listing(
     provider=Depends(get_current_active_provider),
     session: Session = Depends(get_db),
 ) -> ServiceListing:
-    listing = session.get(ServiceListing, listing_id)
-    if not listing or listing.provider_id != provider.id:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Listing not found")
-
+    listing = _owned_listing(session.get(ServiceListing, listing_id), provider)
     for key, value in payload.model_dump().items():
         setattr(listing, key, value)
     session.add(listing)
@@ -75,9 +263,66 @@ def delete_listing(
     provider=Depends(get_current_active_provider),
     session: Session = Depends(get_db),
 ) -> None:
-    listing = session.get(ServiceListing, listing_id)
-    if not listing or listing.provider_id != provider.id:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Listing not found")
+    listing = _owned_listing(session.get(ServiceListing, listing_id), provider)
     session.delete(listing)
     session.commit()
 
+
+
+@async_router.get("/listings", response_model=list[ServiceListingRead])
+async def list_listings_async(
+    limit: int = Query(default=50, ge=1, le=200),
+    after: int | None = Query(default=None, description="Cursor from the X-Next-Cursor header"),
+    category_id: int | None = None,
+    min_price: float | None = Query(default=None, ge=0),
+    max_price: float | None = Query(default=None, ge=0),
+    coverage_area: str | None = None,
+    near: NearFilter | None = Depends(get_near_filter),
+    session: AsyncSession = Depends(get_async_db),
+) -> Response:
+    query = _listings_query(
+        limit, after, category_id, min_price, max_price, coverage_area, near
+    )
+    return keyset_page((await session.exec(query)).all(), limit)
+
+
+@async_router.post(
+    "/listings", response_model=ServiceListingRead, status_code=status.HTTP_201_CREATED
+)
+async def create_listing_async(
+    payload: ServiceListingCreate,
+    provider=Depends(get_current_active_provider_async),
+    session: AsyncSession = Depends(get_async_db),
+) -> ServiceListing:
+    listing = ServiceListing(**payload.model_dump(), provider_id=provider.id)
+    session.add(listing)
+    await session.commit()
+    await session.refresh(listing)
+    return ServiceListingRead.model_validate(listing)
+
+
+@async_router.patch("/listings/{listing_id}", response_model=ServiceListingRead)
+async def update_listing_async(
+    listing_id: int,
+    payload: ServiceListingCreate,
+    provider=Depends(get_current_active_provider_async),
+    session: AsyncSession = Depends(get_async_db),
+) -> ServiceListing:
+    listing = _owned_listing(await session.get(ServiceListing, listing_id), provider)
+    for key, value in payload.model_dump().items():
+        setattr(listing, key, value)
+    session.add(listing)
+    await session.commit()
+    await session.refresh(listing)
+    return ServiceListingRead.model_validate(listing)
+
+
+@async_router.delete("/listings/{listing_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_listing_async(
+    listing_id: int,
+    provider=Depends(get_current_active_provider_async),
+    session: AsyncSession = Depends(get_async_db),
+) -> None:
+    listing = _owned_listing(await session.get(ServiceListing, listing_id), provider)
+    await session.delete(listing)
+    await session.commit()
@@ -1,19 +1,121 @@
-from fastapi import APIRouter, Depends
+from datetime import date, datetime, timedelta
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import exists, func, tuple_
 from sqlmodel import Session, select
 
-from ...models.user import User, UserRead
-from ..deps import get_current_active_user, get_db
+from ...core.geo import NearFilter, near_condition
+from ...core.responses import keyset_page
+from ...core.slots import provider_free_slots
+from ...models.address import Address
+from ...models.availability import FreeSlot
+from ...models.service import ServiceListing
+from ...models.user import User, UserRead, UserRole, UserSkill
+from ..deps import get_current_active_user, get_db, get_near_filter, get_read_db
 
 router = APIRouter(prefix="/users", tags=["users"])
 
+MAX_SLOT_RANGE_DAYS = 31
+
+PROVIDER_READ_COLUMNS = tuple(getattr(User, name) for name in UserRead.model_fields)
+
 
 @router.get("/me", response_model=UserRead)
 def read_current_user(current_user: User = Depends(get_current_active_user)) -> User:
     return current_user
 
 
+def _providers_query(
+    limit: int,
+    after: int | None,
+    category_id: int | None,
+    skill: str | None,
+    city: str | None,
+    min_rating: float | None,
+    near: NearFilter | None = None,
+):
+    """Active providers, best rated first, as bare ``UserRead`` columns.
+
+    Each filter is an EXISTS probe on its own composite index, so the rating-ordered walk of
+    ``ix_user_role_active_rating`` stops as soon as a page is filled.
+    """
+    query = (
+        select(*PROVIDER_READ_COLUMNS)
+        .where(User.role == UserRole.SERVICE_PROVIDER)
+        .where(User.is_active == True)  # noqa: E712
+    )
+    if min_rating is not None:
+        query = query.where(User.rating_avg >= min_rating)
+    if category_id is not None:
+        query = query.where(
+            exists()
+            .where(ServiceListing.category_id == category_id)
+            .where(ServiceListing.is_active == True)  # noqa: E712
+            .where(ServiceListing.provider_id == User.id)
+        )
+    if skill:
+        query = query.where(
+            exists()
+            .where(UserSkill.skill_tag == skill.strip())
+            .where(UserSkill.user_id == User.id)
+        )
+    if city:
+        query = query.where(
+            exists()
+            .where(func.lower(Address.city) == city.strip().lower())
+            .where(Address.user_id == User.id)
+        )
+    if near is not None:
+        query = query.where(
+            User.id.in_(
+                select(Address.user_id).where(
+                    near_condition(Address.geohash, Address.latitude, Address.longitude, near)
+                )
+            )
+        )
+    if after is not None:
+        # A row-value comparison keeps this a single ordered index range; the equivalent OR
+        # makes SQLite union two ranges and sort them.
+        cursor_rating = select(User.rating_avg).where(User.id == after).scalar_subquery()
+        query = query.where(tuple_(User.rating_avg, User.id) < tuple_(cursor_rating, after))
+    return query.order_by(User.rating_avg.desc(), User.id.desc()).limit(limit + 1)
+
+
 @router.get("/", response_model=list[UserRead])
-def list_providers(session: Session = Depends(get_db)) -> list[User]:
-    result = session.exec(select(User).where(User.role == "SERVICE_PROVIDER"))
-    return [UserRead.model_validate(user) for user in result.all()]
+@router.get("/providers", response_model=list[UserRead])
+def list_providers(
+    limit: int = Query(default=20, ge=1, le=100),
+    after: int | None = Query(default=None, description="Cursor from the X-Next-Cursor header"),
+    category_id: int | None = None,
+    skill: str | None = None,
+    city: str | None = None,
+    min_rating: float | None = Query(default=None, ge=0, le=5),
+    near: NearFilter | None = Depends(get_near_filter),
+    session: Session = Depends(get_read_db),
+) -> Response:
+    query = _providers_query(limit, after, category_id, skill, city, min_rating, near)
+    return keyset_page(session.exec(query).all(), limit)
+
 
+@router.get("/{user_id}/slots", response_model=list[FreeSlot])
+def list_free_slots(
+    user_id: int,
+    start: date | None = Query(default=None, description="First day, defaults to today (UTC)"),
+    end: date | None = Query(default=None, description="Day after the last, defaults to +7 days"),
+    min_minutes: int = Query(default=0, ge=0, le=24 * 60),
+    # The primary, not a replica: results are cached under the provider's slot version, which
+    # is bumped when the primary commits. A lagging replica would store pre-booking slots
+    # under the new version for every reader.
+    session: Session = Depends(get_db),
+) -> list[FreeSlot]:
+    start = start or datetime.utcnow().date()
+    end = end or start + timedelta(days=7)
+    if not start < end <= start + timedelta(days=MAX_SLOT_RANGE_DAYS):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"end must be after start and at most {MAX_SLOT_RANGE_DAYS} days later",
+        )
+    provider = session.get(User, user_id)
+    if not provider or provider.role != UserRole.SERVICE_PROVIDER:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Provider not found")
+    return provider_free_slots(session, user_id, start, end, min_minutes)
@@ -0,0 +1,42 @@
+"""Admin accounts.
+
+Registration never hands out the admin role; an operator grants it to an existing user::
+
+    python -m app.core.admins 08012345678
+"""
+
+import argparse
+
+from sqlmodel import Session, select
+
+from ..api.deps import invalidate_principal
+from ..models.user import User, UserRole
+
+
+def grant_admin(session: Session, phone: str) -> User:
+    user = session.exec(select(User).where(User.phone == phone.strip())).first()
+    if user is None:
+        raise LookupError(f"No user with phone {phone!r}")
+    user.role = UserRole.ADMIN
+    session.add(user)
+    session.commit()
+    # Run from the command line, outside any API worker: every worker still holds the old
+    # role in its principal cache until told otherwise.
+    invalidate_principal(user.id)
+    session.refresh(user)
+    return user
+
+
+def main() -> None:
+    from .database import get_engine
+
+    parser = argparse.ArgumentParser(description="Grant the admin role to a registered user.")
+    parser.add_argument("phone")
+    args = parser.parse_args()
+    with Session(get_engine()) as session:
+        user = grant_admin(session, args.phone)
+    print(f"user {user.id} is now an admin")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""Chunked NDJSON import of listings and availability windows.
+
+Every line is one JSON object: ``{"type": "listing", ...}`` with the ``ListingImportRow``
+fields or ``{"type": "availability", ...}`` with the ``AvailabilityImportRow`` fields. Lines
+are validated and inserted a chunk at a time, one transaction per chunk; a bad line is
+reported by number and skipped while the rest of the batch still lands.
+"""
+
+import json
+from collections.abc import AsyncIterable, AsyncIterator
+from datetime import datetime
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import DataError, DBAPIError, IntegrityError
+from sqlmodel import Session, SQLModel, select
+
+from ..models.availability import Availability, AvailabilityImportRow
+from ..models.service import (
+    BatchImportError,
+    BatchImportResult,
+    ListingImportRow,
+    ServiceCategory,
+    ServiceListing,
+)
+from ..models.user import User, UserRole
+from .search import index_listings
+from .slots import track_slot_providers
+
+MAX_REPORTED_ERRORS = 1000
+# Errors a single row can cause; a chunk that raises one is retried row by row.
+ROW_ERRORS = (IntegrityError, DataError)
+ROW_MODELS: dict[str, type[SQLModel]] = {
+    "listing": ListingImportRow,
+    "availability": AvailabilityImportRow,
+}
+
+
+async def ndjson_lines(stream: AsyncIterable[bytes]) -> AsyncIterator[tuple[int, bytes]]:
+    """Yield ``(line_number, line)`` for each non-blank line of a streamed body."""
+    buffer = b""
+    line_number = 0
+    async for data in stream:
+        buffer += data
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_number += 1
+            if line.strip():
+                yield line_number, line
+    if buffer.strip():
+        yield line_number + 1, buffer
+
+
+def _describe(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc']) or 'row'}: {item['msg']}"
+        for item in error.errors()
+    )
+
+
+class BulkImporter:
+    """Accumulates a ``BatchImportResult`` over the chunks of one import."""
+
+    def __init__(self, session: Session) -> None:
+        self.session = session
+        self.result = BatchImportResult()
+
+    def fail(self, line: int, detail: str) -> None:
+        self.result.failed += 1
+        if len(self.result.errors) < MAX_REPORTED_ERRORS:
+            self.result.errors.append(BatchImportError(line=line, detail=detail))
+
+    def _parse(self, line: int, raw: bytes) -> SQLModel | None:
+        try:
+            data = json.loads(raw)
+        except ValueError:
+            self.fail(line, "Invalid JSON")
+            return None
+        if not isinstance(data, dict):
+            self.fail(line, "Expected a JSON object")
+            return None
+        type_ = data.pop("type", None)
+        model = ROW_MODELS.get(type_) if isinstance(type_, str) else None
+        if model is None:
+            self.fail(line, f"type must be one of {', '.join(ROW_MODELS)}")
+            return None
+        try:
+            return model.model_validate(data)
+        except ValidationError as error:
+            self.fail(line, _describe(error))
+            return None
+
+    def _check_references(self, rows: list[tuple[int, SQLModel]]) -> list[tuple[int, SQLModel]]:
+        provider_ids = {
+            row.provider_id if isinstance(row, ListingImportRow) else row.user_id
+            for _, row in rows
+        }
+        category_ids = {row.category_id for _, row in rows if isinstance(row, ListingImportRow)}
+        providers = set(
+            self.session.exec(
+                select(User.id)
+                .where(User.id.in_(provider_ids))
+                .where(User.role == UserRole.SERVICE_PROVIDER)
+            ).all()
+        )
+        categories = set(
+            self.session.exec(
+                select(ServiceCategory.id).where(ServiceCategory.id.in_(category_ids))
+            ).all()
+            if category_ids
+            else ()
+        )
+        valid = []
+        for line, row in rows:
+            if isinstance(row, ListingImportRow):
+                if row.provider_id not in providers:
+                    self.fail(line, f"Unknown provider {row.provider_id}")
+                elif row.category_id not in categories:
+                    self.fail(line, f"Unknown category {row.category_id}")
+                else:
+                    valid.append((line, row))
+            elif row.user_id not in providers:
+                self.fail(line, f"Unknown provider {row.user_id}")
+            else:
+                valid.append((line, row))
+        return valid
+
+    def _insert(self, rows: list[tuple[int, SQLModel]]) -> tuple[int, int]:
+        now = datetime.utcnow()
+        listings = [
+            {**row.model_dump(), "created_at": now, "updated_at": now}
+            for _, row in rows
+            if isinstance(row, ListingImportRow)
+        ]
+        windows = [
+            {**row.model_dump(), "created_at": now, "updated_at": now}
+            for _, row in rows
+            if isinstance(row, AvailabilityImportRow)
+        ]
+        # ORM bulk INSERTs go out as executemany / multi-row VALUES, and skip the per-object
+        # mapper events, so the search index and slot cache are updated explicitly.
+        if listings:
+            listing_ids = (
+                self.session.exec(
+                    insert(ServiceListing).returning(
+                        ServiceListing.id, sort_by_parameter_order=True
+                    ),
+                    params=listings,
+                )
+                .scalars()
+                .all()
+            )
+            index_listings(self.session.connection(), listing_ids)
+        if windows:
+            self.session.exec(insert(Availability), params=windows)
+            track_slot_providers(self.session, {window["user_id"] for window in windows})
+        return len(listings), len(windows)
+
+    def _insert_each(self, rows: list[tuple[int, SQLModel]]) -> tuple[int, int]:
+        created = (0, 0)
+        for line, row in rows:
+            try:
+                with self.session.begin_nested():
+                    listings, windows = self._insert([(line, row)])
+            except ROW_ERRORS as error:
+                self.fail(line, str(error.orig))
+            else:
+                created = (created[0] + listings, created[1] + windows)
+        self.session.commit()
+        return created
+
+    def import_chunk(self, lines: list[tuple[int, bytes]]) -> None:
+        parsed = [(line, self._parse(line, raw)) for line, raw in lines]
+        rows = self._check_references([(line, row) for line, row in parsed if row is not None])
+        if not rows:
+            return
+        try:
+            try:
+                created = self._insert(rows)
+                self.session.commit()
+            except ROW_ERRORS:
+                # Something the checks above didn't foresee; retry row by row to isolate it.
+                self.session.rollback()
+                created = self._insert_each(rows)
+        except DBAPIError as error:
+            # Not down to any one row (a lost connection, a lock timeout): this chunk is
+            # reported as failed and the import carries on with the next.
+            self.session.rollback()
+            for line, _ in rows:
+                self.fail(line, f"Chunk not imported: {error.orig}")
+            return
+        self.result.listings_created += created[0]
+        self.result.availability_created += created[1]
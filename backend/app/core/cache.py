@@ -0,0 +1,177 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any
+
+from .config import get_settings
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "cache:invalidate"
+
+_redis_client = None
+_redis_lock = threading.Lock()
+_invalidation_handlers: dict[str, Callable[[], None]] = {}
+_invalidation_thread = None
+
+
+def _resolve(value: Any) -> Any:
+    return value() if callable(value) else value
+
+
+class TTLCache:
+    """Thread-safe in-process cache with a per-entry TTL and an LRU size bound.
+
+    Either limit may be a zero-argument callable, read on each use, so module-level caches can
+    follow ``get_settings()`` rather than whatever it returned at import.
+    """
+
+    def __init__(
+        self, max_entries: int | Callable[[], int], ttl_seconds: float | Callable[[], float]
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + _resolve(self.ttl_seconds), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > _resolve(self.max_entries):
+                self._entries.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class Snapshot:
+    """A single lazily built value, rebuilt on the first read after ``invalidate()``.
+
+    A generation counter stops a rebuild that raced with an invalidation from storing
+    the stale value it read. With ``max_age_seconds`` (a number or a callable returning one)
+    the value is also rebuilt once it is that old, which bounds staleness when an
+    invalidation is missed (a write that bypassed the API, a pub/sub message lost while Redis
+    was down).
+    """
+
+    def __init__(self, max_age_seconds: float | Callable[[], float] | None = None) -> None:
+        self.max_age_seconds = max_age_seconds
+        self._value: Any | None = None
+        self._built_at = 0.0
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get_or_build(self, builder: Callable[[], Any]) -> Any:
+        with self._lock:
+            if self._value is not None and not self._expired():
+                return self._value
+            generation = self._generation
+        value = builder()
+        with self._lock:
+            if generation == self._generation:
+                self._value = value
+                self._built_at = time.monotonic()
+        return value
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._value = None
+            self._generation += 1
+
+    def _expired(self) -> bool:
+        max_age = _resolve(self.max_age_seconds)
+        return max_age is not None and time.monotonic() - self._built_at >= max_age
+
+
+def get_redis():
+    """Return a shared Redis client for ``Settings.redis_url``, created on first use."""
+    global _redis_client
+    if _redis_client is None:
+        with _redis_lock:
+            if _redis_client is None:
+                import redis
+
+                _redis_client = redis.Redis.from_url(
+                    get_settings().redis_url,
+                    socket_connect_timeout=0.25,
+                    socket_timeout=0.25,
+                )
+    return _redis_client
+
+
+def register_invalidation(name: str, handler: Callable[..., None]) -> None:
+    """Run ``handler`` whenever ``publish_invalidation(name)`` is called on any worker.
+
+    Keyed invalidations (``publish_invalidation(name, key)``) call ``handler(key)``.
+    """
+    _invalidation_handlers[name] = handler
+
+
+def publish_invalidation(name: str, key: str | None = None) -> None:
+    handler = _invalidation_handlers[name]
+    handler() if key is None else handler(key)
+    if get_settings().cache_invalidation_use_redis:
+        try:
+            get_redis().publish(INVALIDATION_CHANNEL, name if key is None else f"{name}:{key}")
+        except Exception:
+            logger.warning("Publishing cache invalidation %s failed", name, exc_info=True)
+
+
+def _on_invalidation_message(message: dict[str, Any]) -> None:
+    data = message["data"].decode() if isinstance(message["data"], bytes) else message["data"]
+    name, _, key = data.partition(":")
+    handler = _invalidation_handlers.get(name)
+    if handler is not None:
+        handler(key) if key else handler()
+
+
+def start_invalidation_listener() -> None:
+    global _invalidation_thread
+    if not get_settings().cache_invalidation_use_redis or _invalidation_thread is not None:
+        return
+    import redis
+
+    # A dedicated connection without the short socket timeout used for cache reads.
+    pubsub = redis.Redis.from_url(get_settings().redis_url).pubsub(ignore_subscribe_messages=True)
+    try:
+        pubsub.subscribe(**{INVALIDATION_CHANNEL: _on_invalidation_message})
+    except Exception:
+        logger.warning("Cache invalidation listener could not subscribe", exc_info=True)
+        return
+    _invalidation_thread = pubsub.run_in_thread(
+        sleep_time=1.0,
+        daemon=True,
+        exception_handler=lambda exc, pubsub, thread: logger.warning(
+            "Cache invalidation listener error", exc_info=exc
+        ),
+    )
+
+
+def stop_invalidation_listener() -> None:
+    global _invalidation_thread
+    if _invalidation_thread is not None:
+        _invalidation_thread.stop()
+        _invalidation_thread = None
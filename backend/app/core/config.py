@@ -1,4 +1,5 @@
 from functools import lru_cache
+from pydantic import field_validator
 from pydantic_settings import BaseSettings
 
 
@@ -11,9 +12,90 @@ class Settings(BaseSettings):
     algorithm: str = "HS256"
 
     database_url: str = "sqlite:///./database.db"
+    # Serve the booking, messaging and listing routes from async handlers on an
+    # AsyncEngine (aiosqlite/asyncpg derived from database_url unless set explicitly).
+    async_database: bool = False
+    async_database_url: str | None = None
+
+    # Optional read replica for GET handlers; a user's reads stick to the primary for
+    # read_your_writes_seconds after they commit a write.
+    read_database_url: str | None = None
+    read_your_writes_seconds: float = 5.0
+    read_your_writes_use_redis: bool = False
+
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    # Use NullPool and skip prepared statements when PgBouncer (transaction mode) pools for us.
+    db_pgbouncer_mode: bool = False
+    sqlite_wal: bool = True
+    sqlite_busy_timeout_ms: int = 5000
 
     redis_url: str = "redis://localhost:6379/0"
 
+    # Password hashing runs on its own pool so bcrypt bursts don't starve the request threadpool.
+    password_hash_executor: str = "thread"  # "thread" or "process"
+    password_hash_workers: int = 4
+    password_hash_max_queue: int = 32
+
+    principal_cache_ttl_seconds: int = 30
+    principal_cache_max_entries: int = 10_000
+    principal_cache_use_redis: bool = False
+
+    # WebSocket messaging: fan out across workers through Redis pub/sub when enabled.
+    realtime_use_redis: bool = False
+    ws_heartbeat_seconds: float = 25.0
+    ws_send_queue_size: int = 100
+    # Read receipts sent over a socket are merged for this long before one write.
+    ws_read_receipt_delay_seconds: float = 1.0
+
+    # Per-provider free-slot results; dropped when availability or bookings change.
+    slot_cache_ttl_seconds: int = 300
+    slot_cache_max_entries: int = 10_000
+
+    # Rows validated and inserted per transaction by POST /services/listings:batch.
+    batch_import_chunk_size: int = 1000
+    # Rows fetched and encoded per chunk by the streaming admin exports.
+    export_chunk_rows: int = 1000
+
+    # Broadcast cache invalidations to other workers over Redis pub/sub.
+    cache_invalidation_use_redis: bool = False
+    categories_cache_max_age_seconds: int = 300
+
+    # Token-bucket limits per route and key ("ip", "phone" or "user"), as "<count>/<period>".
+    # Checked before the handler's own dependencies, so rejected logins cost no DB or bcrypt.
+    # "ip" is the peer address uvicorn reports: behind a load balancer, start uvicorn with
+    # --forwarded-allow-ips (or FORWARDED_ALLOW_IPS) set to the proxy's address so it is taken
+    # from X-Forwarded-For, or every client shares the proxy's bucket.
+    rate_limit_enabled: bool = True
+    rate_limit_use_redis: bool = False
+    rate_limits: dict[str, dict[str, str]] = {
+        "auth.login": {"ip": "30/minute", "phone": "10/15minutes"},
+        "auth.register": {"ip": "10/minute"},
+    }
+
+    @field_validator("rate_limits")
+    @classmethod
+    def _check_rate_limits(cls, value: dict[str, dict[str, str]]) -> dict[str, dict[str, str]]:
+        # Imported here: ratelimit reads get_settings from this module.
+        from .ratelimit import RATE_LIMIT_KEYS, parse_rate
+
+        for route, limits in value.items():
+            for key, spec in limits.items():
+                if key not in RATE_LIMIT_KEYS:
+                    raise ValueError(f"{route}: unknown rate limit key {key!r}")
+                parse_rate(spec)
+        return value
+
+    # Per-route request and SQL metrics, served on /metrics for Prometheus.
+    metrics_enabled: bool = True
+    # Development/CI: log likely N+1 patterns per request and slow SELECTs with their plans.
+    query_profiling: bool = False
+    slow_query_ms: float = 100.0
+    repeated_statement_threshold: int = 3
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -22,4 +104,3 @@ class Settings(BaseSettings):
 @lru_cache
 def get_settings() -> Settings:
     return Settings()
-
@@ -1,23 +1,241 @@
-from collections.abc import Generator
+import threading
+import time
+from collections.abc import AsyncGenerator, Generator
+from typing import Any
 
-from sqlmodel import Session, SQLModel, create_engine
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+from sqlmodel import Session, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from .config import get_settings
 
-settings = get_settings()
+_ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
 
-engine = create_engine(
-    settings.database_url,
-    echo=False,
-    connect_args={"check_same_thread": False} if settings.database_url.startswith("sqlite") else {},
-)
+_pool_stats_lock = threading.Lock()
 
 
-def init_db() -> None:
-    SQLModel.metadata.create_all(bind=engine)
+def _new_pool_stats() -> dict[str, float]:
+    return {
+        "checkouts": 0,
+        "checkout_timeouts": 0,
+        "checkout_wait_seconds_total": 0.0,
+        "checkout_wait_seconds_max": 0.0,
+    }
+
+
+def _record_checkout_wait(stats: dict[str, float], elapsed: float, timed_out: bool) -> None:
+    with _pool_stats_lock:
+        if timed_out:
+            stats["checkout_timeouts"] += 1
+            return
+        stats["checkouts"] += 1
+        stats["checkout_wait_seconds_total"] += elapsed
+        stats["checkout_wait_seconds_max"] = max(stats["checkout_wait_seconds_max"], elapsed)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long callers wait for a connection.
+
+    Each pool keeps its own stats, so the primary, replica and async engines report
+    separately, and hands them on to its replacement when the engine is disposed.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.stats = _new_pool_stats()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            _record_checkout_wait(self.stats, time.perf_counter() - started, timed_out=True)
+            raise
+        _record_checkout_wait(self.stats, time.perf_counter() - started, timed_out=False)
+        return connection
+
+    def recreate(self) -> QueuePool:
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+class InstrumentedAsyncQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    pass
+
+
+def _engine_options(database_url: str, is_async: bool) -> dict[str, Any]:
+    settings = get_settings()
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    options: dict[str, Any] = {"echo": False}
+    connect_args: dict[str, Any] = {}
+
+    if backend == "sqlite":
+        if not is_async:
+            connect_args["check_same_thread"] = False
+        connect_args["timeout"] = settings.sqlite_busy_timeout_ms / 1000
+        if url.database in (None, "", ":memory:"):
+            # In-memory databases live and die with their single connection.
+            options["connect_args"] = connect_args
+            return options
+
+    if settings.db_pgbouncer_mode and backend == "postgresql":
+        # PgBouncer does the pooling; prepared statements don't survive its transaction mode.
+        options["poolclass"] = NullPool
+        if url.get_driver_name() == "asyncpg":
+            connect_args["statement_cache_size"] = 0
+            connect_args["prepared_statement_cache_size"] = 0
+    else:
+        options.update(
+            poolclass=InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_recycle=settings.db_pool_recycle,
+            pool_pre_ping=settings.db_pool_pre_ping,
+        )
+
+    options["connect_args"] = connect_args
+    return options
+
+
+def _install_pool_listeners(target: Engine) -> None:
+    if target.dialect.name == "sqlite":
+
+        @event.listens_for(target, "connect")
+        def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+            settings = get_settings()
+            cursor = dbapi_connection.cursor()
+            if settings.sqlite_wal:
+                cursor.execute("PRAGMA journal_mode=WAL")
+                cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}")
+            cursor.close()
+
+
+def _create_engine(database_url: str) -> Engine:
+    created = create_engine(database_url, **_engine_options(database_url, is_async=False))
+    _install_pool_listeners(created)
+    return created
+
+
+# Engines are built on first use, not at import, so importing the app (workers, tests,
+# Alembic, scripts) never touches the database. The schema itself belongs to Alembic.
+_engine: Engine | None = None
+_read_engine: Engine | None = None
+_engine_lock = threading.Lock()
+
+_async_engine: AsyncEngine | None = None
+_async_session_factory: async_sessionmaker[AsyncSession] | None = None
+
+
+def get_engine() -> Engine:
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = _create_engine(get_settings().database_url)
+    return _engine
+
+
+def get_read_engine() -> Engine | None:
+    """The replica engine, or ``None`` when no ``read_database_url`` is configured."""
+    global _read_engine
+    read_database_url = get_settings().read_database_url
+    if _read_engine is None and read_database_url:
+        with _engine_lock:
+            if _read_engine is None:
+                _read_engine = _create_engine(read_database_url)
+    return _read_engine
+
+
+def dispose_engines() -> None:
+    global _engine, _read_engine
+    with _engine_lock:
+        engines, _engine, _read_engine = (_engine, _read_engine), None, None
+    for created in engines:
+        if created is not None:
+            created.dispose()
 
 
 def get_session() -> Generator[Session, None, None]:
-    with Session(engine) as session:
+    with Session(get_engine()) as session:
+        yield session
+
+
+def get_read_session() -> Generator[Session, None, None]:
+    with Session(get_read_engine() or get_engine()) as session:
+        yield session
+
+
+def pool_stats(pool: InstrumentedQueuePool) -> dict[str, float]:
+    """Checkout counts and waits for one instrumented pool, plus its current occupancy."""
+    with _pool_stats_lock:
+        stats = dict(pool.stats)
+    stats["pool_size"] = pool.size()
+    stats["checked_out"] = pool.checkedout()
+    stats["idle"] = pool.checkedin()
+    stats["overflow"] = max(0, pool.overflow())
+    stats["checkout_wait_seconds_avg"] = (
+        stats["checkout_wait_seconds_total"] / stats["checkouts"] if stats["checkouts"] else 0.0
+    )
+    return stats
+
+
+def pool_metrics() -> dict[str, dict[str, float]]:
+    """``pool_stats`` for each engine built so far ("primary", "replica", "async").
+
+    Engines without an instrumented pool (SQLite in memory, NullPool under PgBouncer) are left
+    out.
+    """
+    engines = {
+        "primary": _engine,
+        "replica": _read_engine,
+        "async": _async_engine.sync_engine if _async_engine is not None else None,
+    }
+    return {
+        name: pool_stats(created.pool)
+        for name, created in engines.items()
+        if created is not None and isinstance(created.pool, InstrumentedQueuePool)
+    }
+
+
+def async_database_url(database_url: str) -> str:
+    """Map a sync database URL onto its async driver, e.g. ``postgresql+asyncpg``."""
+    url = make_url(database_url)
+    driver = _ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver configured for {url.get_backend_name()!r}")
+    return url.set(drivername=f"{url.get_backend_name()}+{driver}").render_as_string(
+        hide_password=False
+    )
+
+
+def get_async_engine() -> AsyncEngine:
+    global _async_engine, _async_session_factory
+    if _async_engine is None:
+        settings = get_settings()
+        url = settings.async_database_url or async_database_url(settings.database_url)
+        _async_engine = create_async_engine(url, **_engine_options(url, is_async=True))
+        _install_pool_listeners(_async_engine.sync_engine)
+        _async_session_factory = async_sessionmaker(
+            _async_engine, class_=AsyncSession, expire_on_commit=False
+        )
+    return _async_engine
+
+
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    get_async_engine()
+    async with _async_session_factory() as session:
         yield session
 
+
+async def dispose_async_engine() -> None:
+    global _async_engine, _async_session_factory
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = _async_session_factory = None
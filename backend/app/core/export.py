@@ -0,0 +1,90 @@
+import csv
+import io
+import json
+from collections.abc import Iterator
+from datetime import date, datetime, time, timezone
+from enum import Enum
+
+from fastapi.responses import StreamingResponse
+from sqlmodel import Session
+
+from .config import get_settings
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+MEDIA_TYPES = {ExportFormat.NDJSON: "application/x-ndjson", ExportFormat.CSV: "text/csv"}
+
+
+def naive_utc(value: datetime | None) -> datetime | None:
+    """Timestamps are stored as naive UTC; bring aware filter values onto that scale."""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def created_between(query, column, created_from: datetime | None, created_to: datetime | None):
+    """Restrict ``query`` to ``created_from <= column < created_to``."""
+    created_from, created_to = naive_utc(created_from), naive_utc(created_to)
+    if created_from is not None:
+        query = query.where(column >= created_from)
+    if created_to is not None:
+        query = query.where(column < created_to)
+    return query
+
+
+def _plain(value):
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime | date | time):
+        return value.isoformat()
+    return value
+
+
+def export_rows(session: Session, query, export_format: ExportFormat) -> Iterator[bytes]:
+    """Encode ``query``'s rows a partition at a time and close ``session`` when done.
+
+    ``yield_per`` makes the driver use a server-side cursor where it has one (psycopg2's named
+    cursors); SQLite's cursor already steps lazily. Either way only one partition of rows is
+    held in memory, however many the query returns.
+    """
+    chunk_rows = get_settings().export_chunk_rows
+    try:
+        result = session.exec(query.execution_options(yield_per=chunk_rows))
+        names = list(result.keys())
+        if export_format == ExportFormat.CSV:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(names)
+            for partition in result.partitions():
+                writer.writerows([_plain(value) for value in row] for row in partition)
+                yield buffer.getvalue().encode()
+                buffer.seek(0)
+                buffer.truncate()
+            if buffer.tell():
+                yield buffer.getvalue().encode()
+        else:
+            for partition in result.partitions():
+                yield "".join(
+                    json.dumps(
+                        {name: _plain(value) for name, value in zip(names, row, strict=True)}
+                    )
+                    + "\n"
+                    for row in partition
+                ).encode()
+    finally:
+        session.close()
+
+
+def export_response(
+    session: Session, query, export_format: ExportFormat, name: str
+) -> StreamingResponse:
+    extension = "csv" if export_format == ExportFormat.CSV else "ndjson"
+    return StreamingResponse(
+        export_rows(session, query, export_format),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{extension}"'},
+    )
@@ -0,0 +1,153 @@
+import math
+from typing import NamedTuple
+
+from sqlalchemy import Float, and_, event, or_
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+from ..models.address import Address
+
+EARTH_RADIUS_KM = 6371.0088
+GEOHASH_PRECISION = 9  # ~4.8 m x 4.8 m cells
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+# On the same sphere the haversine uses, so the prefilter never cuts into the exact circle.
+_KM_PER_DEGREE = EARTH_RADIUS_KM * math.pi / 180
+
+
+class NearFilter(NamedTuple):
+    latitude: float
+    longitude: float
+    radius_km: float
+
+
+def haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance in kilometres."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = (
+        math.sin(math.radians(lat2 - lat1) / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def encode_geohash(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        target, bounds = (longitude, lon_range) if even else (latitude, lat_range)
+        mid = (bounds[0] + bounds[1]) / 2
+        value <<= 1
+        if target >= mid:
+            value |= 1
+            bounds[0] = mid
+        else:
+            bounds[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_BASE32[value])
+            bits, value = 0, 0
+    return "".join(chars)
+
+
+def _cell_size_degrees(precision: int) -> tuple[float, float]:
+    lon_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    return 180.0 / 2**lat_bits, 360.0 / 2**lon_bits
+
+
+def geohash_prefixes(latitude: float, longitude: float, radius_km: float) -> set[str]:
+    """Cells covering a circle: the centre cell and its neighbours, each at least as large
+    as the radius, so every point within ``radius_km`` falls in one of them."""
+    widest_lat = min(89.9, abs(latitude) + radius_km / _KM_PER_DEGREE)
+    precision = 1
+    for candidate in range(GEOHASH_PRECISION, 0, -1):
+        height, width = _cell_size_degrees(candidate)
+        if (
+            height * _KM_PER_DEGREE >= radius_km
+            and width * _KM_PER_DEGREE * math.cos(math.radians(widest_lat)) >= radius_km
+        ):
+            precision = candidate
+            break
+    height, width = _cell_size_degrees(precision)
+    prefixes = set()
+    for dlat in (-height, 0.0, height):
+        for dlon in (-width, 0.0, width):
+            lat = max(-90.0, min(90.0, latitude + dlat))
+            lon = (longitude + dlon + 180.0) % 360.0 - 180.0
+            prefixes.add(encode_geohash(lat, lon, precision))
+    return prefixes
+
+
+class haversine_km(FunctionElement):
+    """``haversine_km(lat1, lon1, lat2, lon2)`` in SQL.
+
+    PostgreSQL gets the formula inline; SQLite calls the Python ``haversine`` registered on
+    every connection below, since its math functions are a compile-time option.
+    """
+
+    type = Float()
+    inherit_cache = True
+    name = "haversine_km"
+
+
+@compiles(haversine_km)
+def _compile_haversine(element, compiler, **kw):
+    return f"haversine_km({compiler.process(element.clauses, **kw)})"
+
+
+@compiles(haversine_km, "postgresql")
+def _compile_haversine_postgresql(element, compiler, **kw):
+    lat1, lon1, lat2, lon2 = (compiler.process(arg, **kw) for arg in element.clauses)
+    return (
+        f"(2 * {EARTH_RADIUS_KM} * asin(least(1.0, sqrt("
+        f"power(sin(radians(({lat2}) - ({lat1})) / 2), 2) + "
+        f"cos(radians({lat1})) * cos(radians({lat2})) * "
+        f"power(sin(radians(({lon2}) - ({lon1})) / 2), 2)))))"
+    )
+
+
+@event.listens_for(Engine, "connect")
+def _register_sqlite_haversine(dbapi_connection, connection_record) -> None:
+    if hasattr(dbapi_connection, "create_function"):
+        dbapi_connection.create_function("haversine_km", 4, _sql_haversine, deterministic=True)
+
+
+def _sql_haversine(lat1, lon1, lat2, lon2):
+    if None in (lat1, lon1, lat2, lon2):
+        return None
+    return haversine(lat1, lon1, lat2, lon2)
+
+
+@event.listens_for(Address, "before_insert")
+@event.listens_for(Address, "before_update")
+def _set_geohash(mapper, connection, target: Address) -> None:
+    if target.latitude is None or target.longitude is None:
+        target.geohash = None
+    else:
+        target.geohash = encode_geohash(target.latitude, target.longitude)
+
+
+def near_condition(geohash_column, latitude_column, longitude_column, near: NearFilter):
+    """B-tree prefilter on geohash prefixes and a bounding box, refined by exact distance."""
+    prefix_ranges = [
+        and_(geohash_column >= prefix, geohash_column < prefix + "~")
+        for prefix in sorted(geohash_prefixes(near.latitude, near.longitude, near.radius_km))
+    ]
+    lat_delta = near.radius_km / _KM_PER_DEGREE
+    conditions = [
+        or_(*prefix_ranges),
+        latitude_column.between(near.latitude - lat_delta, near.latitude + lat_delta),
+    ]
+    cos_lat = math.cos(math.radians(min(89.9, abs(near.latitude) + lat_delta)))
+    lon_delta = near.radius_km / (_KM_PER_DEGREE * cos_lat)
+    if near.longitude - lon_delta > -180 and near.longitude + lon_delta < 180:
+        conditions.append(
+            longitude_column.between(near.longitude - lon_delta, near.longitude + lon_delta)
+        )
+    conditions.append(
+        haversine_km(latitude_column, longitude_column, near.latitude, near.longitude)
+        <= near.radius_km
+    )
+    return and_(*conditions)
@@ -0,0 +1,180 @@
+"""Prometheus metrics: per-route HTTP timings and the SQL each request runs.
+
+Requests are labelled with their route template (``/api/v1/bookings/{booking_id}/status``),
+never the raw path, so label cardinality stays bounded by the route table.
+
+With several uvicorn workers each process has its own counters. Point
+``PROMETHEUS_MULTIPROC_DIR`` at an empty directory (cleared on deploy) before the workers
+start; prometheus_client then keeps values in files there and ``/metrics`` merges them, so
+any worker can answer a scrape.
+"""
+
+import os
+import time
+from collections.abc import Callable
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+from fastapi import APIRouter, Response
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by route and status.", ["method", "route", "status"]
+)
+REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "Time to the end of the response body.", ["method", "route"]
+)
+IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "Requests currently being handled.",
+    ["method", "route"],
+    multiprocess_mode="livesum",
+)
+RESPONSE_BYTES = Histogram(
+    "http_response_size_bytes",
+    "Response body size.",
+    ["method", "route"],
+    buckets=(256, 1024, 4096, 16_384, 65_536, 262_144, 1_048_576, 4_194_304, float("inf")),
+)
+REQUEST_STATEMENTS = Histogram(
+    "http_request_db_statements",
+    "SQL statements executed per request.",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100, float("inf")),
+)
+REQUEST_DB_SECONDS = Histogram(
+    "http_request_db_duration_seconds",
+    "Time spent executing SQL per request.",
+    ["method", "route"],
+)
+
+
+@dataclass
+class QueryStats:
+    """SQL run on behalf of one request."""
+
+    statements: int = 0
+    seconds: float = 0.0
+
+
+# Set per request by the middleware. Sync handlers run on the threadpool with a copy of the
+# context, and SQLAlchemy's async engine carries it into its greenlets, so the cursor events
+# below find the same object wherever the statement executes.
+current_queries: ContextVar[QueryStats | None] = ContextVar("current_queries", default=None)
+
+
+# Called as (connection, statement, parameters, executemany, seconds) after each statement,
+# so query profiling reuses the timing below instead of installing its own cursor events.
+statement_observers: list[Callable[[Connection, str, Any, bool, float], None]] = []
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_statement(conn, cursor, statement, parameters, context, executemany) -> None:
+    # Kept on the execution context rather than the connection, so a statement that raises
+    # leaves nothing behind.
+    if context is not None:
+        context.statement_started = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _finish_statement(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = getattr(context, "statement_started", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    stats = current_queries.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.seconds += elapsed
+    for observer in statement_observers:
+        observer(conn, statement, parameters, executemany, elapsed)
+
+
+def route_template(scope: Scope) -> str:
+    """The route Starlette dispatches to: the first full match, else the first 405 match."""
+    partial = UNMATCHED_ROUTE
+    for route in scope["app"].router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+        if match == Match.PARTIAL and partial == UNMATCHED_ROUTE:
+            partial = route.path
+    return partial
+
+
+class PrometheusMiddleware:
+    """Pure ASGI middleware, so streamed bodies are timed and sized to their last chunk."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        labels = (scope["method"], route_template(scope))
+        stats = QueryStats()
+        token = current_queries.set(stats)
+        status_code = 500
+        size = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        in_progress = IN_PROGRESS.labels(*labels)
+        in_progress.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            REQUEST_SECONDS.labels(*labels).observe(time.perf_counter() - started)
+            in_progress.dec()
+            current_queries.reset(token)
+            REQUESTS.labels(*labels, str(status_code)).inc()
+            RESPONSE_BYTES.labels(*labels).observe(size)
+            REQUEST_STATEMENTS.labels(*labels).observe(stats.statements)
+            REQUEST_DB_SECONDS.labels(*labels).observe(stats.seconds)
+
+
+def multiprocess_enabled() -> bool:
+    return "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+
+def mark_worker_dead() -> None:
+    """Drop this worker's live gauges from the shared files when it shuts down."""
+    if multiprocess_enabled():
+        multiprocess.mark_process_dead(os.getpid())
+
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics() -> Response:
+    registry = REGISTRY
+    if multiprocess_enabled():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,125 @@
+"""Per-request query profiling for development and CI.
+
+With ``QUERY_PROFILING=true`` every HTTP request collects the SQL it runs. At the end of the
+request a statement that ran ``repeated_statement_threshold`` times or more with different
+parameters is logged as a likely N+1 (a lazy relationship loaded row by row, a lookup inside a
+loop). Any SELECT slower than ``slow_query_ms`` is logged with the database's plan for it.
+
+The test suite turns this on and checks the collected profiles against per-endpoint budgets
+(the ``query_budget`` fixture in ``tests/conftest.py``).
+"""
+
+import logging
+from collections import Counter
+from collections.abc import Callable
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from .config import get_settings
+from .metrics import route_template, statement_observers
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class QueryProfile:
+    """Every statement one request ran, with how often and how long."""
+
+    slow_query_seconds: float
+    statements: int = 0
+    seconds: float = 0.0
+    executions: Counter[str] = field(default_factory=Counter)
+    parameter_sets: dict[str, set[str]] = field(default_factory=dict)
+
+    def record(self, statement: str, parameters, elapsed: float) -> None:
+        self.statements += 1
+        self.seconds += elapsed
+        self.executions[statement] += 1
+        self.parameter_sets.setdefault(statement, set()).add(repr(parameters))
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Statements run at least ``threshold`` times with differing parameters."""
+        return [
+            (statement, count)
+            for statement, count in self.executions.most_common()
+            if count >= threshold and len(self.parameter_sets[statement]) > 1
+        ]
+
+    def report(self) -> str:
+        lines = [f"{self.statements} statements in {self.seconds * 1000:.1f} ms:"]
+        lines += [f"  {count}x {statement}" for statement, count in self.executions.most_common()]
+        return "\n".join(lines)
+
+
+current_profile: ContextVar[QueryProfile | None] = ContextVar("current_profile", default=None)
+
+# Called with (route label, profile) after each profiled request; the test suite uses this to
+# see requests served on the TestClient's thread.
+profile_observers: list[Callable[[str, QueryProfile], None]] = []
+
+
+def explain(conn, statement: str, parameters) -> str:
+    """The plan for ``statement``, run on the same connection with the same parameters."""
+    prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+    # A raw DB-API cursor, so the EXPLAIN itself doesn't come back through these events.
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute(prefix + statement, parameters)
+        return "\n".join(f"  {row[-1]}" for row in cursor.fetchall())
+    finally:
+        cursor.close()
+
+
+def _record_statement(conn, statement: str, parameters, executemany: bool, elapsed: float) -> None:
+    profile = current_profile.get()
+    if profile is None:
+        return
+    profile.record(statement, parameters, elapsed)
+    if (
+        elapsed >= profile.slow_query_seconds
+        and not executemany
+        and statement.lstrip().upper().startswith(("SELECT", "WITH"))
+    ):
+        try:
+            plan = explain(conn, statement, parameters)
+        except Exception:
+            plan = "  (plan unavailable)"
+            logger.debug("EXPLAIN failed", exc_info=True)
+        logger.warning("Slow query (%.1f ms): %s\n%s", elapsed * 1000, statement, plan)
+
+
+# Statements are timed once, by the cursor events in ``metrics``.
+statement_observers.append(_record_statement)
+
+
+class QueryProfilingMiddleware:
+    """Profiles each request while ``query_profiling`` is on; passes straight through if not."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        settings = get_settings()
+        if scope["type"] != "http" or not settings.query_profiling:
+            await self.app(scope, receive, send)
+            return
+
+        profile = QueryProfile(slow_query_seconds=settings.slow_query_ms / 1000)
+        token = current_profile.set(profile)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_profile.reset(token)
+            label = f"{scope['method']} {route_template(scope)}"
+            for statement, count in profile.repeated(settings.repeated_statement_threshold):
+                logger.warning(
+                    "Possible N+1 in %s: ran %d times with different parameters: %s",
+                    label,
+                    count,
+                    statement,
+                )
+            logger.debug("%s ran %s", label, profile.report())
+            for observer in list(profile_observers):
+                observer(label, profile)
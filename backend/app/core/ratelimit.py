@@ -0,0 +1,121 @@
+"""Token-bucket rate limiting, in Redis when workers share limits, otherwise in process.
+
+A rate such as ``"10/15minute"`` is a bucket of 10 tokens refilled evenly over 15 minutes:
+bursts up to the full 10 pass, after which one request is let through every 90 seconds.
+"""
+
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+
+from .cache import get_redis
+from .config import get_settings
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_KEYS = ("ip", "phone", "user")
+PERIOD_SECONDS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+_RATE_PATTERN = re.compile(r"^\s*(\d+)\s*/\s*(\d*)\s*(second|minute|hour|day)s?\s*$")
+
+
+@dataclass(frozen=True)
+class Rate:
+    limit: int
+    seconds: float
+
+    @property
+    def per_second(self) -> float:
+        return self.limit / self.seconds
+
+
+@lru_cache
+def parse_rate(spec: str) -> Rate:
+    """``"<count>/[<n>]<second|minute|hour|day>"``, e.g. ``"30/minute"`` or ``"5/15minutes"``."""
+    match = _RATE_PATTERN.match(spec)
+    if not match or int(match.group(1)) < 1:
+        raise ValueError(f"Invalid rate limit {spec!r}")
+    count, multiple, period = match.groups()
+    return Rate(int(count), int(multiple or 1) * PERIOD_SECONDS[period])
+
+
+def take_token(tokens: float, updated: float, now: float, rate: Rate) -> tuple[float, float]:
+    """Refill a bucket up to ``now`` and take one token.
+
+    Returns the tokens left and, when the bucket was empty, the seconds until one is back
+    (0.0 means the request is allowed).
+    """
+    tokens = min(rate.limit, tokens + (now - updated) * rate.per_second)
+    if tokens >= 1:
+        return tokens - 1, 0.0
+    return tokens, (1 - tokens) / rate.per_second
+
+
+class MemoryRateLimiter:
+    """Per-process buckets, LRU-bounded; enough for a single node or a development server."""
+
+    def __init__(self, max_entries: int = 100_000) -> None:
+        self.max_entries = max_entries
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, rate: Rate) -> float:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (rate.limit, now))
+            tokens, retry_after = take_token(tokens, updated, now, rate)
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_entries:
+                self._buckets.popitem(last=False)
+        return retry_after
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+# The same refill-and-take as ``take_token``, atomic on the Redis server and timed by its clock
+# so workers with skewed clocks agree. Idle buckets expire once they would be full again.
+TOKEN_BUCKET_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local per_second = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(bucket[1]) or limit
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(limit, tokens + (now - updated) * per_second)
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    retry_after = (1 - tokens) / per_second
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(limit / per_second * 1000))
+return tostring(retry_after)
+"""
+
+memory_limiter = MemoryRateLimiter()
+_token_bucket = None
+
+
+def _redis_hit(key: str, rate: Rate) -> float:
+    global _token_bucket
+    if _token_bucket is None:
+        _token_bucket = get_redis().register_script(TOKEN_BUCKET_SCRIPT)
+    return float(_token_bucket(keys=[key], args=[rate.limit, rate.per_second]))
+
+
+def hit(key: str, rate: Rate) -> float:
+    """Take a token for ``key``; returns 0.0 if allowed, else seconds until retrying helps."""
+    if get_settings().rate_limit_use_redis:
+        try:
+            return _redis_hit(key, rate)
+        except Exception:  # Limits still apply per worker while Redis is unreachable.
+            logger.warning("Rate limiting in Redis failed; counting in process", exc_info=True)
+    return memory_limiter.hit(key, rate)
@@ -0,0 +1,107 @@
+"""Provider rating aggregates.
+
+``User.rating_avg`` is derived from ``rating_sum`` / ``rating_count``, which every review bumps
+in its own transaction. ``recompute_ratings`` rebuilds them from the review table for repairs::
+
+    python -m app.core.ratings --chunk-size 1000
+"""
+
+import argparse
+import logging
+
+from sqlalchemy import Float, bindparam, cast, func, update
+from sqlmodel import Session, select
+
+from ..models.review import Review
+from ..models.user import User
+
+logger = logging.getLogger(__name__)
+
+
+def add_rating_statement(user_id: int, rating: int):
+    """Fold one rating into the user's aggregates without reading the review table.
+
+    The SET expressions all see the row's old values, so the average is computed from the
+    same new sum and count written alongside it, and concurrent reviews can't lose updates.
+    """
+    return (
+        update(User)
+        .where(User.id == user_id)
+        .values(
+            rating_count=User.rating_count + 1,
+            rating_sum=User.rating_sum + rating,
+            rating_avg=cast(User.rating_sum + rating, Float) / (User.rating_count + 1),
+        )
+    )
+
+
+_REPAIR_STATEMENT = (
+    update(User)
+    .where(User.id == bindparam("user_id"))
+    .values(
+        rating_count=bindparam("count"),
+        rating_sum=bindparam("total"),
+        rating_avg=bindparam("average"),
+    )
+)
+
+
+def recompute_ratings(session: Session, chunk_size: int = 1000) -> int:
+    """Rebuild every user's aggregates from their reviews, one committed chunk at a time.
+
+    Users are walked in id order so each chunk is an index range, and only rows that have
+    drifted are written. Returns the number of users repaired.
+    """
+    repaired = 0
+    after = 0
+    while True:
+        users = session.exec(
+            select(User.id, User.rating_count, User.rating_sum, User.rating_avg)
+            .where(User.id > after)
+            .order_by(User.id)
+            .limit(chunk_size)
+        ).all()
+        if not users:
+            return repaired
+        after = users[-1].id
+        totals = {
+            reviewee_id: (count, total)
+            for reviewee_id, count, total in session.exec(
+                select(Review.reviewee_id, func.count(), func.sum(Review.rating))
+                .where(Review.reviewee_id.between(users[0].id, after))
+                .group_by(Review.reviewee_id)
+            )
+        }
+        drifted = []
+        for user in users:
+            count, total = totals.get(user.id, (0, 0))
+            average = total / count if count else 0.0
+            if (
+                user.rating_count != count
+                or user.rating_sum != total
+                or abs(user.rating_avg - average) > 1e-9
+            ):
+                drifted.append(
+                    {"user_id": user.id, "count": count, "total": total, "average": average}
+                )
+        if drifted:
+            session.connection().execute(_REPAIR_STATEMENT, drifted)
+            repaired += len(drifted)
+        session.commit()
+        logger.info("Ratings checked through user %s; %s repaired so far", after, repaired)
+
+
+def main() -> None:
+    from .database import get_engine
+
+    parser = argparse.ArgumentParser(description="Recompute user rating aggregates.")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    with Session(get_engine()) as session:
+        repaired = recompute_ratings(session, args.chunk_size)
+    print(f"repaired {repaired} users")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from collections.abc import Iterable
+from typing import Any
+
+from fastapi import WebSocket, WebSocketDisconnect, status
+
+from .cache import get_redis
+from .config import get_settings
+
+logger = logging.getLogger(__name__)
+
+REALTIME_CHANNEL = "realtime:events"
+
+
+class ClientConnection:
+    """One WebSocket plus its bounded outbound queue."""
+
+    def __init__(self, websocket: WebSocket, user_id: int, queue_size: int) -> None:
+        self.websocket = websocket
+        self.user_id = user_id
+        self.queue: asyncio.Queue[str] = asyncio.Queue(maxsize=queue_size)
+        self.closed = asyncio.Event()
+        self.close_code = status.WS_1000_NORMAL_CLOSURE
+
+    def enqueue(self, text: str) -> None:
+        try:
+            self.queue.put_nowait(text)
+        except asyncio.QueueFull:
+            # Slow consumer: disconnect it instead of buffering without bound.
+            self.close(status.WS_1013_TRY_AGAIN_LATER)
+
+    def close(self, code: int) -> None:
+        if not self.closed.is_set():
+            self.close_code = code
+            self.closed.set()
+
+    async def send_loop(self) -> None:
+        while True:
+            await self.websocket.send_text(await self.queue.get())
+
+
+class MessageHub:
+    """Delivers events to the WebSocket connections of their recipients.
+
+    Events published on any worker go through Redis pub/sub when ``realtime_use_redis`` is
+    set, so every worker delivers to the sockets it holds; otherwise delivery is local.
+    """
+
+    def __init__(self) -> None:
+        self._connections: dict[int, set[ClientConnection]] = defaultdict(set)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._listener: asyncio.Task | None = None
+
+    @property
+    def connection_count(self) -> int:
+        return sum(len(connections) for connections in self._connections.values())
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        if get_settings().realtime_use_redis and self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+        for connections in list(self._connections.values()):
+            for connection in list(connections):
+                connection.close(status.WS_1001_GOING_AWAY)
+        self._loop = None
+
+    def publish(self, recipients: Iterable[int], event: dict[str, Any]) -> None:
+        """Queue ``event`` for every connection of ``recipients``. Safe to call from any thread."""
+        envelope = {"recipients": sorted(set(recipients)), "event": event}
+        if get_settings().realtime_use_redis:
+            try:
+                get_redis().publish(REALTIME_CHANNEL, json.dumps(envelope, default=str))
+                return
+            except Exception:
+                logger.warning(
+                    "Realtime publish to Redis failed; delivering locally", exc_info=True
+                )
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._dispatch(envelope)
+        else:
+            try:
+                loop.call_soon_threadsafe(self._dispatch, envelope)
+            except RuntimeError:  # Loop closed between the check and the call.
+                pass
+
+    def _dispatch(self, envelope: dict[str, Any]) -> None:
+        text = json.dumps(envelope["event"], default=str)
+        for user_id in envelope["recipients"]:
+            for connection in list(self._connections.get(user_id, ())):
+                connection.enqueue(text)
+
+    async def _listen(self) -> None:
+        import redis.asyncio as aioredis
+
+        while True:
+            client = aioredis.Redis.from_url(get_settings().redis_url)
+            try:
+                async with client.pubsub(ignore_subscribe_messages=True) as pubsub:
+                    await pubsub.subscribe(REALTIME_CHANNEL)
+                    async for message in pubsub.listen():
+                        self._dispatch(json.loads(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("Realtime Redis listener failed; reconnecting", exc_info=True)
+                await asyncio.sleep(1.0)
+            finally:
+                await client.aclose()
+
+    async def serve(self, websocket: WebSocket, user_id: int, on_event=None) -> None:
+        """Pump an accepted WebSocket until it disconnects, idles out or falls behind."""
+        settings = get_settings()
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+        connection = ClientConnection(websocket, user_id, settings.ws_send_queue_size)
+        self._connections[user_id].add(connection)
+        tasks = {
+            asyncio.create_task(connection.send_loop()),
+            asyncio.create_task(self._receive_loop(connection, on_event)),
+            asyncio.create_task(self._heartbeat_loop(connection)),
+            asyncio.create_task(connection.closed.wait()),
+        }
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if not task.cancelled() and task.exception() is not None:
+                    logger.debug("WebSocket task ended", exc_info=task.exception())
+        finally:
+            for task in tasks:
+                task.cancel()
+            self._connections[user_id].discard(connection)
+            if not self._connections[user_id]:
+                del self._connections[user_id]
+            try:
+                await websocket.close(code=connection.close_code)
+            except Exception:  # Already closed by the client.
+                pass
+
+    async def _receive_loop(self, connection: ClientConnection, on_event) -> None:
+        idle_timeout = get_settings().ws_heartbeat_seconds * 2
+        while True:
+            try:
+                text = await asyncio.wait_for(connection.websocket.receive_text(), idle_timeout)
+            except TimeoutError:
+                connection.close(status.WS_1001_GOING_AWAY)
+                return
+            except WebSocketDisconnect:
+                connection.close(status.WS_1000_NORMAL_CLOSURE)
+                return
+            try:
+                event = json.loads(text)
+            except ValueError:
+                continue
+            if not isinstance(event, dict):
+                continue
+            if event.get("type") == "ping":
+                connection.enqueue(json.dumps({"type": "pong"}))
+            elif on_event is not None and event.get("type") != "pong":
+                await on_event(connection, event)
+
+    async def _heartbeat_loop(self, connection: ClientConnection) -> None:
+        while True:
+            await asyncio.sleep(get_settings().ws_heartbeat_seconds)
+            connection.enqueue(json.dumps({"type": "ping"}))
+
+
+message_hub = MessageHub()
@@ -0,0 +1,38 @@
+"""JSON responses rendered with orjson.
+
+``ORJSONResponse`` is the app's default response class, so handlers that return models still
+go through their ``response_model`` but are encoded by orjson instead of ``json.dumps``.
+
+List endpoints that select exactly their read model's columns skip that path altogether:
+the rows come from our own tables, so validating them into models and FastAPI validating and
+dumping them again would only repeat work. ``rows_response`` writes them straight to bytes.
+"""
+
+from collections.abc import Mapping, Sequence
+
+import orjson
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import Row
+from starlette.responses import Response
+
+__all__ = ["ORJSONResponse", "keyset_page", "rows_response"]
+
+
+def rows_response(rows: Sequence[Row], headers: Mapping[str, str] | None = None) -> Response:
+    """Serialize column rows as a JSON array of objects keyed by column name.
+
+    orjson renders datetimes, dates, times and enums the way the pydantic read models do.
+    """
+    return Response(
+        orjson.dumps([row._asdict() for row in rows]),
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+def keyset_page(rows: Sequence[Row], limit: int) -> Response:
+    """One page of a ``limit + 1`` keyset query, with ``X-Next-Cursor`` when more remain."""
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows_response(rows, {"X-Next-Cursor": str(rows[-1].id)})
+    return rows_response(rows)
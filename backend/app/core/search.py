@@ -0,0 +1,201 @@
+import re
+from collections.abc import Sequence
+from typing import Any
+
+from sqlalchemy import Connection, bindparam, event, table, text
+from sqlmodel import Session, select
+
+from ..models.service import ServiceCategory, ServiceListing
+
+# Listings are mirrored into a tsvector table (GIN-indexed) on PostgreSQL and an FTS5 virtual
+# table on SQLite. Mapper events keep the mirror current in the same transaction as each write.
+SEARCH_TABLE = "servicelisting_search"
+
+_PG_DOCUMENT = (
+    "setweight(to_tsvector('english', coalesce({title}, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce({category}, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce({description}, '')), 'C')"
+)
+
+
+def _is_postgres(connection: Connection) -> bool:
+    return connection.dialect.name == "postgresql"
+
+
+def create_search_index(connection: Connection) -> None:
+    if _is_postgres(connection):
+        connection.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} ("
+                "listing_id INTEGER PRIMARY KEY REFERENCES servicelisting(id) ON DELETE CASCADE, "
+                "document tsvector NOT NULL)"
+            )
+        )
+        connection.execute(
+            text(
+                f"CREATE INDEX IF NOT EXISTS ix_{SEARCH_TABLE}_document "
+                f"ON {SEARCH_TABLE} USING GIN (document)"
+            )
+        )
+    else:
+        # Column order matters for the bm25() weights used in search_listings.
+        connection.execute(
+            text(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} "
+                "USING fts5(title, category, description, tokenize='porter unicode61')"
+            )
+        )
+
+
+def drop_search_index(connection: Connection) -> None:
+    connection.execute(text(f"DROP TABLE IF EXISTS {SEARCH_TABLE}"))
+
+
+def rebuild_search_index(connection: Connection) -> None:
+    """Repopulate the search index from the listing and category tables."""
+    if _is_postgres(connection):
+        document = _PG_DOCUMENT.format(
+            title="l.title", category="c.name", description="l.description"
+        )
+        connection.execute(text(f"TRUNCATE {SEARCH_TABLE}"))
+        connection.execute(
+            text(
+                f"INSERT INTO {SEARCH_TABLE} (listing_id, document) "
+                f"SELECT l.id, {document} FROM servicelisting l "
+                "LEFT JOIN servicecategory c ON c.id = l.category_id"
+            )
+        )
+    else:
+        connection.execute(text(f"DELETE FROM {SEARCH_TABLE}"))
+        connection.execute(
+            text(
+                f"INSERT INTO {SEARCH_TABLE} (rowid, title, category, description) "
+                "SELECT l.id, l.title, coalesce(c.name, ''), l.description FROM servicelisting l "
+                "LEFT JOIN servicecategory c ON c.id = l.category_id"
+            )
+        )
+
+
+def index_listings(connection: Connection, listing_ids: Sequence[int]) -> None:
+    """Index freshly inserted listings in one statement; bulk inserts skip the mapper events."""
+    if not listing_ids:
+        return
+    ids = {"listing_ids": list(listing_ids)}
+    if _is_postgres(connection):
+        document = _PG_DOCUMENT.format(
+            title="l.title", category="c.name", description="l.description"
+        )
+        connection.execute(
+            text(
+                f"INSERT INTO {SEARCH_TABLE} (listing_id, document) "
+                f"SELECT l.id, {document} FROM servicelisting l "
+                "LEFT JOIN servicecategory c ON c.id = l.category_id "
+                "WHERE l.id IN :listing_ids "
+                "ON CONFLICT (listing_id) DO UPDATE SET document = EXCLUDED.document"
+            ).bindparams(bindparam("listing_ids", expanding=True)),
+            ids,
+        )
+    else:
+        connection.execute(
+            text(
+                f"INSERT INTO {SEARCH_TABLE} (rowid, title, category, description) "
+                "SELECT l.id, l.title, coalesce(c.name, ''), l.description FROM servicelisting l "
+                "LEFT JOIN servicecategory c ON c.id = l.category_id "
+                "WHERE l.id IN :listing_ids"
+            ).bindparams(bindparam("listing_ids", expanding=True)),
+            ids,
+        )
+
+
+def index_listing(connection: Connection, listing: ServiceListing) -> None:
+    category = connection.execute(
+        select(ServiceCategory.name).where(ServiceCategory.id == listing.category_id)
+    ).scalar()
+    params = {
+        "listing_id": listing.id,
+        "title": listing.title,
+        "category": category or "",
+        "description": listing.description,
+    }
+    if _is_postgres(connection):
+        document = _PG_DOCUMENT.format(
+            title=":title", category=":category", description=":description"
+        )
+        connection.execute(
+            text(
+                f"INSERT INTO {SEARCH_TABLE} (listing_id, document) "
+                f"VALUES (:listing_id, {document}) "
+                "ON CONFLICT (listing_id) DO UPDATE SET document = EXCLUDED.document"
+            ),
+            params,
+        )
+    else:
+        connection.execute(text(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = :listing_id"), params)
+        connection.execute(
+            text(
+                f"INSERT INTO {SEARCH_TABLE} (rowid, title, category, description) "
+                "VALUES (:listing_id, :title, :category, :description)"
+            ),
+            params,
+        )
+
+
+def remove_listing(connection: Connection, listing_id: int) -> None:
+    key = "listing_id" if _is_postgres(connection) else "rowid"
+    connection.execute(
+        text(f"DELETE FROM {SEARCH_TABLE} WHERE {key} = :listing_id"), {"listing_id": listing_id}
+    )
+
+
+def search_listings(
+    session: Session, q: str, columns: Sequence[Any], limit: int, offset: int
+) -> list[Any]:
+    """Return active listings matching every term in ``q`` (prefix match), best match first."""
+    terms = re.findall(r"\w+", q.lower())
+    if not terms:
+        return []
+
+    if _is_postgres(session.connection()):
+        query_string = " & ".join(f"{term}:*" for term in terms)
+        tsquery = "to_tsquery('english', :query)"
+        onclause = text(f"{SEARCH_TABLE}.listing_id = servicelisting.id")
+        match = text(f"{SEARCH_TABLE}.document @@ {tsquery}")
+        rank = text(f"ts_rank({SEARCH_TABLE}.document, {tsquery}) DESC")
+    else:
+        query_string = " ".join(f'"{term}"*' for term in terms)
+        onclause = text(f"{SEARCH_TABLE}.rowid = servicelisting.id")
+        match = text(f"{SEARCH_TABLE} MATCH :query")
+        # bm25() scores are negative; lower is better.
+        rank = text(f"bm25({SEARCH_TABLE}, 10.0, 5.0, 1.0)")
+
+    query = (
+        select(*columns)
+        .join(table(SEARCH_TABLE), onclause)
+        .where(match)
+        .where(ServiceListing.is_active == True)  # noqa: E712
+        .order_by(rank, ServiceListing.id)
+        .limit(limit)
+        .offset(offset)
+    )
+    return session.exec(query, params={"query": query_string}).all()
+
+
+@event.listens_for(ServiceListing.__table__, "after_create")
+def _create_search_index_after_listings(target, connection: Connection, **kw) -> None:
+    create_search_index(connection)
+
+
+@event.listens_for(ServiceListing.__table__, "before_drop")
+def _drop_search_index_before_listings(target, connection: Connection, **kw) -> None:
+    drop_search_index(connection)
+
+
+@event.listens_for(ServiceListing, "after_insert")
+@event.listens_for(ServiceListing, "after_update")
+def _index_listing_on_write(mapper, connection: Connection, target: ServiceListing) -> None:
+    index_listing(connection, target)
+
+
+@event.listens_for(ServiceListing, "after_delete")
+def _remove_listing_on_delete(mapper, connection: Connection, target: ServiceListing) -> None:
+    remove_listing(connection, target.id)
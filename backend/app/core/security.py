@@ -1,14 +1,30 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Any
+from functools import lru_cache, partial
+from typing import TYPE_CHECKING, Any
 
 import jwt
 from fastapi import HTTPException, status
-from passlib.context import CryptContext
 
 from .config import get_settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-settings = get_settings()
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+
+_hash_executor: Executor | None = None
+_hash_lock = threading.Lock()
+_hash_stats: dict[str, float] = {
+    "in_flight": 0,
+    "completed": 0,
+    "errors": 0,
+    "cancelled": 0,
+    "rejected": 0,
+    "latency_seconds_total": 0.0,
+    "latency_seconds_max": 0.0,
+}
 
 
 def create_token(subject: str, expires_delta: timedelta, token_type: str) -> str:
@@ -18,18 +34,112 @@ def create_token(subject: str, expires_delta: timedelta, token_type: str) -> str
         "exp": datetime.now(timezone.utc) + expires_delta,
         "iat": datetime.now(timezone.utc),
     }
+    settings = get_settings()
     return jwt.encode(payload, settings.secret_key, algorithm=settings.algorithm)
 
 
+@lru_cache
+def password_context() -> "CryptContext":
+    """Built on first use (and once per process-pool worker), not when the app is imported."""
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_context().verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return password_context().hash(password)
+
+
+def _get_hash_executor() -> Executor:
+    global _hash_executor
+    if _hash_executor is None:
+        with _hash_lock:
+            if _hash_executor is None:
+                settings = get_settings()
+                pool_cls = (
+                    ProcessPoolExecutor
+                    if settings.password_hash_executor == "process"
+                    else ThreadPoolExecutor
+                )
+                kwargs: dict[str, Any] = {"max_workers": settings.password_hash_workers}
+                if pool_cls is ThreadPoolExecutor:
+                    kwargs["thread_name_prefix"] = "password-hash"
+                _hash_executor = pool_cls(**kwargs)
+    return _hash_executor
+
+
+def _release_hash_slot(started: float, future: Future) -> None:
+    """Runs when the job itself is done, not when its caller stops waiting for it."""
+    elapsed = time.perf_counter() - started
+    with _hash_lock:
+        _hash_stats["in_flight"] -= 1
+        if future.cancelled():
+            _hash_stats["cancelled"] += 1
+        elif future.exception() is not None:
+            _hash_stats["errors"] += 1
+        else:
+            _hash_stats["completed"] += 1
+            _hash_stats["latency_seconds_total"] += elapsed
+            _hash_stats["latency_seconds_max"] = max(_hash_stats["latency_seconds_max"], elapsed)
+
+
+async def _run_hash_job(func, *args: str):
+    settings = get_settings()
+    capacity = settings.password_hash_workers + settings.password_hash_max_queue
+    with _hash_lock:
+        if _hash_stats["in_flight"] >= capacity:
+            _hash_stats["rejected"] += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Authentication is busy, please retry shortly",
+                headers={"Retry-After": "1"},
+            )
+        _hash_stats["in_flight"] += 1
+
+    try:
+        future = _get_hash_executor().submit(func, *args)
+    except BaseException:
+        with _hash_lock:
+            _hash_stats["in_flight"] -= 1
+        raise
+    # A disconnected client cancels only the await below; a job already running in the
+    # executor keeps its slot until it finishes, so the queue bound holds.
+    future.add_done_callback(partial(_release_hash_slot, time.perf_counter()))
+    return await asyncio.wrap_future(future)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_hash_job(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await _run_hash_job(get_password_hash, password)
+
+
+def password_hash_metrics() -> dict[str, float]:
+    with _hash_lock:
+        stats = dict(_hash_stats)
+    stats["queue_depth"] = max(0, stats["in_flight"] - get_settings().password_hash_workers)
+    stats["latency_seconds_avg"] = (
+        stats["latency_seconds_total"] / stats["completed"] if stats["completed"] else 0.0
+    )
+    return stats
+
+
+def shutdown_password_hasher() -> None:
+    global _hash_executor
+    with _hash_lock:
+        executor, _hash_executor = _hash_executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
 
 
 def decode_token(token: str, expected_type: str) -> dict[str, Any]:
+    settings = get_settings()
     try:
         payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
         if payload.get("type") != expected_type:
@@ -43,4 +153,3 @@ def decode_token(token: str, expected_type: str) -> dict[str, Any]:
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
         ) from exc
-
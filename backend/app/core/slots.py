@@ -0,0 +1,217 @@
+import threading
+from collections import defaultdict
+from collections.abc import Iterable
+from datetime import date, datetime, time, timedelta
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session as OrmSession
+from sqlalchemy.orm import object_session
+from sqlmodel import Session, select
+
+from ..models.availability import Availability, DayOfWeek, FreeSlot
+from ..models.booking import BLOCKING_STATUSES, MAX_BOOKING_HOURS, BookingRequest
+from .cache import TTLCache, publish_invalidation, register_invalidation
+from .config import get_settings
+
+Interval = tuple[datetime, datetime]
+
+slot_cache = TTLCache(
+    max_entries=lambda: get_settings().slot_cache_max_entries,
+    ttl_seconds=lambda: get_settings().slot_cache_ttl_seconds,
+)
+# Bumping a provider's version orphans every cached range for them at once; the entries then
+# age out of the LRU. A rebuild that raced with a bump stores under the old version, unread.
+_versions: dict[int, int] = defaultdict(int)
+_versions_lock = threading.Lock()
+
+_WEEKDAYS = list(DayOfWeek)
+
+
+def _merge(intervals: Iterable[Interval]) -> list[Interval]:
+    """Coalesce sorted intervals that overlap or touch."""
+    merged: list[Interval] = []
+    for start, end in intervals:
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _weekly_intervals(
+    windows: Iterable[Availability], start: date, end: date, available: bool
+) -> list[Interval]:
+    """Lay the weekly windows with ``is_available == available`` over ``[start, end)``."""
+    by_weekday: dict[int, list[tuple[time, time]]] = defaultdict(list)
+    for window in windows:
+        if window.is_available == available and window.start_time < window.end_time:
+            by_weekday[_WEEKDAYS.index(window.day_of_week)].append(
+                (window.start_time, window.end_time)
+            )
+    for times in by_weekday.values():
+        times.sort()
+
+    intervals: list[Interval] = []
+    day = start
+    while day < end:
+        for opens, closes in by_weekday.get(day.weekday(), ()):
+            intervals.append((datetime.combine(day, opens), datetime.combine(day, closes)))
+        day += timedelta(days=1)
+    return _merge(intervals)
+
+
+def _subtract(intervals: list[Interval], busy: list[Interval]) -> list[Interval]:
+    """``intervals`` minus ``busy``; both sorted and merged, swept once in linear time."""
+    free: list[Interval] = []
+    index = 0
+    for window_start, window_end in intervals:
+        cursor = window_start
+        while index < len(busy) and busy[index][1] <= cursor:
+            index += 1
+        scan = index
+        while scan < len(busy) and busy[scan][0] < window_end:
+            busy_start, busy_end = busy[scan]
+            if busy_start > cursor:
+                free.append((cursor, busy_start))
+            cursor = max(cursor, busy_end)
+            scan += 1
+        if cursor < window_end:
+            free.append((cursor, window_end))
+    return free
+
+
+def available_intervals(windows: Iterable[Availability], start: date, end: date) -> list[Interval]:
+    """The provider's working time in ``[start, end)``: open windows minus closed ones.
+
+    Touching open windows (Mon 09-12 and 12-17) form one interval. A provider who never set
+    any availability works at any time. This is the single definition of availability, shared
+    by the slot engine and booking validation.
+    """
+    windows = list(windows)
+    if not windows:
+        return [(datetime.combine(start, time.min), datetime.combine(end, time.min))]
+    return _subtract(
+        _weekly_intervals(windows, start, end, available=True),
+        _weekly_intervals(windows, start, end, available=False),
+    )
+
+
+def fits_availability(windows: Iterable[Availability], start: datetime, end: datetime) -> bool:
+    """Whether ``[start, end)`` lies entirely inside one available interval."""
+    return any(
+        opens <= start and end <= closes
+        for opens, closes in available_intervals(
+            windows, start.date(), end.date() + timedelta(days=1)
+        )
+    )
+
+
+def compute_free_slots(
+    windows: Iterable[Availability],
+    bookings: Iterable[Interval],
+    start: date,
+    end: date,
+    min_duration: timedelta = timedelta(0),
+) -> list[Interval]:
+    """Free intervals in ``[start, end)``: available time minus bookings.
+
+    ``bookings`` must be sorted by start, which the ``(provider_id, scheduled_at)`` index gives
+    for free. A single sweep over both sorted sequences keeps this linear in their size.
+    """
+    free = _subtract(available_intervals(windows, start, end), _merge(bookings))
+    return [slot for slot in free if slot[1] - slot[0] >= min_duration]
+
+
+def _from(now: datetime, slots: Iterable[Interval], min_duration: timedelta) -> list[FreeSlot]:
+    """Drop the past: slots are clipped to start no earlier than ``now``."""
+    return [
+        FreeSlot(start=max(slot_start, now), end=slot_end)
+        for slot_start, slot_end in slots
+        if slot_end - max(slot_start, now) >= min_duration
+    ]
+
+
+def _bookings_query(provider_id: int, start: date, end: date):
+    range_start = datetime.combine(start, time.min)
+    return (
+        select(BookingRequest.scheduled_at, BookingRequest.duration_hours)
+        .where(BookingRequest.provider_id == provider_id)
+        .where(BookingRequest.scheduled_at < datetime.combine(end, time.min))
+        .where(BookingRequest.scheduled_at > range_start - timedelta(hours=MAX_BOOKING_HOURS))
+        .where(BookingRequest.status.in_(BLOCKING_STATUSES))
+        .order_by(BookingRequest.scheduled_at)
+    )
+
+
+def provider_free_slots(
+    session: Session, provider_id: int, start: date, end: date, min_minutes: int = 0
+) -> list[FreeSlot]:
+    min_duration = timedelta(minutes=min_minutes)
+    key = (provider_id, _versions[provider_id], start, end, min_minutes)
+    slots = slot_cache.get(key)
+    if slots is None:
+        windows = session.exec(
+            select(Availability).where(Availability.user_id == provider_id)
+        ).all()
+        bookings = (
+            (scheduled_at, scheduled_at + timedelta(hours=hours))
+            for scheduled_at, hours in session.exec(_bookings_query(provider_id, start, end))
+        )
+        slots = compute_free_slots(windows, bookings, start, end, min_duration)
+        slot_cache.set(key, slots)
+    # Clipped on every read, not when cached, so a cached range never offers time gone by.
+    return _from(datetime.utcnow(), slots, min_duration)
+
+
+def _bump_version(provider_id: int) -> None:
+    with _versions_lock:
+        _versions[provider_id] += 1
+
+
+def invalidate_slots(provider_id: int) -> None:
+    publish_invalidation("slots", str(provider_id))
+
+
+register_invalidation("slots", lambda key: _bump_version(int(key)))
+
+
+def _track_provider(target, provider_id: int | None) -> None:
+    session = object_session(target)
+    if session is not None and provider_id is not None:
+        session.info.setdefault("slot_providers", set()).add(provider_id)
+
+
+def track_slot_providers(session: OrmSession, provider_ids: Iterable[int]) -> None:
+    """Invalidate these providers' slots when ``session`` commits.
+
+    For bulk INSERT/UPDATE statements, which skip the per-object mapper events below.
+    """
+    session.info.setdefault("slot_providers", set()).update(provider_ids)
+
+
+@event.listens_for(Availability, "after_insert")
+@event.listens_for(Availability, "after_update")
+@event.listens_for(Availability, "after_delete")
+def _availability_changed(mapper, connection, target: Availability) -> None:
+    _track_provider(target, target.user_id)
+
+
+@event.listens_for(BookingRequest, "after_insert")
+@event.listens_for(BookingRequest, "after_update")
+@event.listens_for(BookingRequest, "after_delete")
+def _booking_changed(mapper, connection, target: BookingRequest) -> None:
+    _track_provider(target, target.provider_id)
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _invalidate_committed_providers(session: OrmSession) -> None:
+    # After commit, so a concurrent rebuild can't cache the pre-commit state under the new
+    # version.
+    for provider_id in session.info.pop("slot_providers", ()):
+        invalidate_slots(provider_id)
+
+
+@event.listens_for(OrmSession, "after_rollback")
+def _forget_rolled_back_providers(session: OrmSession) -> None:
+    session.info.pop("slot_providers", None)
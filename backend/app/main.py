@@ -1,32 +1,95 @@
-from fastapi import FastAPI
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from fastapi import APIRouter, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from .api.routes import auth, bookings, messages, services, users
+from .api.routes import auth, bookings, messages, reviews, services, users
+from .core.cache import start_invalidation_listener, stop_invalidation_listener
 from .core.config import get_settings
-from .core.database import init_db
+from .core.database import dispose_async_engine, dispose_engines, pool_metrics
+from .core.metrics import PrometheusMiddleware, mark_worker_dead
+from .core.metrics import router as metrics_router
+from .core.profiling import QueryProfilingMiddleware
+from .core.realtime import message_hub
+from .core.responses import ORJSONResponse
+from .core.security import password_hash_metrics, shutdown_password_hasher
 
-settings = get_settings()
+health = APIRouter()
 
-init_db()
 
-app = FastAPI(title=settings.app_name)
+@health.get("/healthz")
+def healthcheck() -> dict[str, str]:
+    return {"status": "ok"}
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
 
-app.include_router(auth.router, prefix=settings.api_v1_prefix)
-app.include_router(users.router, prefix=settings.api_v1_prefix)
-app.include_router(services.router, prefix=settings.api_v1_prefix)
-app.include_router(bookings.router, prefix=settings.api_v1_prefix)
-app.include_router(messages.router, prefix=settings.api_v1_prefix)
+@health.get("/healthz/password-hashing")
+def password_hashing_health() -> dict[str, float]:
+    return password_hash_metrics()
 
 
-@app.get("/healthz")
-def healthcheck() -> dict[str, str]:
-    return {"status": "ok"}
+@health.get("/healthz/db-pool")
+def db_pool_health() -> dict[str, dict[str, float]]:
+    return pool_metrics()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # Nothing here connects to the database: engines open on the first request that needs
+    # one, and the schema is created and migrated by Alembic, not at startup.
+    start_invalidation_listener()
+    await message_hub.start()
+    try:
+        yield
+    finally:
+        await message_hub.stop()
+        stop_invalidation_listener()
+        shutdown_password_hasher()
+        await dispose_async_engine()
+        dispose_engines()
+        mark_worker_dead()
+
+
+def create_app() -> FastAPI:
+    """Build the ASGI app. ``uvicorn --factory app.main:create_app`` calls this directly.
+
+    Configuration comes from ``get_settings()``, which the routers and core modules also read
+    at import, so there is no per-app settings argument that could only half apply.
+    """
+    settings = get_settings()
+    app = FastAPI(
+        title=settings.app_name, lifespan=lifespan, default_response_class=ORJSONResponse
+    )
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    # Always installed, a no-op unless query_profiling is on, so tests can switch it on.
+    app.add_middleware(QueryProfilingMiddleware)
+    if settings.metrics_enabled:
+        # Added last so it is outermost and times everything, CORS included.
+        app.add_middleware(PrometheusMiddleware)
+
+    if settings.async_database:
+        # Registered first so they take precedence over the sync handlers for the same paths.
+        app.include_router(services.async_router, prefix=settings.api_v1_prefix)
+        app.include_router(bookings.async_router, prefix=settings.api_v1_prefix)
+        app.include_router(messages.async_router, prefix=settings.api_v1_prefix)
+
+    app.include_router(auth.router, prefix=settings.api_v1_prefix)
+    app.include_router(users.router, prefix=settings.api_v1_prefix)
+    app.include_router(services.router, prefix=settings.api_v1_prefix)
+    app.include_router(bookings.router, prefix=settings.api_v1_prefix)
+    app.include_router(messages.router, prefix=settings.api_v1_prefix)
+    app.include_router(reviews.router, prefix=settings.api_v1_prefix)
+    app.include_router(health)
+    if settings.metrics_enabled:
+        app.include_router(metrics_router)
+    return app
+
 
+app = create_app()
@@ -1,7 +1,14 @@
 from .address import Address, AddressCreate, AddressRead
-from .availability import Availability, AvailabilityCreate, AvailabilityRead, DayOfWeek
+from .availability import (
+    Availability,
+    AvailabilityCreate,
+    AvailabilityRead,
+    DayOfWeek,
+    FreeSlot,
+)
 from .booking import BookingRequest, BookingStatus
 from .message import Message, MessageThread
+from .review import Review
 from .service import ServiceCategory, ServiceListing, ServiceMedia
 from .user import User, UserRole, UserSkill
 
@@ -16,6 +23,7 @@ __all__ = [
     "AvailabilityCreate",
     "AvailabilityRead",
     "DayOfWeek",
+    "FreeSlot",
     "ServiceCategory",
     "ServiceListing",
     "ServiceMedia",
@@ -23,5 +31,6 @@ __all__ = [
     "BookingStatus",
     "MessageThread",
     "Message",
+    "Review",
 ]
 
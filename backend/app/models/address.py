@@ -1,6 +1,7 @@
 from datetime import datetime
 from typing import Optional
 
+from sqlalchemy import Index, text
 from sqlmodel import Field, Relationship, SQLModel
 
 
@@ -10,11 +11,18 @@ class AddressBase(SQLModel):
     state: str
     postal_code: Optional[str] = None
     notes: Optional[str] = None
+    latitude: Optional[float] = Field(default=None, ge=-90, le=90)
+    longitude: Optional[float] = Field(default=None, ge=-180, le=180)
 
 
 class Address(AddressBase, table=True):
+    # Case-insensitive city filter in provider search.
+    __table_args__ = (Index("ix_address_city_lower_user", text("lower(city)"), "user_id"),)
+
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="user.id", unique=True, index=True)
+    # Set from latitude/longitude by app.core.geo; proximity search range-scans its prefixes.
+    geohash: Optional[str] = Field(default=None, max_length=12, index=True)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
@@ -35,9 +35,17 @@ class AvailabilityCreate(AvailabilityBase):
     pass
 
 
+class AvailabilityImportRow(AvailabilityCreate):
+    user_id: int
+
+
 class AvailabilityRead(AvailabilityBase):
     id: int
     user_id: int
     created_at: datetime
     updated_at: datetime
 
+
+class FreeSlot(SQLModel):
+    start: datetime
+    end: datetime
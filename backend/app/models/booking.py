@@ -2,6 +2,7 @@ from datetime import datetime
 from enum import Enum
 from typing import Optional
 
+from sqlalchemy import DDL, Index, event
 from sqlmodel import Field, Relationship, SQLModel
 
 
@@ -13,6 +14,11 @@ class BookingStatus(str, Enum):
     CANCELLED = "CANCELLED"
 
 
+# Bookings in these states hold the provider's time; cancelled/completed ones free it.
+BLOCKING_STATUSES = (BookingStatus.REQUESTED, BookingStatus.ACCEPTED, BookingStatus.IN_PROGRESS)
+MAX_BOOKING_HOURS = 24
+
+
 class BookingRequestBase(SQLModel):
     scheduled_at: datetime
     duration_hours: float
@@ -21,6 +27,13 @@ class BookingRequestBase(SQLModel):
 
 
 class BookingRequest(BookingRequestBase, table=True):
+    # Overlap checks scan a provider's bookings by start time, bounded by MAX_BOOKING_HOURS.
+    __table_args__ = (
+        Index("ix_bookingrequest_provider_scheduled", "provider_id", "scheduled_at"),
+        # Admin exports range-scan and order by creation time.
+        Index("ix_bookingrequest_created_id", "created_at", "id"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     listing_id: int = Field(foreign_key="servicelisting.id")
     requester_id: int = Field(foreign_key="user.id")
@@ -32,6 +45,28 @@ class BookingRequest(BookingRequestBase, table=True):
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
 
+# On PostgreSQL the database itself rejects overlapping blocking bookings for a provider.
+BOOKING_OVERLAP_CONSTRAINT = "ex_bookingrequest_provider_overlap"
+BOOKING_OVERLAP_DDL = f"""
+ALTER TABLE bookingrequest ADD CONSTRAINT {BOOKING_OVERLAP_CONSTRAINT}
+EXCLUDE USING gist (
+    provider_id WITH =,
+    tsrange(scheduled_at, scheduled_at + duration_hours * interval '1 hour') WITH &&
+) WHERE (status IN ('REQUESTED', 'ACCEPTED', 'IN_PROGRESS'))
+"""
+
+event.listen(
+    BookingRequest.__table__,
+    "after_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS btree_gist").execute_if(dialect="postgresql"),
+)
+event.listen(
+    BookingRequest.__table__,
+    "after_create",
+    DDL(BOOKING_OVERLAP_DDL).execute_if(dialect="postgresql"),
+)
+
+
 class BookingRequestCreate(BookingRequestBase):
     listing_id: int
     provider_id: int
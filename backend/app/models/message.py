@@ -1,15 +1,31 @@
 from datetime import datetime
 from typing import Optional
 
+from sqlalchemy import Index
 from sqlmodel import Field, Relationship, SQLModel
 
 
+PREVIEW_LENGTH = 140
+
+
 class MessageThread(SQLModel, table=True):
+    # Each participant's inbox walks one of these newest-first.
+    __table_args__ = (
+        Index("ix_messagethread_initiator_last", "initiator_id", "last_message_at"),
+        Index("ix_messagethread_receiver_last", "receiver_id", "last_message_at"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     initiator_id: int = Field(foreign_key="user.id")
     receiver_id: int = Field(foreign_key="user.id")
     booking_id: Optional[int] = Field(default=None, foreign_key="bookingrequest.id")
     last_message_at: datetime = Field(default_factory=datetime.utcnow)
+    # Denormalized so the inbox is a single query; kept current by post_message and read receipts.
+    last_message_id: Optional[int] = None
+    last_message_sender_id: Optional[int] = None
+    last_message_preview: Optional[str] = Field(default=None, max_length=PREVIEW_LENGTH)
+    initiator_unread_count: int = Field(default=0, ge=0)
+    receiver_unread_count: int = Field(default=0, ge=0)
 
     messages: list["Message"] = Relationship(back_populates="thread")
 
@@ -19,7 +35,21 @@ class MessageThreadCreate(SQLModel):
     booking_id: Optional[int] = None
 
 
+class InboxThread(SQLModel):
+    id: int
+    booking_id: Optional[int] = None
+    counterpart_id: int
+    last_message_at: datetime
+    last_message_id: Optional[int] = None
+    last_message_sender_id: Optional[int] = None
+    last_message_preview: Optional[str] = None
+    unread_count: int = 0
+
+
 class Message(SQLModel, table=True):
+    # Serves cursor-paginated history: thread_id equality, then (sent_at, id) order.
+    __table_args__ = (Index("ix_message_thread_sent_id", "thread_id", "sent_at", "id"),)
+
     id: Optional[int] = Field(default=None, primary_key=True)
     thread_id: int = Field(foreign_key="messagethread.id")
     sender_id: int = Field(foreign_key="user.id")
@@ -34,3 +64,14 @@ class Message(SQLModel, table=True):
 class MessageCreate(SQLModel):
     content: str
 
+
+class ReadReceiptCreate(SQLModel):
+    up_to_message_id: int
+
+
+class ReadReceiptResult(SQLModel):
+    thread_id: int
+    up_to_message_id: int
+    marked_read: int
+    unread_count: int
+
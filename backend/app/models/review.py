@@ -0,0 +1,37 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Index, UniqueConstraint
+from sqlmodel import Field, SQLModel
+
+
+class ReviewBase(SQLModel):
+    rating: int = Field(ge=1, le=5)
+    comment: Optional[str] = Field(default=None, max_length=2000)
+
+
+class Review(ReviewBase, table=True):
+    __table_args__ = (
+        # Each party reviews a booking at most once; the database enforces it.
+        UniqueConstraint("booking_id", "reviewer_id", name="uq_review_booking_reviewer"),
+        # A user's reviews, newest first.
+        Index("ix_review_reviewee_id", "reviewee_id", "id"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    booking_id: int = Field(foreign_key="bookingrequest.id")
+    reviewer_id: int = Field(foreign_key="user.id")
+    reviewee_id: int = Field(foreign_key="user.id")
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class ReviewCreate(ReviewBase):
+    booking_id: int
+
+
+class ReviewRead(ReviewBase):
+    id: int
+    booking_id: int
+    reviewer_id: int
+    reviewee_id: int
+    created_at: datetime
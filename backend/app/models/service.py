@@ -1,6 +1,7 @@
 from datetime import datetime
 from typing import Optional
 
+from sqlalchemy import Index
 from sqlmodel import Field, Relationship, SQLModel
 
 from .user import User
@@ -21,10 +22,20 @@ class ServiceListingBase(SQLModel):
     base_price: float = Field(gt=0)
     pricing_unit: str = Field(default="hour")
     coverage_area: Optional[str] = None
+    # How far from their address the provider travels; unset means no limit.
+    service_radius_km: Optional[float] = Field(default=None, gt=0)
     is_active: bool = Field(default=True)
 
 
 class ServiceListing(ServiceListingBase, table=True):
+    __table_args__ = (
+        Index("ix_servicelisting_active_id", "is_active", "id"),
+        Index("ix_servicelisting_active_category_id", "is_active", "category_id", "id"),
+        Index("ix_servicelisting_category_provider", "category_id", "is_active", "provider_id"),
+        Index("ix_servicelisting_provider_active", "provider_id", "is_active", "id"),
+        Index("ix_servicelisting_created_id", "created_at", "id"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     provider_id: int = Field(foreign_key="user.id")
     category_id: int = Field(foreign_key="servicecategory.id")
@@ -48,6 +59,23 @@ class ServiceListingRead(ServiceListingBase):
     cover_image_url: Optional[str]
 
 
+class ListingImportRow(ServiceListingCreate):
+    provider_id: int
+
+
+class BatchImportError(SQLModel):
+    line: int
+    detail: str
+
+
+class BatchImportResult(SQLModel):
+    listings_created: int = 0
+    availability_created: int = 0
+    failed: int = 0
+    # The first errors only; ``failed`` counts them all.
+    errors: list[BatchImportError] = []
+
+
 class ServiceMedia(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     listing_id: int = Field(foreign_key="servicelisting.id")
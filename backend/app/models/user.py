@@ -2,11 +2,15 @@ from datetime import datetime
 from enum import Enum
 from typing import TYPE_CHECKING, Optional
 
+from sqlalchemy import Index
 from sqlmodel import Field, Relationship, SQLModel
 
+from .address import AddressCreate
+from .availability import AvailabilityCreate
+
 if TYPE_CHECKING:
-    from .address import Address, AddressCreate
-    from .availability import Availability, AvailabilityCreate
+    from .address import Address
+    from .availability import Availability
 
 
 class UserRole(str, Enum):
@@ -19,16 +23,22 @@ class UserBase(SQLModel):
     phone: str = Field(index=True, unique=True, max_length=11)
     first_name: str
     last_name: str
-    email: Optional[str] = Field(default=None, index=True)
+    email: Optional[str] = Field(default=None, index=True, unique=True)
     avatar_url: Optional[str] = None
     bio: Optional[str] = None
     role: UserRole = Field(default=UserRole.SERVICE_SEEKER)
 
 
 class User(UserBase, table=True):
+    # Provider discovery walks this newest-best-first: role/is_active equality, rating order.
+    __table_args__ = (Index("ix_user_role_active_rating", "role", "is_active", "rating_avg", "id"),)
+
     id: Optional[int] = Field(default=None, primary_key=True)
     password_hash: str
     rating_avg: float = Field(default=0, ge=0, le=5)
+    # Running totals behind rating_avg, bumped with every review; see core.ratings.
+    rating_count: int = Field(default=0, ge=0)
+    rating_sum: int = Field(default=0, ge=0)
     is_active: bool = Field(default=True)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
@@ -41,6 +51,7 @@ class User(UserBase, table=True):
 class UserPublic(UserBase):
     id: int
     rating_avg: float
+    rating_count: int = 0
 
 
 class UserCreate(UserBase):
@@ -55,6 +66,8 @@ class UserRead(UserPublic):
 
 
 class UserSkill(SQLModel, table=True):
+    __table_args__ = (Index("ix_userskill_tag_user", "skill_tag", "user_id"),)
+
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="user.id")
     skill_tag: str = Field(index=True)
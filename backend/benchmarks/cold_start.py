@@ -0,0 +1,81 @@
+"""Measure how long a fresh interpreter takes to import the app and serve its first request.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.cold_start --runs 10
+
+Each run is a new process, as for a worker boot or a serverless cold start. ``-X importtime``
+attributes the import of ``app.main`` to its heaviest modules.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+FIRST_REQUEST = """
+import time
+started = time.perf_counter()
+from fastapi.testclient import TestClient
+from app.main import app
+imported = time.perf_counter()
+with TestClient(app) as client:
+    assert client.get("/healthz").status_code == 200
+print(imported - started, time.perf_counter() - imported)
+"""
+
+
+def run(args: list[str], env: dict[str, str]) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args], env=env, capture_output=True, text=True, check=True
+    )
+
+
+def import_profile(env: dict[str, str], top: int) -> None:
+    stderr = run(["-X", "importtime", "-c", "import app.main"], env).stderr
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line or "self" in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[12:].split("|"))
+        modules.append((int(cumulative_us), int(self_us), name))
+    total = next(cumulative for cumulative, _, name in modules if name == "app.main")
+    print(f"import app.main: {total / 1000:.1f} ms cumulative; heaviest app modules:")
+    app_modules = sorted((m for m in modules if m[2].startswith("app.")), reverse=True)
+    for cumulative, _, name in app_modules[:top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--top", type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ,
+            "SECRET_KEY": os.environ.get("SECRET_KEY", "benchmark"),
+            "DATABASE_URL": f"sqlite:///{tmp}/cold.db",
+        }
+        import_profile(env, args.top)
+        print(f"database opened by the import: {os.path.exists(f'{tmp}/cold.db')}")
+
+        imports, first_requests, totals = [], [], []
+        for _ in range(args.runs):
+            started = time.perf_counter()
+            imported, served = map(float, run(["-c", FIRST_REQUEST], env).stdout.split())
+            totals.append(time.perf_counter() - started)
+            imports.append(imported)
+            first_requests.append(served)
+        print(f"over {args.runs} fresh processes (median):")
+        print(f"  import app       {statistics.median(imports) * 1000:8.1f} ms")
+        print(f"  first request    {statistics.median(first_requests) * 1000:8.1f} ms")
+        print(f"  process total    {statistics.median(totals) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
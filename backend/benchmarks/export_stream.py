@@ -0,0 +1,138 @@
+"""Compare peak memory of streaming booking exports with building the full list.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.export_stream --bookings 50000 200000
+
+"list" is what scraping ``GET /bookings/`` costs: every row loaded and validated into a
+``BookingRequestRead`` before anything is written. "stream" is the admin export generator.
+Its peak should stay flat as the table grows.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from sqlalchemy import insert  # noqa: E402
+from sqlmodel import Session, SQLModel, create_engine, select  # noqa: E402
+
+from app.core.export import ExportFormat, export_rows  # noqa: E402
+from app.models import BookingRequest, ServiceCategory, ServiceListing, User  # noqa: E402
+from app.models.booking import BookingRequestRead  # noqa: E402
+
+
+def seed(engine, bookings: int) -> None:
+    now = datetime(2030, 1, 1)
+    with engine.begin() as connection:
+        connection.execute(insert(ServiceCategory), [{"name": "Cleaning"}])
+        connection.execute(
+            insert(User),
+            [
+                {
+                    "phone": f"{n:011d}",
+                    "first_name": "Bench",
+                    "last_name": "Mark",
+                    "role": "SERVICE_PROVIDER",
+                    "password_hash": "x",
+                    "rating_avg": 0,
+                    "rating_count": 0,
+                    "rating_sum": 0,
+                    "is_active": True,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for n in (1, 2)
+            ],
+        )
+        connection.execute(
+            insert(ServiceListing),
+            [
+                {
+                    "provider_id": 1,
+                    "category_id": 1,
+                    "title": "Clean",
+                    "description": "Flat",
+                    "base_price": 10,
+                    "pricing_unit": "hour",
+                    "is_active": True,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+            ],
+        )
+        for first in range(0, bookings, 50_000):
+            connection.execute(
+                insert(BookingRequest),
+                [
+                    {
+                        "listing_id": 1,
+                        "requester_id": 2,
+                        "provider_id": 1,
+                        "scheduled_at": now + timedelta(hours=n),
+                        "duration_hours": 1,
+                        "location": "12 High Street",
+                        "notes": "Bring a ladder",
+                        "status": "COMPLETED",
+                        "total_price": 10,
+                        "payment_status": "PAID",
+                        "created_at": now + timedelta(minutes=n),
+                        "updated_at": now,
+                    }
+                    for n in range(first, min(first + 50_000, bookings))
+                ],
+            )
+
+
+def as_list(engine) -> int:
+    with Session(engine) as session:
+        rows = [
+            BookingRequestRead.model_validate(booking)
+            for booking in session.exec(select(BookingRequest)).all()
+        ]
+        return sum(len(row.model_dump_json()) + 1 for row in rows)
+
+
+def streamed(engine, export_format: ExportFormat) -> int:
+    query = select(*BookingRequest.__table__.columns).order_by(
+        BookingRequest.created_at, BookingRequest.id
+    )
+    return sum(len(chunk) for chunk in export_rows(Session(engine), query, export_format))
+
+
+def measure(name: str, func) -> None:
+    tracemalloc.start()
+    started = time.perf_counter()
+    size = func()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"  {name:>13}: {elapsed:6.2f}s, peak {peak / 2**20:8.1f} MiB, "
+        f"{size / 2**20:.0f} MiB written"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bookings", type=int, nargs="+", default=[50_000, 200_000])
+    args = parser.parse_args()
+
+    for size in args.bookings:
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = create_engine(f"sqlite:///{tmp}/bench.db")
+            SQLModel.metadata.create_all(engine)
+            seed(engine, size)
+            print(f"{size} bookings:")
+            measure("list", lambda engine=engine: as_list(engine))
+            measure("stream ndjson", lambda engine=engine: streamed(engine, ExportFormat.NDJSON))
+            measure("stream csv", lambda engine=engine: streamed(engine, ExportFormat.CSV))
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Compare geohash-prefiltered proximity search with a full haversine scan.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.geo_search --addresses 1000000
+
+Addresses are scattered over Nigeria, denser around a handful of cities, and each query asks
+for the addresses within a radius of a random city centre.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime
+
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from sqlalchemy import insert  # noqa: E402
+from sqlmodel import Session, SQLModel, create_engine, select  # noqa: E402
+
+from app.core.geo import NearFilter, encode_geohash, haversine_km, near_condition  # noqa: E402
+from app.models import Address, User  # noqa: E402
+
+CITIES = [(6.5244, 3.3792), (9.0765, 7.3986), (7.3775, 3.9470), (12.0022, 8.5920), (4.8156, 7.0498)]
+
+
+def seed(engine, addresses: int) -> None:
+    rng = random.Random(3)
+    now = datetime.utcnow()
+    chunk = 20_000
+    with engine.begin() as connection:
+        for first in range(1, addresses + 1, chunk):
+            users, rows = [], []
+            for user_id in range(first, min(first + chunk, addresses + 1)):
+                if rng.random() < 0.5:
+                    lat, lon = rng.choice(CITIES)
+                    lat, lon = lat + rng.gauss(0, 0.2), lon + rng.gauss(0, 0.2)
+                else:
+                    lat, lon = rng.uniform(4.3, 13.8), rng.uniform(2.7, 14.6)
+                users.append(
+                    {
+                        "id": user_id,
+                        "phone": f"{user_id:011d}",
+                        "first_name": "Bench",
+                        "last_name": "Mark",
+                        "role": "SERVICE_PROVIDER",
+                        "password_hash": "x",
+                        "rating_avg": 0,
+                        "is_active": True,
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                )
+                rows.append(
+                    {
+                        "user_id": user_id,
+                        "street": "1 Main St",
+                        "city": "City",
+                        "state": "NG",
+                        "latitude": lat,
+                        "longitude": lon,
+                        "geohash": encode_geohash(lat, lon),
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                )
+            connection.execute(insert(User), users)
+            connection.execute(insert(Address), rows)
+        connection.exec_driver_sql("ANALYZE")
+
+
+def indexed(session: Session, near: NearFilter) -> int:
+    condition = near_condition(Address.geohash, Address.latitude, Address.longitude, near)
+    return len(session.exec(select(Address.user_id).where(condition)).all())
+
+
+def full_scan(session: Session, near: NearFilter) -> int:
+    distance = haversine_km(Address.latitude, Address.longitude, near.latitude, near.longitude)
+    return len(session.exec(select(Address.user_id).where(distance <= near.radius_km)).all())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--addresses", type=int, default=1_000_000)
+    parser.add_argument("--radius", type=float, nargs="+", default=[1.0, 5.0, 25.0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{tmp}/bench.db")
+        SQLModel.metadata.create_all(engine)
+        started = time.perf_counter()
+        seed(engine, args.addresses)
+        print(f"seeded {args.addresses} addresses in {time.perf_counter() - started:.1f}s")
+
+        rng = random.Random(5)
+        with Session(engine) as session:
+            for radius in args.radius:
+                results = {"full scan": [], "geohash": []}
+                for _ in range(args.repeat):
+                    lat, lon = rng.choice(CITIES)
+                    near = NearFilter(lat + rng.uniform(-0.1, 0.1), lon, radius)
+                    for name, func in (("full scan", full_scan), ("geohash", indexed)):
+                        begun = time.perf_counter()
+                        matches = func(session, near)
+                        results[name].append((time.perf_counter() - begun) * 1000)
+                print(f"radius {radius:g} km (~{matches} matches):")
+                for name, samples in results.items():
+                    print(f"  {name:>10}: median {statistics.median(samples):9.2f} ms")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Time turning booking rows into a JSON response body, through models and straight from rows.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.json_serialization --bookings 10000
+
+"models" is what ``GET /bookings/`` used to do: load entities, validate each into a
+``BookingRequestRead``, then let FastAPI validate the list again against the
+``response_model``, dump it to plain Python and encode it with ``json.dumps``. "models+orjson"
+is the same with the new default response class. "rows" selects the read columns and hands
+them to ``rows_response``. Both bodies are checked to decode to the same data.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_response_field  # noqa: E402
+from sqlmodel import Session, SQLModel, create_engine, select  # noqa: E402
+
+from app.api.routes.bookings import BOOKING_READ_COLUMNS  # noqa: E402
+from app.core.responses import ORJSONResponse, rows_response  # noqa: E402
+from app.models import BookingRequest  # noqa: E402
+from app.models.booking import BookingRequestRead  # noqa: E402
+from benchmarks.export_stream import seed  # noqa: E402
+
+RESPONSE_FIELD = create_response_field(name="Response", type_=list[BookingRequestRead])
+
+
+def through_models(session: Session, response_class) -> bytes:
+    bookings = session.exec(select(BookingRequest)).all()
+    content = [BookingRequestRead.model_validate(booking) for booking in bookings]
+    plain = asyncio.run(
+        serialize_response(field=RESPONSE_FIELD, response_content=content, is_coroutine=False)
+    )
+    return response_class(plain).body
+
+
+def from_rows(session: Session) -> bytes:
+    return rows_response(session.exec(select(*BOOKING_READ_COLUMNS)).all()).body
+
+
+def measure(name: str, engine, func, repeats: int) -> bytes:
+    timings = []
+    for _ in range(repeats):
+        with Session(engine) as session:
+            started = time.perf_counter()
+            body = func(session)
+            timings.append(time.perf_counter() - started)
+    print(f"  {name:>13}: median {statistics.median(timings) * 1000:7.1f} ms")
+    return body
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bookings", type=int, default=10_000)
+    parser.add_argument("--repeats", type=int, default=7)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{tmp}/bench.db")
+        SQLModel.metadata.create_all(engine)
+        seed(engine, args.bookings)
+        print(f"{args.bookings} bookings ({args.repeats} runs, query included):")
+        models = measure(
+            "models",
+            engine,
+            lambda session: through_models(session, JSONResponse),
+            args.repeats,
+        )
+        measure(
+            "models+orjson",
+            engine,
+            lambda session: through_models(session, ORJSONResponse),
+            args.repeats,
+        )
+        rows = measure("rows", engine, from_rows, args.repeats)
+        engine.dispose()
+    assert json.loads(models) == json.loads(rows), "response bodies differ"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""Time bulk listing imports against creating listings one request at a time.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.listing_import --rows 100000
+
+Feeds an NDJSON body (90% listings, 10% availability windows, spread over 1000 providers)
+through the same chunked importer ``POST /services/listings:batch`` uses, then times the
+per-row ORM add-and-commit path of ``create_listing`` on a sample and extrapolates.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import datetime
+
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from sqlalchemy import func, insert  # noqa: E402
+from sqlmodel import Session, SQLModel, select  # noqa: E402
+
+from app.core.bulk_import import BulkImporter, ndjson_lines  # noqa: E402
+from app.core.config import get_settings  # noqa: E402
+from app.core.database import _create_engine  # noqa: E402
+from app.models import ServiceCategory, ServiceListing, User  # noqa: E402
+
+PROVIDERS = 1000
+DAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+
+def seed(engine) -> None:
+    now = datetime.utcnow()
+    with engine.begin() as connection:
+        connection.execute(insert(ServiceCategory), [{"name": f"Category {n}"} for n in range(20)])
+        connection.execute(
+            insert(User),
+            [
+                {
+                    "phone": f"{n:011d}",
+                    "first_name": "Bench",
+                    "last_name": "Mark",
+                    "role": "SERVICE_PROVIDER",
+                    "password_hash": "x",
+                    "rating_avg": 0,
+                    "rating_count": 0,
+                    "rating_sum": 0,
+                    "is_active": True,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for n in range(1, PROVIDERS + 1)
+            ],
+        )
+
+
+def ndjson_body(rows: int, chunk_bytes: int = 64 * 1024) -> list[bytes]:
+    rng = random.Random(11)
+    lines = []
+    for n in range(rows):
+        provider_id = rng.randint(1, PROVIDERS)
+        if n % 10 == 9:
+            row = {
+                "type": "availability",
+                "user_id": provider_id,
+                "day_of_week": rng.choice(DAYS),
+                "start_time": "08:00:00",
+                "end_time": "17:00:00",
+            }
+        else:
+            row = {
+                "type": "listing",
+                "provider_id": provider_id,
+                "category_id": rng.randint(1, 20),
+                "title": f"Service {n}",
+                "description": "Imported by a partner agency",
+                "base_price": rng.randint(5, 200),
+            }
+        lines.append(json.dumps(row))
+    data = ("\n".join(lines) + "\n").encode()
+    return [data[start : start + chunk_bytes] for start in range(0, len(data), chunk_bytes)]
+
+
+async def stream(parts: list[bytes]):
+    for part in parts:
+        yield part
+
+
+async def bulk(session: Session, parts: list[bytes]) -> BulkImporter:
+    # Mirrors import_listings_batch, minus the threadpool hop.
+    importer = BulkImporter(session)
+    chunk = []
+    async for line in ndjson_lines(stream(parts)):
+        chunk.append(line)
+        if len(chunk) >= get_settings().batch_import_chunk_size:
+            importer.import_chunk(chunk)
+            chunk = []
+    if chunk:
+        importer.import_chunk(chunk)
+    return importer
+
+
+def per_row(session: Session, rows: int) -> None:
+    for n in range(rows):
+        listing = ServiceListing(
+            provider_id=n % PROVIDERS + 1,
+            category_id=n % 20 + 1,
+            title=f"Single {n}",
+            description="Created one at a time",
+            base_price=10,
+        )
+        session.add(listing)
+        session.commit()
+        session.refresh(listing)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--sample", type=int, default=2000, help="rows for the per-row path")
+    args = parser.parse_args()
+    parts = ndjson_body(args.rows)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = _create_engine(f"sqlite:///{tmp}/bench.db")
+        SQLModel.metadata.create_all(engine)
+        seed(engine)
+        with Session(engine) as session:
+            started = time.perf_counter()
+            importer = asyncio.run(bulk(session, parts))
+            elapsed = time.perf_counter() - started
+            result = importer.result
+            print(
+                f"batch import: {args.rows} rows in {elapsed:.2f}s "
+                f"({args.rows / elapsed:,.0f} rows/s; {result.listings_created} listings, "
+                f"{result.availability_created} windows, {result.failed} failed)"
+            )
+            indexed = session.exec(select(func.count()).select_from(ServiceListing)).one()
+            print(f"  {indexed} listings stored")
+
+            started = time.perf_counter()
+            per_row(session, args.sample)
+            elapsed = time.perf_counter() - started
+            print(
+                f"per-row:      {args.sample} rows in {elapsed:.2f}s "
+                f"(~{elapsed / args.sample * args.rows:.0f}s for {args.rows})"
+            )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
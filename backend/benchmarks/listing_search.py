@@ -0,0 +1,115 @@
+"""Compare listing search against the scan-everything approach clients use today.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.listing_search --rows 100000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from sqlalchemy import insert  # noqa: E402
+from sqlmodel import Session, SQLModel, create_engine, select  # noqa: E402
+
+from app.api.routes.services import LISTING_READ_COLUMNS  # noqa: E402
+from app.core.search import rebuild_search_index, search_listings  # noqa: E402
+from app.models import ServiceCategory, ServiceListing, User  # noqa: E402
+
+WORDS = (
+    "cleaning plumbing repair painting gardening moving tutoring cooking laundry wiring "
+    "carpentry roofing tiling welding babysitting delivery ironing washing fixing install"
+).split()
+QUERIES = ["clean", "plumb repair", "garden", "paint wall", "deliv", "wiring install"]
+
+
+def seed(engine, rows: int) -> None:
+    rng = random.Random(42)
+    with Session(engine) as session:
+        session.add(
+            User(phone="08000000000", first_name="Bench", last_name="Mark", password_hash="x")
+        )
+        for word in WORDS[:10]:
+            session.add(ServiceCategory(name=word.title()))
+        session.commit()
+
+    batch = []
+    with engine.begin() as connection:
+        for i in range(rows):
+            batch.append(
+                {
+                    "title": " ".join(rng.sample(WORDS, 3)).title(),
+                    "description": " ".join(rng.choices(WORDS, k=25)),
+                    "base_price": rng.randint(10, 500),
+                    "pricing_unit": "hour",
+                    "coverage_area": "Downtown",
+                    "is_active": True,
+                    "provider_id": 1,
+                    "category_id": rng.randint(1, 10),
+                }
+            )
+            if len(batch) == 5000 or i == rows - 1:
+                connection.execute(insert(ServiceListing), batch)
+                batch.clear()
+        rebuild_search_index(connection)
+
+
+def scan(session: Session, q: str) -> list:
+    # What clients do now: download every active listing and filter locally.
+    terms = q.lower().split()
+    listings = session.exec(
+        select(ServiceListing).where(ServiceListing.is_active == True)  # noqa: E712
+    ).all()
+    return [
+        item
+        for item in listings
+        if all(term in f"{item.title} {item.description}".lower() for term in terms)
+    ][:20]
+
+
+def timed(func, session: Session, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        for q in QUERIES:
+            started = time.perf_counter()
+            func(session, q)
+            samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{tmp}/bench.db")
+        SQLModel.metadata.create_all(engine)
+        started = time.perf_counter()
+        seed(engine, args.rows)
+        print(f"seeded {args.rows} listings in {time.perf_counter() - started:.1f}s")
+
+        with Session(engine) as session:
+            results = {
+                "scan": timed(scan, session, args.repeat),
+                "search": timed(
+                    lambda s, q: search_listings(s, q, LISTING_READ_COLUMNS, limit=20, offset=0),
+                    session,
+                    args.repeat,
+                ),
+            }
+        for name, samples in results.items():
+            samples.sort()
+            p95 = samples[int(len(samples) * 0.95) - 1]
+            print(f"{name:>6}: median {statistics.median(samples):8.2f} ms   p95 {p95:8.2f} ms")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
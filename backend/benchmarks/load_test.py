@@ -0,0 +1,79 @@
+"""Drive a running API with many concurrent connections and report throughput and latency.
+
+Compare the sync and async database paths by starting the server twice::
+
+    ASYNC_DATABASE=false uvicorn app.main:app --workers 1 &
+    python -m benchmarks.load_test --path /api/v1/services/listings --concurrency 1000
+
+    ASYNC_DATABASE=true uvicorn app.main:app --workers 1 &
+    python -m benchmarks.load_test --path /api/v1/services/listings --concurrency 1000
+
+Authenticated endpoints (e.g. ``/api/v1/bookings/``) take a bearer token via ``--token``.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+async def worker(
+    client: httpx.AsyncClient, path: str, deadline: float, latencies: list[float], errors: list[int]
+) -> None:
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            response = await client.get(path)
+            if response.status_code >= 400:
+                errors.append(response.status_code)
+        except httpx.HTTPError:
+            errors.append(0)
+            continue
+        latencies.append(time.perf_counter() - started)
+
+
+async def run(args: argparse.Namespace) -> None:
+    headers = {"Authorization": f"Bearer {args.token}"} if args.token else {}
+    limits = httpx.Limits(
+        max_connections=args.concurrency, max_keepalive_connections=args.concurrency
+    )
+    latencies: list[float] = []
+    errors: list[int] = []
+    async with httpx.AsyncClient(
+        base_url=args.url, headers=headers, limits=limits, timeout=args.timeout
+    ) as client:
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(
+            *(
+                worker(client, args.path, deadline, latencies, errors)
+                for _ in range(args.concurrency)
+            )
+        )
+        elapsed = time.perf_counter() - started
+
+    if not latencies:
+        print(f"no successful requests ({len(errors)} errors)")
+        return
+    latencies.sort()
+    p99 = latencies[max(0, int(len(latencies) * 0.99) - 1)]
+    print(f"requests: {len(latencies)}  errors: {len(errors)}  elapsed: {elapsed:.1f}s")
+    print(f"throughput: {len(latencies) / elapsed:.0f} req/s")
+    print(f"latency: p50 {statistics.median(latencies) * 1000:.1f} ms  p99 {p99 * 1000:.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--path", default="/api/v1/services/listings")
+    parser.add_argument("--concurrency", type=int, default=1000)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--token")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
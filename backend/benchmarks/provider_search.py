@@ -0,0 +1,139 @@
+"""Measure provider search latency at scale.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.provider_search --users 500000
+
+Seeds users (60% providers) with an address, a couple of skills and a listing each, then
+times filter combinations through the same query the endpoint runs.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime
+
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from sqlalchemy import insert  # noqa: E402
+from sqlmodel import Session, SQLModel, create_engine  # noqa: E402
+
+from app.api.routes.users import _providers_query  # noqa: E402
+from app.models import Address, ServiceCategory, ServiceListing, User, UserSkill  # noqa: E402
+
+CITIES = ["Lagos", "Abuja", "Ibadan", "Kano", "Port Harcourt", "Enugu", "Benin City", "Jos"]
+SKILLS = ["plumbing", "cleaning", "wiring", "painting", "tiling", "carpentry", "tutoring"]
+CASES = {
+    "no filter": {},
+    "city": {"city": "lagos"},
+    "category": {"category_id": 3},
+    "skill": {"skill": "wiring"},
+    "min rating": {"min_rating": 4.5},
+    "all filters": {"category_id": 3, "skill": "wiring", "city": "kano", "min_rating": 4.0},
+}
+
+
+def seed(engine, users: int) -> None:
+    rng = random.Random(11)
+    now = datetime.utcnow()
+    with Session(engine) as session:
+        for index in range(10):
+            session.add(ServiceCategory(name=f"Category {index}"))
+        session.commit()
+
+    chunk = 20_000
+    with engine.begin() as connection:
+        for first in range(1, users + 1, chunk):
+            ids = range(first, min(first + chunk, users + 1))
+            people, addresses, skills, listings = [], [], [], []
+            for user_id in ids:
+                provider = rng.random() < 0.6
+                people.append(
+                    {
+                        "id": user_id,
+                        "phone": f"{user_id:011d}",
+                        "first_name": "Bench",
+                        "last_name": str(user_id),
+                        "role": "SERVICE_PROVIDER" if provider else "SERVICE_SEEKER",
+                        "password_hash": "x",
+                        "rating_avg": round(rng.uniform(0, 5), 2),
+                        "is_active": True,
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                )
+                addresses.append(
+                    {
+                        "user_id": user_id,
+                        "street": "1 Main St",
+                        "city": rng.choice(CITIES),
+                        "state": "NG",
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                )
+                if provider:
+                    for tag in rng.sample(SKILLS, 2):
+                        skills.append({"user_id": user_id, "skill_tag": tag})
+                    listings.append(
+                        {
+                            "provider_id": user_id,
+                            "category_id": rng.randint(1, 10),
+                            "title": "Service",
+                            "description": "Service",
+                            "base_price": 10,
+                            "pricing_unit": "hour",
+                            "is_active": True,
+                        }
+                    )
+            connection.execute(insert(User), people)
+            connection.execute(insert(Address), addresses)
+            connection.execute(insert(UserSkill), skills)
+            connection.execute(insert(ServiceListing), listings)
+        connection.exec_driver_sql("ANALYZE")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=500_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{tmp}/bench.db")
+        SQLModel.metadata.create_all(engine)
+        started = time.perf_counter()
+        seed(engine, args.users)
+        print(f"seeded {args.users} users in {time.perf_counter() - started:.1f}s")
+
+        with Session(engine) as session:
+            for name, filters in CASES.items():
+                params = {
+                    "category_id": None,
+                    "skill": None,
+                    "city": None,
+                    "min_rating": None,
+                    **filters,
+                }
+                samples, after = [], None
+                for _ in range(args.repeat):
+                    # Page forward so later samples exercise the keyset cursor too.
+                    started = time.perf_counter()
+                    rows = session.exec(_providers_query(args.limit, after, **params)).all()
+                    samples.append((time.perf_counter() - started) * 1000)
+                    after = rows[args.limit - 1].id if len(rows) > args.limit else None
+                samples.sort()
+                p95 = samples[max(0, int(len(samples) * 0.95) - 1)]
+                print(
+                    f"{name:>12}: median {statistics.median(samples):7.2f} ms"
+                    f"   p95 {p95:7.2f} ms"
+                )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
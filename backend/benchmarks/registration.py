@@ -0,0 +1,102 @@
+"""Measure provider signups per second through the registration write path.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.registration --signups 2000
+
+Each signup carries an address and a five-day availability week. The password hash is
+computed once up front: bcrypt costs the same either way and would otherwise swamp the
+database work being compared. "legacy" replays the old flow (two uniqueness SELECTs, then a
+commit and refresh per table); "single-tx" is ``auth._create_user``.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from sqlmodel import Session, SQLModel, select  # noqa: E402
+
+from app.api.routes.auth import _create_user  # noqa: E402
+from app.core.database import _create_engine  # noqa: E402
+from app.core.security import get_password_hash  # noqa: E402
+from app.models import Address, Availability, User  # noqa: E402
+from app.models.user import UserCreate, UserRole  # noqa: E402
+
+WEEK = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday")
+
+
+def payload(index: int) -> UserCreate:
+    return UserCreate.model_validate(
+        {
+            "phone": f"{index:011d}",
+            "email": f"user{index}@example.com",
+            "password": "Passw0rd!",
+            "first_name": "Bench",
+            "last_name": "Mark",
+            "role": "SERVICE_PROVIDER",
+            "address": {"street": "1 Road", "city": "Lagos", "state": "LA"},
+            "availability": [
+                {"day_of_week": day, "start_time": "09:00:00", "end_time": "17:00:00"}
+                for day in WEEK
+            ],
+        }
+    )
+
+
+def legacy(session: Session, data: UserCreate, password_hash: str) -> None:
+    if session.exec(select(User).where(User.phone == data.phone)).first():
+        raise ValueError("duplicate phone")
+    if session.exec(select(User).where(User.email == data.email)).first():
+        raise ValueError("duplicate email")
+    user = User(
+        phone=data.phone,
+        email=data.email,
+        password_hash=password_hash,
+        first_name=data.first_name,
+        last_name=data.last_name,
+        role=UserRole.SERVICE_PROVIDER,
+    )
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+    session.add(Address(user_id=user.id, **data.address.model_dump()))
+    session.commit()
+    for window in data.availability:
+        session.add(Availability(user_id=user.id, **window.model_dump()))
+    session.commit()
+    session.refresh(user)
+
+
+def single_transaction(session: Session, data: UserCreate, password_hash: str) -> None:
+    _create_user(session, data, data.phone, data.email, password_hash)
+
+
+def run(name: str, register, signups: int, password_hash: str) -> None:
+    payloads = [payload(index) for index in range(signups)]
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = _create_engine(f"sqlite:///{tmp}/bench.db")
+        SQLModel.metadata.create_all(engine)
+        started = time.perf_counter()
+        for data in payloads:
+            with Session(engine) as session:
+                register(session, data, password_hash)
+        elapsed = time.perf_counter() - started
+        engine.dispose()
+    per_signup = elapsed * 1000 / signups
+    print(f"{name:>10}: {signups / elapsed:8.0f} signups/s ({per_signup:.2f} ms each)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--signups", type=int, default=2000)
+    args = parser.parse_args()
+    password_hash = get_password_hash("Passw0rd!")
+    run("legacy", legacy, args.signups, password_hash)
+    run("single-tx", single_transaction, args.signups, password_hash)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Time free-slot lookups for providers holding thousands of bookings.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.slot_engine --bookings 1000 5000 20000
+
+For each size, one provider works 08:00-18:00 every day and has that many one-hour bookings
+spread over the surrounding years. Cost should track the size of the requested range, not
+the provider's total booking count.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from datetime import time as clock
+
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from sqlalchemy import insert  # noqa: E402
+from sqlmodel import Session, SQLModel, create_engine, select  # noqa: E402
+
+from app.core.slots import compute_free_slots, provider_free_slots, slot_cache  # noqa: E402
+from app.models import Availability, BookingRequest, BookingStatus, DayOfWeek, User  # noqa: E402
+from app.models.service import ServiceCategory, ServiceListing  # noqa: E402
+
+START = date(2030, 1, 7)
+
+
+def seed(engine, bookings: int) -> None:
+    rng = random.Random(7)
+    with Session(engine) as session:
+        session.add(
+            User(
+                phone="08000000000",
+                first_name="Bench",
+                last_name="Mark",
+                password_hash="x",
+                role="SERVICE_PROVIDER",
+            )
+        )
+        session.add(ServiceCategory(name="Cleaning"))
+        session.commit()
+        session.add(
+            ServiceListing(
+                provider_id=1, category_id=1, title="Clean", description="Clean", base_price=10
+            )
+        )
+        for day in DayOfWeek:
+            session.add(
+                Availability(user_id=1, day_of_week=day, start_time=clock(8), end_time=clock(18))
+            )
+        session.commit()
+
+    # Spread bookings over ~4 years around START so a one-week range holds only a few.
+    span_hours = 4 * 365 * 10
+    rows = []
+    for _ in range(bookings):
+        offset = rng.randrange(span_hours)
+        day = START - timedelta(days=2 * 365) + timedelta(days=offset // 10)
+        rows.append(
+            {
+                "listing_id": 1,
+                "requester_id": 1,
+                "provider_id": 1,
+                "scheduled_at": datetime.combine(day, clock(8 + offset % 10)),
+                "duration_hours": 1,
+                "location": "Site",
+                "total_price": 10,
+                "status": rng.choice(list(BookingStatus)).name,
+                "payment_status": "PENDING",
+                "created_at": datetime.utcnow(),
+                "updated_at": datetime.utcnow(),
+            }
+        )
+    with engine.begin() as connection:
+        connection.execute(insert(BookingRequest), rows)
+
+
+def naive(session: Session, start: date, end: date) -> list:
+    # What clients do now: pull every booking and availability row, then intersect.
+    windows = session.exec(select(Availability).where(Availability.user_id == 1)).all()
+    bookings = session.exec(select(BookingRequest).where(BookingRequest.provider_id == 1)).all()
+    busy = sorted(
+        (b.scheduled_at, b.scheduled_at + timedelta(hours=b.duration_hours))
+        for b in bookings
+        if b.status in (BookingStatus.REQUESTED, BookingStatus.ACCEPTED, BookingStatus.IN_PROGRESS)
+    )
+    return compute_free_slots(windows, busy, start, end)
+
+
+def timed(func, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def report(name: str, samples: list[float]) -> None:
+    print(f"  {name:>12}: median {statistics.median(samples):8.3f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bookings", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    end = START + timedelta(days=args.days)
+
+    for size in args.bookings:
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = create_engine(f"sqlite:///{tmp}/bench.db")
+            SQLModel.metadata.create_all(engine)
+            seed(engine, size)
+            print(f"{size} bookings, {args.days}-day range:")
+            with Session(engine) as session:
+                slots = provider_free_slots(session, 1, START, end)
+                print(f"  {len(slots)} free slots")
+
+                def cold() -> None:
+                    slot_cache.clear()
+                    provider_free_slots(session, 1, START, end)
+
+                def warm() -> None:
+                    provider_free_slots(session, 1, START, end)
+
+                report("naive", timed(lambda: naive(session, START, end), args.repeat // 10 or 1))
+                report("engine", timed(cold, args.repeat))
+                report("cached", timed(warm, args.repeat))
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
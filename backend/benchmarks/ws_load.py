@@ -0,0 +1,132 @@
+"""Hold thousands of idle message WebSockets open and measure live delivery latency.
+
+Start the server, raise the open-file limit, then run::
+
+    ulimit -n 65536
+    uvicorn app.main:app --workers 1 &
+    python -m benchmarks.ws_load --idle 10000 --messages 200
+
+The script registers three users, opens ``--idle`` sockets for a bystander (they receive nothing
+but heartbeats), opens one socket for the thread receiver and times how long each message posted
+over HTTP takes to arrive on it. With several workers, set ``REALTIME_USE_REDIS=true`` so posts
+handled by one worker reach sockets held by another.
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import uuid
+
+import httpx
+import websockets
+
+
+async def register(client: httpx.AsyncClient, role: str) -> tuple[str, int]:
+    phone = "09" + str(uuid.uuid4().int)[:9]
+    payload = {
+        "phone": phone,
+        "password": "Passw0rd!",
+        "first_name": "Load",
+        "last_name": "Test",
+        "role": role,
+    }
+    (await client.post("/api/v1/auth/register", json=payload)).raise_for_status()
+    login = await client.post(
+        "/api/v1/auth/login", data={"username": phone, "password": payload["password"]}
+    )
+    login.raise_for_status()
+    token = login.json()["access_token"]
+    me = await client.get("/api/v1/users/me", headers={"Authorization": f"Bearer {token}"})
+    return token, me.json()["id"]
+
+
+async def hold_idle(url: str, opened: asyncio.Event, stop: asyncio.Event, stats: dict) -> None:
+    try:
+        async with websockets.connect(url, open_timeout=60, ping_interval=None) as ws:
+            stats["open"] += 1
+            if stats["open"] >= stats["target"]:
+                opened.set()
+            while not stop.is_set():
+                try:
+                    event = json.loads(await asyncio.wait_for(ws.recv(), timeout=1.0))
+                except TimeoutError:
+                    continue
+                if event.get("type") == "ping":
+                    await ws.send(json.dumps({"type": "pong"}))
+    except (OSError, websockets.WebSocketException):
+        stats["failed"] += 1
+        if stats["open"] + stats["failed"] >= stats["target"]:
+            opened.set()
+
+
+async def run(args: argparse.Namespace) -> None:
+    ws_base = args.url.replace("http", "ws", 1) + "/api/v1/messages/ws?token="
+    async with httpx.AsyncClient(base_url=args.url, timeout=60) as client:
+        sender_token, _ = await register(client, "SERVICE_SEEKER")
+        receiver_token, receiver_id = await register(client, "SERVICE_PROVIDER")
+        bystander_token, _ = await register(client, "SERVICE_SEEKER")
+        sender_headers = {"Authorization": f"Bearer {sender_token}"}
+        thread = await client.post(
+            "/api/v1/messages/threads", json={"receiver_id": receiver_id}, headers=sender_headers
+        )
+        thread_id = thread.json()["id"]
+
+        stats = {"open": 0, "failed": 0, "target": args.idle}
+        opened, stop = asyncio.Event(), asyncio.Event()
+        started = time.perf_counter()
+        idle = []
+        bystander_url = ws_base + bystander_token
+        for index in range(args.idle):
+            idle.append(asyncio.create_task(hold_idle(bystander_url, opened, stop, stats)))
+            if index % args.connect_batch == args.connect_batch - 1:
+                await asyncio.sleep(0)
+        if args.idle:
+            await opened.wait()
+        print(
+            f"idle sockets: {stats['open']} open, {stats['failed']} failed "
+            f"in {time.perf_counter() - started:.1f}s"
+        )
+
+        latencies: list[float] = []
+        async with websockets.connect(ws_base + receiver_token, ping_interval=None) as receiver:
+            for index in range(args.messages):
+                posted = time.perf_counter()
+                resp = await client.post(
+                    f"/api/v1/messages/threads/{thread_id}/messages",
+                    json={"content": f"load test message {index}"},
+                    headers=sender_headers,
+                )
+                resp.raise_for_status()
+                while True:
+                    event = json.loads(await asyncio.wait_for(receiver.recv(), timeout=10))
+                    if event.get("type") == "message":
+                        break
+                latencies.append(time.perf_counter() - posted)
+
+        stop.set()
+        await asyncio.gather(*idle, return_exceptions=True)
+
+    if not latencies:
+        return
+    latencies.sort()
+    p99 = latencies[max(0, int(len(latencies) * 0.99) - 1)]
+    print(f"messages: {len(latencies)}")
+    print(
+        f"post-to-deliver latency: p50 {statistics.median(latencies) * 1000:.1f} ms  "
+        f"p99 {p99 * 1000:.1f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--idle", type=int, default=10_000)
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--connect-batch", type=int, default=200)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
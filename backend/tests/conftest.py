@@ -1,15 +1,52 @@
 import os
-from collections.abc import Generator
+from collections.abc import Callable, Generator
+from contextlib import contextmanager
 
 import pytest
 from fastapi.testclient import TestClient
 from sqlmodel import Session, SQLModel, create_engine
 
+from app.api.deps import (
+    get_db,
+    get_export_db,
+    get_read_db,
+    get_session_factory,
+    principal_cache,
+    recent_writers,
+)
+from app.api.routes.services import categories_snapshot
 from app.core.config import Settings, get_settings
 from app.core.database import get_session
+from app.core.profiling import QueryProfile, profile_observers
+from app.core.ratelimit import memory_limiter
+from app.core.slots import slot_cache
 from app.main import app
 
 
+def auth_headers(token: str) -> dict[str, str]:
+    return {"Authorization": f"Bearer {token}"}
+
+
+def register(
+    client: TestClient, phone: str, role: str = "SERVICE_SEEKER", **extra
+) -> tuple[str, int]:
+    """Register a user and log them in; returns their access token and id."""
+    payload = {
+        "phone": phone,
+        "password": "Passw0rd!",
+        "first_name": "Test",
+        "last_name": "User",
+        "role": role,
+        **extra,
+    }
+    registered = client.post("/api/v1/auth/register", json=payload)
+    assert registered.status_code == 201
+    login = client.post(
+        "/api/v1/auth/login", data={"username": phone, "password": payload["password"]}
+    )
+    return login.json()["access_token"], registered.json()["id"]
+
+
 @pytest.fixture(scope="session", autouse=True)
 def override_settings() -> Generator[None, None, None]:
     os.environ["SECRET_KEY"] = "test-secret-key"
@@ -37,7 +74,48 @@ def client_fixture(session: Session) -> Generator[TestClient, None, None]:
         yield session
 
     app.dependency_overrides[get_session] = get_test_session
+    app.dependency_overrides[get_db] = get_test_session
+    app.dependency_overrides[get_read_db] = get_test_session
+    app.dependency_overrides[get_export_db] = lambda: session
+    app.dependency_overrides[get_session_factory] = lambda: lambda: session
     with TestClient(app) as client:
         yield client
     app.dependency_overrides.clear()
+    principal_cache.clear()
+    recent_writers.clear()
+    categories_snapshot.invalidate()
+    slot_cache.clear()
+    memory_limiter.clear()
+
+
+@pytest.fixture
+def query_budget(monkeypatch: pytest.MonkeyPatch) -> Callable:
+    """Fail when a request made inside the block runs too many statements or an N+1.
+
+        with query_budget(3):
+            client.get("/api/v1/bookings/", headers=headers)
+    """
+    settings = get_settings()
+    monkeypatch.setattr(settings, "query_profiling", True)
+
+    @contextmanager
+    def budget(max_statements: int) -> Generator[list[tuple[str, QueryProfile]], None, None]:
+        profiles: list[tuple[str, QueryProfile]] = []
+
+        def observer(label: str, profile: QueryProfile) -> None:
+            profiles.append((label, profile))
+
+        profile_observers.append(observer)
+        try:
+            yield profiles
+        finally:
+            profile_observers.remove(observer)
+        assert profiles, "no request was profiled inside the budget block"
+        for label, profile in profiles:
+            assert profile.statements <= max_statements, (
+                f"{label} is over its budget of {max_statements}: {profile.report()}"
+            )
+            repeated = profile.repeated(settings.repeated_statement_threshold)
+            assert not repeated, f"{label} looks like an N+1: {profile.report()}"
 
+    return budget
@@ -1,10 +1,17 @@
 from datetime import datetime, timedelta
 
+import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import update
+from sqlmodel import Session, select
 
-
-def auth_headers(token: str) -> dict[str, str]:
-    return {"Authorization": f"Bearer {token}"}
+from app.api.deps import principal_cache, track_principal_writes
+from app.api.routes import auth
+from app.core.admins import grant_admin
+from app.core.cache import _on_invalidation_message
+from app.core.config import Settings, get_settings
+from app.models.user import User
+from tests.conftest import auth_headers, register
 
 
 def test_full_service_flow(client: TestClient) -> None:
@@ -118,3 +125,131 @@ def test_full_service_flow(client: TestClient) -> None:
     assert messages.status_code == 200
     assert len(messages.json()) == 1
 
+
+
+def test_principal_cache_invalidated_when_user_deactivated(
+    client: TestClient, session: Session
+) -> None:
+    payload = {
+        "phone": "08000000033",
+        "password": "Passw0rd!",
+        "first_name": "Cached",
+        "last_name": "User",
+    }
+    assert client.post("/api/v1/auth/register", json=payload).status_code == 201
+    login = client.post(
+        "/api/v1/auth/login",
+        data={"username": payload["phone"], "password": payload["password"]},
+    )
+    token = login.json()["access_token"]
+
+    assert client.get("/api/v1/users/me", headers=auth_headers(token)).status_code == 200
+
+    user_id = login.json()["user"]["id"]
+    user = session.get(User, user_id)
+    user.is_active = False
+    session.add(user)
+    session.flush()
+    # Dropped on commit, not on flush: a rollback must leave the cached principal in place.
+    assert principal_cache.get(user_id) is not None
+    session.rollback()
+    assert principal_cache.get(user_id) is not None
+
+    user.is_active = False
+    session.add(user)
+    session.commit()
+    assert principal_cache.get(user_id) is None
+    assert client.get("/api/v1/users/me", headers=auth_headers(token)).status_code == 403
+
+    # Core UPDATEs skip the mapper events and are tracked explicitly.
+    session.exec(update(User).where(User.id == user_id).values(is_active=True))
+    track_principal_writes(session, (user_id,))
+    session.commit()
+    assert client.get("/api/v1/users/me", headers=auth_headers(token)).status_code == 200
+
+
+def test_principal_invalidation_reaches_every_worker(client: TestClient, session: Session) -> None:
+    token, user_id = register(client, "08000000034")
+    assert client.get("/api/v1/users/me", headers=auth_headers(token)).status_code == 200
+    assert principal_cache.get(user_id) is not None
+
+    # What another worker's listener runs when this one publishes an invalidation.
+    _on_invalidation_message({"data": f"principal:{user_id}".encode()})
+    assert principal_cache.get(user_id) is None
+
+    # Granting admin from the command line invalidates too, though no request committed it.
+    assert client.get("/api/v1/users/me", headers=auth_headers(token)).json()["role"] != "ADMIN"
+    grant_admin(session, "08000000034")
+    assert principal_cache.get(user_id) is None
+    assert client.get("/api/v1/users/me", headers=auth_headers(token)).json()["role"] == "ADMIN"
+
+
+def test_register_is_atomic_and_rejects_duplicates(client: TestClient, session: Session) -> None:
+    payload = {
+        "phone": "08000000044",
+        "email": "Dup@Example.com",
+        "password": "Passw0rd!",
+        "first_name": "Dup",
+        "last_name": "User",
+        "role": "SERVICE_PROVIDER",
+        "address": {"street": "1 Road", "city": "Lagos", "state": "LA"},
+        "availability": [
+            {"day_of_week": day, "start_time": "09:00:00", "end_time": "17:00:00"}
+            for day in ("Monday", "Tuesday", "Wednesday")
+        ],
+    }
+    created = client.post("/api/v1/auth/register", json=payload)
+    assert created.status_code == 201
+    user = session.get(User, created.json()["id"])
+    assert user.address.city == "Lagos"
+    assert len(user.availabilities) == 3
+
+    same_phone = client.post("/api/v1/auth/register", json={**payload, "email": None})
+    assert same_phone.status_code == 400
+    assert same_phone.json()["detail"] == "Phone already in use"
+
+    same_email = client.post(
+        "/api/v1/auth/register",
+        json={**payload, "phone": "08000000055", "email": "dup@example.com"},
+    )
+    assert same_email.status_code == 400
+    assert same_email.json()["detail"] == "Email already in use"
+    assert session.exec(select(User).where(User.phone == "08000000055")).first() is None
+
+
+def test_login_is_throttled_per_phone_before_password_check(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(
+        get_settings(), "rate_limits", {"auth.login": {"ip": "100/minute", "phone": "3/minute"}}
+    )
+    checked = []
+
+    async def verify(password: str, password_hash: str) -> bool:
+        checked.append(password)
+        return False
+
+    monkeypatch.setattr(auth, "verify_password_async", verify)
+    client.post(
+        "/api/v1/auth/register",
+        json={"phone": "08000000066", "password": "Passw0rd!", "first_name": "A", "last_name": "B"},
+    )
+
+    def attempt(phone: str):
+        return client.post("/api/v1/auth/login", data={"username": phone, "password": "guess"})
+
+    assert [attempt("08000000066").status_code for _ in range(3)] == [401, 401, 401]
+    throttled = attempt(" 08000000066 ")
+    assert throttled.status_code == 429
+    assert int(throttled.headers["Retry-After"]) > 0
+    assert len(checked) == 3
+    # Other phones from the same address still get through until the IP bucket runs dry.
+    assert attempt("08000000077").status_code == 401
+
+
+@pytest.mark.parametrize(
+    "limits", [{"auth.login": {"ip": "lots"}}, {"auth.login": {"host": "5/minute"}}]
+)
+def test_malformed_rate_limits_fail_at_startup(limits: dict[str, dict[str, str]]) -> None:
+    with pytest.raises(ValueError):
+        Settings(rate_limits=limits)
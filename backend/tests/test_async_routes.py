@@ -0,0 +1,135 @@
+from collections.abc import AsyncGenerator, Generator
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api.deps import (
+    get_async_db,
+    get_current_user,
+    get_db,
+    get_read_db,
+    principal_cache,
+    recent_writers,
+)
+from app.api.routes import auth, bookings, messages, services
+from app.core.database import get_session
+from tests.conftest import auth_headers, register
+
+
+@pytest.fixture(name="async_client")
+def async_client_fixture(session: Session) -> Generator[TestClient, None, None]:
+    async_engine = create_async_engine("sqlite+aiosqlite:///./test.db", poolclass=NullPool)
+    factory = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+
+    def get_test_session() -> Generator[Session, None, None]:
+        yield session
+
+    async def get_test_async_session() -> AsyncGenerator[AsyncSession, None]:
+        async with factory() as async_session:
+            yield async_session
+
+    app = FastAPI()
+    for module in (services, bookings, messages):
+        app.include_router(module.async_router, prefix="/api/v1")
+    for module in (auth, services):
+        app.include_router(module.router, prefix="/api/v1")
+    app.dependency_overrides[get_session] = get_test_session
+    app.dependency_overrides[get_db] = get_test_session
+    app.dependency_overrides[get_read_db] = get_test_session
+    app.dependency_overrides[get_async_db] = get_test_async_session
+    with TestClient(app) as client:
+        yield client
+    principal_cache.clear()
+    recent_writers.clear()
+
+
+def test_async_booking_messaging_and_listing_routes(async_client: TestClient) -> None:
+    category_id = async_client.post(
+        "/api/v1/services/categories", json={"name": "Cleaning"}
+    ).json()["id"]
+    provider_token, provider_id = register(async_client, "08000000011", "SERVICE_PROVIDER")
+    seeker_token, seeker_id = register(async_client, "08000000022")
+
+    listing = async_client.post(
+        "/api/v1/services/listings",
+        json={
+            "title": "Apartment Cleaning",
+            "description": "Thorough cleaning",
+            "base_price": 50,
+            "category_id": category_id,
+        },
+        headers=auth_headers(provider_token),
+    )
+    assert listing.status_code == 201
+    listings = async_client.get("/api/v1/services/listings")
+    assert [item["id"] for item in listings.json()] == [listing.json()["id"]]
+
+    booking = async_client.post(
+        "/api/v1/bookings/",
+        json={
+            "listing_id": listing.json()["id"],
+            "provider_id": provider_id,
+            "scheduled_at": (datetime.utcnow() + timedelta(days=1)).isoformat(),
+            "duration_hours": 2,
+            "location": "123 Main St",
+            "total_price": 100,
+        },
+        headers=auth_headers(seeker_token),
+    )
+    assert booking.status_code == 201
+    # Async writes count towards read-your-writes just as sync ones do.
+    assert recent_writers.get(seeker_id)
+    accepted = async_client.patch(
+        f"/api/v1/bookings/{booking.json()['id']}/status",
+        json={"new_status": "ACCEPTED"},
+        headers=auth_headers(provider_token),
+    )
+    assert accepted.json()["status"] == "ACCEPTED"
+    provider_bookings = async_client.get(
+        "/api/v1/bookings/", params={"role": "provider"}, headers=auth_headers(provider_token)
+    )
+    assert len(provider_bookings.json()) == 1
+
+    thread = async_client.post(
+        "/api/v1/messages/threads",
+        json={"receiver_id": provider_id},
+        headers=auth_headers(seeker_token),
+    ).json()
+    sent = async_client.post(
+        f"/api/v1/messages/threads/{thread['id']}/messages",
+        json={"content": "Hello"},
+        headers=auth_headers(seeker_token),
+    )
+    assert sent.status_code == 201
+    history = async_client.get(
+        f"/api/v1/messages/threads/{thread['id']}/messages", headers=auth_headers(provider_token)
+    )
+    assert [item["content"] for item in history.json()] == ["Hello"]
+
+    inbox = async_client.get("/api/v1/messages/inbox", headers=auth_headers(provider_token))
+    assert inbox.json()[0]["unread_count"] == 1
+    read = async_client.post(
+        f"/api/v1/messages/threads/{thread['id']}/read",
+        json={"up_to_message_id": sent.json()["id"]},
+        headers=auth_headers(provider_token),
+    )
+    assert read.json()["marked_read"] == 1
+    assert read.json()["unread_count"] == 0
+
+
+def test_async_routes_authenticate_without_the_sync_session() -> None:
+    def calls(dependant):
+        for sub in dependant.dependencies:
+            yield sub.call
+            yield from calls(sub)
+
+    for module in (services, bookings, messages):
+        for route in module.async_router.routes:
+            used = set(calls(route.dependant))
+            assert get_db not in used and get_current_user not in used, route.path
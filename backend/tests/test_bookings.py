@@ -0,0 +1,202 @@
+import json
+import os
+from collections.abc import Generator
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, SQLModel
+
+from app.api.deps import get_db, get_read_db, principal_cache, recent_writers
+from app.api.routes.bookings import _is_overlap
+from app.core.admins import grant_admin
+from app.core.database import _create_engine, get_session
+from app.core.ratelimit import memory_limiter
+from app.main import app
+from app.models import BookingRequest
+from tests.conftest import auth_headers, register
+
+
+@pytest.fixture(name="pooled_client")
+def pooled_client_fixture() -> Generator[TestClient, None, None]:
+    """A client whose requests each get their own session, so they can really race."""
+    engine = _create_engine("sqlite:///./test_bookings.db")
+    SQLModel.metadata.create_all(engine)
+
+    def get_test_session() -> Generator[Session, None, None]:
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = get_test_session
+    app.dependency_overrides[get_db] = get_test_session
+    app.dependency_overrides[get_read_db] = get_test_session
+    with TestClient(app) as client:
+        yield client
+    app.dependency_overrides.clear()
+    principal_cache.clear()
+    recent_writers.clear()
+    memory_limiter.clear()
+    SQLModel.metadata.drop_all(engine)
+    engine.dispose()
+    for suffix in ("", "-shm", "-wal"):
+        if os.path.exists(f"test_bookings.db{suffix}"):
+            os.remove(f"test_bookings.db{suffix}")
+
+
+def setup_listing(client: TestClient, **provider_extra) -> tuple[str, int, int]:
+    provider_token, provider_id = register(
+        client, "08000000061", "SERVICE_PROVIDER", **provider_extra
+    )
+    seeker_token, _ = register(client, "08000000062", "SERVICE_SEEKER")
+    category_id = client.post("/api/v1/services/categories", json={"name": "Cleaning"}).json()["id"]
+    listing = client.post(
+        "/api/v1/services/listings",
+        json={
+            "category_id": category_id,
+            "title": "Deep clean",
+            "description": "Whole flat",
+            "base_price": 40,
+        },
+        headers=auth_headers(provider_token),
+    ).json()
+    return seeker_token, provider_id, listing["id"]
+
+
+def booking_body(listing_id: int, provider_id: int, start: datetime, hours: float = 2) -> dict:
+    return {
+        "listing_id": listing_id,
+        "provider_id": provider_id,
+        "scheduled_at": start.isoformat(),
+        "duration_hours": hours,
+        "location": "12 High Street",
+        "total_price": 80,
+    }
+
+
+def test_concurrent_bookings_for_one_slot_admit_exactly_one(pooled_client: TestClient) -> None:
+    seeker_token, provider_id, listing_id = setup_listing(pooled_client)
+    start = datetime.utcnow().replace(microsecond=0) + timedelta(days=2)
+
+    def attempt(offset_minutes: int) -> int:
+        body = booking_body(listing_id, provider_id, start + timedelta(minutes=offset_minutes))
+        return pooled_client.post(
+            "/api/v1/bookings/", json=body, headers=auth_headers(seeker_token)
+        ).status_code
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        codes = list(pool.map(attempt, [0, 15, 30, 45, 60, 75, 90, 105]))
+
+    assert codes.count(201) == 1
+    assert codes.count(409) == len(codes) - 1
+
+
+def test_booking_overlap_and_availability_rules(client: TestClient, query_budget) -> None:
+    # Provider works Mondays 09:00-17:00 only.
+    seeker_token, provider_id, listing_id = setup_listing(
+        client,
+        availability=[{"day_of_week": "Monday", "start_time": "09:00", "end_time": "17:00"}],
+    )
+    headers = auth_headers(seeker_token)
+    today = datetime.utcnow().date()
+    monday = datetime.combine(today + timedelta(days=7 - today.weekday()), datetime.min.time())
+
+    def book(start: datetime, hours: float = 2) -> int:
+        body = booking_body(listing_id, provider_id, start, hours)
+        return client.post("/api/v1/bookings/", json=body, headers=headers).status_code
+
+    assert book(monday.replace(hour=10)) == 201
+    assert book(monday.replace(hour=11)) == 409  # overlaps 10:00-12:00
+    assert book(monday.replace(hour=12)) == 201  # back-to-back is fine
+    assert book(monday.replace(hour=16)) == 409  # runs past 17:00
+    assert book(monday.replace(hour=10) + timedelta(days=1)) == 409  # Tuesday
+    assert book(monday.replace(hour=14), hours=48) == 400
+
+    with query_budget(1):
+        listed = client.get("/api/v1/bookings/", headers=headers).json()
+    assert [booking["scheduled_at"] for booking in listed] == [
+        monday.replace(hour=10).isoformat(),
+        monday.replace(hour=12).isoformat(),
+    ]
+
+
+def test_provider_without_windows_is_open_to_slots_and_bookings(client: TestClient) -> None:
+    seeker_token, provider_id, listing_id = setup_listing(client)
+    day = datetime.utcnow().date() + timedelta(days=3)
+    start = datetime.combine(day, datetime.min.time())
+    params = {"start": day.isoformat(), "end": (day + timedelta(days=1)).isoformat()}
+    url = f"/api/v1/users/{provider_id}/slots"
+
+    # No availability rows: the whole range is free, and a booking anywhere in it is accepted.
+    assert client.get(url, params=params).json() == [
+        {"start": start.isoformat(), "end": (start + timedelta(days=1)).isoformat()}
+    ]
+    body = booking_body(listing_id, provider_id, start.replace(hour=3))
+    booked = client.post("/api/v1/bookings/", json=body, headers=auth_headers(seeker_token))
+    assert booked.status_code == 201
+    assert [slot["end"] for slot in client.get(url, params=params).json()] == [
+        start.replace(hour=3).isoformat(),
+        (start + timedelta(days=1)).isoformat(),
+    ]
+
+
+def test_only_the_overlap_constraint_means_the_slot_is_taken() -> None:
+    class PgError(Exception):
+        def __init__(self, pgcode: str) -> None:
+            super().__init__("constraint violated")
+            self.pgcode = pgcode
+
+    assert _is_overlap(IntegrityError("INSERT", {}, PgError("23P01")))
+    assert not _is_overlap(IntegrityError("INSERT", {}, PgError("23503")))  # foreign key
+    sqlite_error = Exception("FOREIGN KEY constraint failed")
+    assert not _is_overlap(IntegrityError("INSERT", {}, sqlite_error))
+
+
+def test_admin_export_streams_bookings_by_creation_range(
+    client: TestClient, session: Session
+) -> None:
+    seeker_token, provider_id, listing_id = setup_listing(client)
+    admin_token, _ = register(client, "08000000063", "SERVICE_SEEKER")
+    grant_admin(session, "08000000063")
+    start = datetime.utcnow().replace(microsecond=0) + timedelta(days=2)
+    ids = []
+    for n in range(3):
+        body = booking_body(listing_id, provider_id, start + timedelta(hours=3 * n))
+        resp = client.post("/api/v1/bookings/", json=body, headers=auth_headers(seeker_token))
+        ids.append(resp.json()["id"])
+    # Spread creation times a day apart so the range filter has something to cut.
+    for n, booking_id in enumerate(ids):
+        booking = session.get(BookingRequest, booking_id)
+        booking.created_at = datetime(2030, 1, 1 + n, 12)
+        session.add(booking)
+    session.commit()
+
+    assert (
+        client.get("/api/v1/bookings/export", headers=auth_headers(seeker_token)).status_code
+        == 403
+    )
+    resp = client.get(
+        "/api/v1/bookings/export",
+        params={"created_from": "2030-01-02T00:00:00", "created_to": "2030-01-03T14:00:00+01:00"},
+        headers=auth_headers(admin_token),
+    )
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in resp.text.splitlines()]
+    assert [row["id"] for row in rows] == ids[1:]
+    assert rows[0]["created_at"] == "2030-01-02T12:00:00"
+    assert rows[0]["status"] == "REQUESTED"
+
+    csv_resp = client.get(
+        "/api/v1/bookings/export", params={"format": "csv"}, headers=auth_headers(admin_token)
+    )
+    lines = csv_resp.text.splitlines()
+    assert csv_resp.headers["content-type"].startswith("text/csv")
+    assert lines[0].split(",")[:2] == ["scheduled_at", "duration_hours"]
+    assert len(lines) == 4
+
+    listings = client.get(
+        "/api/v1/services/listings/export", headers=auth_headers(admin_token)
+    ).text.splitlines()
+    assert [json.loads(line)["id"] for line in listings] == [listing_id]
@@ -0,0 +1,38 @@
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+
+from app.core import database
+
+
+def test_sqlite_engine_pragmas_and_pool_metrics(tmp_path: Path) -> None:
+    engine = database._create_engine(f"sqlite:///{tmp_path / 'pool.db'}")
+    other = database._create_engine(f"sqlite:///{tmp_path / 'other.db'}")
+
+    with engine.connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert connection.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+        assert database.pool_stats(engine.pool)["checked_out"] == 1
+
+    assert isinstance(engine.pool, database.InstrumentedQueuePool)
+    metrics = database.pool_stats(engine.pool)
+    assert metrics["checkouts"] == 1
+    assert metrics["checked_out"] == 0
+    assert metrics["checkout_wait_seconds_max"] >= 0
+    # Each pool counts only its own checkouts, and keeps them when the engine is disposed.
+    assert database.pool_stats(other.pool)["checkouts"] == 0
+    engine.dispose()
+    assert database.pool_stats(engine.pool)["checkouts"] == 1
+    other.dispose()
+
+
+def test_only_pool_timeouts_count_as_checkout_timeouts(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    engine = database._create_engine(f"sqlite:///{tmp_path / 'pool.db'}")
+    monkeypatch.setattr(engine.pool, "_creator", lambda *args: 1 / 0)
+    with pytest.raises(ZeroDivisionError):
+        engine.connect()
+    assert database.pool_stats(engine.pool)["checkout_timeouts"] == 0
+    engine.dispose()
@@ -0,0 +1,147 @@
+from fastapi.testclient import TestClient
+
+from tests.conftest import auth_headers, register
+
+
+def test_message_history_cursors(client: TestClient) -> None:
+    token, _ = register(client, "08000000031")
+    _, receiver_id = register(client, "08000000032", role="SERVICE_PROVIDER")
+    headers = auth_headers(token)
+    thread_id = client.post(
+        "/api/v1/messages/threads", json={"receiver_id": receiver_id}, headers=headers
+    ).json()["id"]
+    url = f"/api/v1/messages/threads/{thread_id}/messages"
+    ids = [
+        client.post(url, json={"content": f"message {i}"}, headers=headers).json()["id"]
+        for i in range(5)
+    ]
+
+    # Latest page first, always returned oldest-first, with a cursor to older history.
+    latest = client.get(url, params={"limit": 2}, headers=headers)
+    assert [m["id"] for m in latest.json()] == ids[3:]
+    older = client.get(
+        url, params={"limit": 2, "before": latest.headers["X-Next-Cursor"]}, headers=headers
+    )
+    assert [m["id"] for m in older.json()] == ids[1:3]
+    oldest = client.get(
+        url, params={"limit": 2, "before": older.headers["X-Next-Cursor"]}, headers=headers
+    )
+    assert [m["id"] for m in oldest.json()] == ids[:1]
+    assert "X-Next-Cursor" not in oldest.headers
+
+    # Incremental mode: only what arrived after the last message the client holds.
+    delta = client.get(url, params={"after": ids[2]}, headers=headers)
+    assert [m["id"] for m in delta.json()] == ids[3:]
+    assert client.get(url, params={"after": ids[-1]}, headers=headers).json() == []
+
+    both = client.get(url, params={"after": ids[0], "before": ids[-1]}, headers=headers)
+    assert both.status_code == 400
+
+
+def test_inbox_previews_and_unread_counts(client: TestClient, query_budget) -> None:
+    seeker_token, seeker_id = register(client, "08000000041")
+    first_token, first_id = register(client, "08000000042", role="SERVICE_PROVIDER")
+    _, second_id = register(client, "08000000043", role="SERVICE_PROVIDER")
+    seeker = auth_headers(seeker_token)
+    first_thread = client.post(
+        "/api/v1/messages/threads", json={"receiver_id": first_id}, headers=seeker
+    ).json()["id"]
+    second_thread = client.post(
+        "/api/v1/messages/threads", json={"receiver_id": second_id}, headers=seeker
+    ).json()["id"]
+
+    client.post(
+        f"/api/v1/messages/threads/{first_thread}/messages", json={"content": "Hi"}, headers=seeker
+    )
+    client.post(
+        f"/api/v1/messages/threads/{second_thread}/messages",
+        json={"content": "x" * 500},
+        headers=seeker,
+    )
+    client.post(
+        f"/api/v1/messages/threads/{first_thread}/messages",
+        json={"content": "Still available?"},
+        headers=seeker,
+    )
+    client.post(
+        f"/api/v1/messages/threads/{first_thread}/messages",
+        json={"content": "Yes, Friday works"},
+        headers=auth_headers(first_token),
+    )
+
+    with query_budget(1):
+        threads = client.get("/api/v1/messages/threads", headers=seeker).json()
+    assert {thread["id"] for thread in threads} == {first_thread, second_thread}
+
+    inbox = client.get("/api/v1/messages/inbox", headers=seeker).json()
+    assert [item["id"] for item in inbox] == [first_thread, second_thread]
+    assert inbox[0]["counterpart_id"] == first_id
+    assert inbox[0]["last_message_preview"] == "Yes, Friday works"
+    assert inbox[0]["unread_count"] == 1
+    assert len(inbox[1]["last_message_preview"]) == 140
+    assert inbox[1]["unread_count"] == 0
+
+    provider_inbox = client.get("/api/v1/messages/inbox", headers=auth_headers(first_token))
+    assert provider_inbox.json()[0]["counterpart_id"] == seeker_id
+    assert provider_inbox.json()[0]["unread_count"] == 2
+
+    page = client.get("/api/v1/messages/inbox", params={"limit": 1}, headers=seeker)
+    assert [item["id"] for item in page.json()] == [first_thread]
+    rest = client.get(
+        "/api/v1/messages/inbox",
+        params={"limit": 1, "before": page.headers["X-Next-Cursor"]},
+        headers=seeker,
+    )
+    assert [item["id"] for item in rest.json()] == [second_thread]
+
+
+def test_read_receipt_marks_range_and_updates_unread_count(client: TestClient) -> None:
+    seeker_token, _ = register(client, "08000000051")
+    provider_token, provider_id = register(client, "08000000052", role="SERVICE_PROVIDER")
+    seeker, provider = auth_headers(seeker_token), auth_headers(provider_token)
+    thread_id = client.post(
+        "/api/v1/messages/threads", json={"receiver_id": provider_id}, headers=seeker
+    ).json()["id"]
+    url = f"/api/v1/messages/threads/{thread_id}/messages"
+    ids = [
+        client.post(url, json={"content": f"message {i}"}, headers=seeker).json()["id"]
+        for i in range(4)
+    ]
+
+    read = client.post(
+        f"/api/v1/messages/threads/{thread_id}/read",
+        json={"up_to_message_id": ids[2]},
+        headers=provider,
+    )
+    assert read.status_code == 200
+    assert read.json()["marked_read"] == 3
+    assert read.json()["unread_count"] == 1
+
+    history = client.get(url, headers=provider).json()
+    assert [m["read_at"] is not None for m in history] == [True, True, True, False]
+
+    # Re-sending an old receipt is a no-op; the sender's own messages are never marked.
+    again = client.post(
+        f"/api/v1/messages/threads/{thread_id}/read",
+        json={"up_to_message_id": ids[1]},
+        headers=provider,
+    )
+    assert again.json() == {
+        "thread_id": thread_id,
+        "up_to_message_id": ids[1],
+        "marked_read": 0,
+        "unread_count": 1,
+    }
+    own = client.post(
+        f"/api/v1/messages/threads/{thread_id}/read",
+        json={"up_to_message_id": ids[3]},
+        headers=seeker,
+    )
+    assert own.json()["marked_read"] == 0
+
+    missing = client.post(
+        f"/api/v1/messages/threads/{thread_id}/read",
+        json={"up_to_message_id": 10_000},
+        headers=provider,
+    )
+    assert missing.status_code == 404
@@ -0,0 +1,116 @@
+import asyncio
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from app.api.routes import messages
+from app.core.config import get_settings
+from tests.conftest import auth_headers, register
+
+
+def test_websocket_receives_posted_messages(client: TestClient) -> None:
+    sender_token, _ = register(client, "08000000021")
+    receiver_token, receiver_id = register(client, "08000000022", role="SERVICE_PROVIDER")
+    thread = client.post(
+        "/api/v1/messages/threads",
+        json={"receiver_id": receiver_id},
+        headers=auth_headers(sender_token),
+    ).json()
+
+    with client.websocket_connect(f"/api/v1/messages/ws?token={receiver_token}") as ws:
+        ws.send_json({"type": "ping"})
+        assert ws.receive_json() == {"type": "pong"}
+
+        resp = client.post(
+            f"/api/v1/messages/threads/{thread['id']}/messages",
+            json={"content": "Are you free on Friday?"},
+            headers=auth_headers(sender_token),
+        )
+        assert resp.status_code == 201
+
+        event = ws.receive_json()
+        assert event["type"] == "message"
+        assert event["message"]["id"] == resp.json()["id"]
+        assert event["message"]["content"] == "Are you free on Friday?"
+
+
+def test_websocket_read_receipts_are_coalesced(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(get_settings(), "ws_read_receipt_delay_seconds", 0.05)
+    sender_token, _ = register(client, "08000000023")
+    reader_token, reader_id = register(client, "08000000024", role="SERVICE_PROVIDER")
+    thread_id = client.post(
+        "/api/v1/messages/threads",
+        json={"receiver_id": reader_id},
+        headers=auth_headers(sender_token),
+    ).json()["id"]
+    ids = [
+        client.post(
+            f"/api/v1/messages/threads/{thread_id}/messages",
+            json={"content": f"message {i}"},
+            headers=auth_headers(sender_token),
+        ).json()["id"]
+        for i in range(3)
+    ]
+
+    with client.websocket_connect(f"/api/v1/messages/ws?token={sender_token}") as sender_ws:
+        with client.websocket_connect(f"/api/v1/messages/ws?token={reader_token}") as reader_ws:
+            for message_id in ids:
+                reader_ws.send_json(
+                    {"type": "read", "thread_id": thread_id, "up_to_message_id": message_id}
+                )
+            reader_ws.send_json({"type": "ping"})
+            assert reader_ws.receive_json() == {"type": "pong"}
+
+            event = sender_ws.receive_json()
+            assert event == {
+                "type": "read",
+                "thread_id": thread_id,
+                "reader_id": reader_id,
+                "up_to_message_id": ids[-1],
+            }
+            # One write for the whole burst: the next thing the sender sees is its own pong.
+            sender_ws.send_json({"type": "ping"})
+            assert sender_ws.receive_json() == {"type": "pong"}
+
+    inbox = client.get("/api/v1/messages/inbox", headers=auth_headers(reader_token)).json()
+    assert inbox[0]["unread_count"] == 0
+
+
+def test_websocket_rejects_invalid_token(client: TestClient) -> None:
+    with pytest.raises(WebSocketDisconnect) as exc:
+        with client.websocket_connect("/api/v1/messages/ws?token=not-a-token") as ws:
+            ws.receive_json()
+    assert exc.value.code == 1008
+
+
+async def test_read_receipt_flushes_never_overlap(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(get_settings(), "ws_read_receipt_delay_seconds", 0)
+    sessions, active, overlaps = [], [], []
+
+    class FakeSession:
+        def __enter__(self):
+            sessions.append(self)
+            return self
+
+        def __exit__(self, *exc_info) -> None:
+            pass
+
+    def slow_mark(session, thread_id, user, up_to) -> None:
+        overlaps.append(bool(active))
+        active.append(thread_id)
+        time.sleep(0.05)
+        active.remove(thread_id)
+
+    monkeypatch.setattr(messages, "_mark_thread_read", slow_mark)
+    receipts = messages.ReadReceiptBuffer(FakeSession, user=None)
+    await receipts.handle(None, {"type": "read", "thread_id": 1, "up_to_message_id": 5})
+    await asyncio.sleep(0.01)  # the timer's write is now running in the threadpool
+    await receipts.handle(None, {"type": "read", "thread_id": 2, "up_to_message_id": 7})
+    await receipts.flush()
+
+    assert overlaps == [False, False]
+    assert len(sessions) == 2
@@ -0,0 +1,45 @@
+import pytest
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+
+from app.core.metrics import QueryStats, current_queries
+
+ROUTE = "/api/v1/reviews/{review_id}"
+
+
+def sample(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_requests_are_labelled_by_route_template_with_sql_counts(client: TestClient) -> None:
+    labels = {"method": "GET", "route": ROUTE}
+    requests_before = sample("http_requests_total", status="404", **labels)
+    statements_before = sample("http_request_db_statements_sum", **labels)
+
+    for review_id in (101, 102):
+        assert client.get(f"/api/v1/reviews/{review_id}").status_code == 404
+
+    assert sample("http_requests_total", status="404", **labels) == requests_before + 2
+    assert sample("http_request_db_statements_sum", **labels) >= statements_before + 2
+    assert sample("http_requests_in_progress", **labels) == 0
+
+    body = client.get("/metrics").text
+    assert f'route="{ROUTE}"' in body
+    assert "/api/v1/reviews/101" not in body
+
+
+def test_failed_statements_leave_no_timing_state_on_the_connection() -> None:
+    engine = create_engine("sqlite://")
+    stats = QueryStats()
+    token = current_queries.set(stats)
+    try:
+        with engine.connect() as conn:
+            with pytest.raises(OperationalError):
+                conn.exec_driver_sql("SELECT * FROM missing")
+            conn.exec_driver_sql("SELECT 1")
+            assert conn.info == {}
+    finally:
+        current_queries.reset(token)
+    assert stats.statements == 1
@@ -0,0 +1,47 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.core import security
+from app.core.config import get_settings
+
+
+async def test_password_hashing_rejects_when_saturated(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(get_settings(), "password_hash_workers", 1)
+    monkeypatch.setattr(get_settings(), "password_hash_max_queue", 0)
+    security.shutdown_password_hasher()
+
+    first = asyncio.ensure_future(security.get_password_hash_async("Passw0rd!"))
+    await asyncio.sleep(0)
+    with pytest.raises(HTTPException) as exc_info:
+        await security.get_password_hash_async("Passw0rd!")
+    assert exc_info.value.status_code == 503
+
+    hashed = await first
+    assert await security.verify_password_async("Passw0rd!", hashed)
+    metrics = security.password_hash_metrics()
+    assert metrics["rejected"] >= 1
+    assert metrics["in_flight"] == 0
+    security.shutdown_password_hasher()
+
+
+async def test_cancelled_caller_keeps_its_slot_until_the_job_finishes(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(get_settings(), "password_hash_workers", 1)
+    monkeypatch.setattr(get_settings(), "password_hash_max_queue", 0)
+    security.shutdown_password_hasher()
+
+    abandoned = asyncio.ensure_future(security.get_password_hash_async("Passw0rd!"))
+    await asyncio.sleep(0.01)  # the hash is now running in the executor
+    abandoned.cancel()
+    await asyncio.sleep(0)
+    # The client is gone but bcrypt is still busy, so the pool is still full.
+    with pytest.raises(HTTPException):
+        await security.get_password_hash_async("Passw0rd!")
+
+    while security.password_hash_metrics()["in_flight"]:
+        await asyncio.sleep(0.01)
+    assert await security.get_password_hash_async("Passw0rd!")
+    security.shutdown_password_hasher()
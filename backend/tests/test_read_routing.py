@@ -0,0 +1,43 @@
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+from sqlmodel import Session, SQLModel, create_engine
+from starlette.requests import Request
+
+from app.api import deps
+from app.core import database
+from app.core.security import create_token
+from app.models.service import ServiceCategory
+
+
+def request_for(user_id: int | None) -> Request:
+    headers = []
+    if user_id is not None:
+        token = create_token(str(user_id), timedelta(minutes=5), "access")
+        headers.append((b"authorization", f"Bearer {token}".encode()))
+    return Request({"type": "http", "headers": headers})
+
+
+def test_reads_stick_to_primary_after_own_write(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    SQLModel.metadata.create_all(primary)
+    monkeypatch.setattr(database, "_engine", primary)
+    monkeypatch.setattr(database, "_read_engine", replica)
+
+    with Session(primary) as session:
+        session.info["user_id"] = 7
+        session.add(ServiceCategory(name="Cleaning"))
+        session.commit()
+    assert deps.wrote_recently(7)
+
+    writer_session = next(deps.get_read_db(request_for(7)))
+    other_session = next(deps.get_read_db(request_for(8)))
+    anonymous_session = next(deps.get_read_db(request_for(None)))
+    assert writer_session.get_bind() is primary
+    assert other_session.get_bind() is replica
+    assert anonymous_session.get_bind() is replica
+    deps.recent_writers.clear()
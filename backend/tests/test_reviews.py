@@ -0,0 +1,108 @@
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.core.ratings import recompute_ratings
+from app.models import User
+from tests.conftest import auth_headers, register
+
+
+def book(client: TestClient, seeker_token: str, provider_token: str, provider_id: int, day: int):
+    category_id = client.post(
+        "/api/v1/services/categories", json={"name": f"Plumbing {day}"}
+    ).json()["id"]
+    listing = client.post(
+        "/api/v1/services/listings",
+        json={"category_id": category_id, "title": "Fix", "description": "Sink", "base_price": 20},
+        headers=auth_headers(provider_token),
+    ).json()
+    booking = client.post(
+        "/api/v1/bookings/",
+        json={
+            "listing_id": listing["id"],
+            "provider_id": provider_id,
+            "scheduled_at": (datetime(2031, 1, 1) + timedelta(days=day)).isoformat(),
+            "duration_hours": 1,
+            "location": "Home",
+            "total_price": 20,
+        },
+        headers=auth_headers(seeker_token),
+    ).json()
+    return booking["id"]
+
+
+def complete(client: TestClient, provider_token: str, booking_id: int) -> None:
+    for new_status in ("ACCEPTED", "IN_PROGRESS", "COMPLETED"):
+        response = client.patch(
+            f"/api/v1/bookings/{booking_id}/status",
+            json={"new_status": new_status},
+            headers=auth_headers(provider_token),
+        )
+        assert response.status_code == 200
+
+
+def test_reviews_update_rating_incrementally(
+    client: TestClient, session: Session, query_budget
+) -> None:
+    provider_token, provider_id = register(client, "08000000071", "SERVICE_PROVIDER")
+    seeker_token, seeker_id = register(client, "08000000072", "SERVICE_SEEKER")
+    first = book(client, seeker_token, provider_token, provider_id, 0)
+    second = book(client, seeker_token, provider_token, provider_id, 1)
+
+    early = client.post(
+        "/api/v1/reviews/",
+        json={"booking_id": first, "rating": 5},
+        headers=auth_headers(seeker_token),
+    )
+    assert early.status_code == 400
+
+    complete(client, provider_token, first)
+    complete(client, provider_token, second)
+    for booking_id, rating in ((first, 5), (second, 2)):
+        response = client.post(
+            "/api/v1/reviews/",
+            json={"booking_id": booking_id, "rating": rating, "comment": "ok"},
+            headers=auth_headers(seeker_token),
+        )
+        assert response.status_code == 201
+        assert response.json()["reviewee_id"] == provider_id
+
+    duplicate = client.post(
+        "/api/v1/reviews/",
+        json={"booking_id": first, "rating": 1},
+        headers=auth_headers(seeker_token),
+    )
+    assert duplicate.status_code == 409
+
+    # The provider reviews the seeker back; that lands on the seeker's aggregates.
+    back = client.post(
+        "/api/v1/reviews/",
+        json={"booking_id": first, "rating": 4},
+        headers=auth_headers(provider_token),
+    )
+    assert back.status_code == 201
+    assert back.json()["reviewee_id"] == seeker_id
+
+    me = client.get("/api/v1/users/me", headers=auth_headers(provider_token)).json()
+    assert me["rating_avg"] == 3.5
+    assert me["rating_count"] == 2
+
+    with query_budget(1):
+        page = client.get(f"/api/v1/reviews/?user_id={provider_id}&limit=1")
+    assert [review["rating"] for review in page.json()] == [2]
+    rest = client.get(
+        f"/api/v1/reviews/?user_id={provider_id}&after={page.headers['X-Next-Cursor']}"
+    )
+    assert [review["rating"] for review in rest.json()] == [5]
+    assert "X-Next-Cursor" not in rest.headers
+
+    # Drift is repaired by the batch job, and a consistent table is left alone.
+    provider = session.get(User, provider_id)
+    provider.rating_sum, provider.rating_avg = 0, 0.0
+    session.add(provider)
+    session.commit()
+    assert recompute_ratings(session, chunk_size=1) == 1
+    session.refresh(provider)
+    assert (provider.rating_count, provider.rating_sum, provider.rating_avg) == (2, 7, 3.5)
+    assert recompute_ratings(session) == 0
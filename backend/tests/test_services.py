@@ -0,0 +1,208 @@
+import json
+import time
+
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session
+
+from app.api.routes.services import categories_snapshot
+from app.core.admins import grant_admin
+from app.core.bulk_import import BulkImporter
+from app.models import ServiceCategory
+from tests.conftest import auth_headers, register
+
+
+def create_listing(client: TestClient, token: str, **overrides) -> dict:
+    body = {
+        "title": "Apartment Cleaning",
+        "description": "Thorough cleaning for apartments",
+        "base_price": 50,
+        "pricing_unit": "hour",
+        "coverage_area": "Downtown",
+        **overrides,
+    }
+    resp = client.post("/api/v1/services/listings", json=body, headers=auth_headers(token))
+    assert resp.status_code == 201
+    return resp.json()
+
+
+def test_listings_keyset_pagination_and_filters(client: TestClient, query_budget) -> None:
+    cleaning = client.post("/api/v1/services/categories", json={"name": "Cleaning"}).json()["id"]
+    plumbing = client.post("/api/v1/services/categories", json={"name": "Plumbing"}).json()["id"]
+    token, _ = register(client, "08000000011", "SERVICE_PROVIDER")
+    for price in (10, 20, 30, 40, 50):
+        create_listing(client, token, category_id=cleaning, base_price=price)
+    create_listing(client, token, category_id=plumbing, base_price=80, coverage_area="Uptown")
+
+    with query_budget(1):
+        first = client.get("/api/v1/services/listings", params={"limit": 4})
+    assert first.status_code == 200
+    assert len(first.json()) == 4
+    cursor = first.headers["X-Next-Cursor"]
+
+    second = client.get("/api/v1/services/listings", params={"limit": 4, "after": cursor})
+    assert len(second.json()) == 2
+    assert "X-Next-Cursor" not in second.headers
+    ids = [item["id"] for item in first.json() + second.json()]
+    assert ids == sorted(set(ids))
+
+    filtered = client.get(
+        "/api/v1/services/listings",
+        params={"category_id": cleaning, "min_price": 20, "max_price": 40},
+    )
+    assert [item["base_price"] for item in filtered.json()] == [20, 30, 40]
+
+    uptown = client.get("/api/v1/services/listings", params={"coverage_area": "uptown"})
+    assert [item["category_id"] for item in uptown.json()] == [plumbing]
+
+
+def test_listing_search_ranks_prefix_matches_and_tracks_writes(client: TestClient) -> None:
+    cleaning = client.post("/api/v1/services/categories", json={"name": "Cleaning"}).json()["id"]
+    repairs = client.post("/api/v1/services/categories", json={"name": "Repairs"}).json()["id"]
+    token, _ = register(client, "08000000011", "SERVICE_PROVIDER")
+    title_hit = create_listing(client, token, category_id=repairs, title="Window cleaning")
+    description_hit = create_listing(
+        client, token, category_id=repairs, title="Handyman", description="Also does cleaning"
+    )
+    category_hit = create_listing(
+        client, token, category_id=cleaning, title="Sparkle crew", description="Homes"
+    )
+
+    resp = client.get("/api/v1/services/listings/search", params={"q": "clean"})
+    assert resp.status_code == 200
+    ids = [item["id"] for item in resp.json()]
+    assert ids == [title_hit["id"], category_hit["id"], description_hit["id"]]
+
+    paged = client.get("/api/v1/services/listings/search", params={"q": "clean", "limit": 2})
+    assert len(paged.json()) == 2
+    assert paged.headers["X-Next-Offset"] == "2"
+
+    client.patch(
+        f"/api/v1/services/listings/{title_hit['id']}",
+        json={**title_hit, "title": "Gutter repair", "description": "Gutters"},
+        headers=auth_headers(token),
+    )
+    client.delete(
+        f"/api/v1/services/listings/{category_hit['id']}", headers=auth_headers(token)
+    )
+    resp = client.get("/api/v1/services/listings/search", params={"q": "clean"})
+    assert [item["id"] for item in resp.json()] == [description_hit["id"]]
+
+
+def test_categories_etag_and_invalidation(client: TestClient) -> None:
+    client.post("/api/v1/services/categories", json={"name": "Cleaning"})
+    first = client.get("/api/v1/services/categories")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert "max-age" in first.headers["Cache-Control"]
+
+    cached = client.get("/api/v1/services/categories", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+    client.post("/api/v1/services/categories", json={"name": "Plumbing"})
+    refreshed = client.get("/api/v1/services/categories", headers={"If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert [item["name"] for item in refreshed.json()] == ["Cleaning", "Plumbing"]
+    assert refreshed.headers["ETag"] != etag
+
+
+def test_categories_snapshot_expires_after_max_age(
+    client: TestClient, session: Session, monkeypatch
+) -> None:
+    client.post("/api/v1/services/categories", json={"name": "Cleaning"})
+    assert len(client.get("/api/v1/services/categories").json()) == 1
+    # Written behind the API's back, so no invalidation is published.
+    session.add(ServiceCategory(name="Roofing"))
+    session.commit()
+    assert len(client.get("/api/v1/services/categories").json()) == 1
+
+    monkeypatch.setattr(categories_snapshot, "max_age_seconds", 0.05)
+    time.sleep(0.05)
+    assert len(client.get("/api/v1/services/categories").json()) == 2
+
+
+def test_batch_import_streams_ndjson_and_reports_bad_rows(
+    client: TestClient, session: Session, monkeypatch
+) -> None:
+    category = client.post("/api/v1/services/categories", json={"name": "Gardening"}).json()["id"]
+    provider_token, _ = register(client, "08000000011", "SERVICE_PROVIDER")
+    provider_id = client.get("/api/v1/users/me", headers=auth_headers(provider_token)).json()["id"]
+    admin = {"phone": "08000000099", "password": "Passw0rd!", "first_name": "A", "last_name": "B"}
+    refused = client.post("/api/v1/auth/register", json={**admin, "role": "ADMIN"})
+    assert refused.status_code == 403
+    assert client.post("/api/v1/auth/register", json=admin).status_code == 201
+    grant_admin(session, admin["phone"])
+    admin_token = client.post(
+        "/api/v1/auth/login", data={"username": admin["phone"], "password": admin["password"]}
+    ).json()["access_token"]
+
+    listing = {"type": "listing", "provider_id": provider_id, "category_id": category}
+    rows = [
+        json.dumps({**listing, "title": f"Hedge trimming {n}", "description": "x", "base_price": 9})
+        for n in range(5)
+    ]
+    rows += [
+        "not json",
+        json.dumps({**listing, "title": "Free", "description": "x", "base_price": 0}),
+        json.dumps(
+            {**listing, "category_id": 999, "title": "T", "description": "x", "base_price": 5}
+        ),
+        "",
+        json.dumps(
+            {
+                "type": "availability",
+                "user_id": provider_id,
+                "day_of_week": "Monday",
+                "start_time": "08:00:00",
+                "end_time": "12:00:00",
+            }
+        ),
+        json.dumps({"type": ["listing"]}),
+    ]
+
+    def body():
+        for row in rows:
+            yield (row + "\n").encode()
+
+    assert (
+        client.post(
+            "/api/v1/services/listings:batch", content=body(), headers=auth_headers(provider_token)
+        ).status_code
+        == 403
+    )
+    resp = client.post(
+        "/api/v1/services/listings:batch",
+        content=body(),
+        headers={**auth_headers(admin_token), "Content-Type": "application/x-ndjson"},
+    )
+    assert resp.status_code == 200
+    result = resp.json()
+    assert result["listings_created"] == 5
+    assert result["availability_created"] == 1
+    assert result["failed"] == 4
+    details = {error["line"]: error["detail"] for error in result["errors"]}
+    assert sorted(details) == [6, 7, 8, 11]
+    assert details[8] == "Unknown category 999"
+    assert details[11] == "type must be one of listing, availability"
+
+    # Bulk inserts skip the mapper events, so the search index is filled explicitly.
+    found = client.get("/api/v1/services/listings/search", params={"q": "hedge"}).json()
+    assert len(found) == 5
+
+    # A database error that no single row caused fails its chunk, not the whole import.
+    importer = BulkImporter(session)
+    errors = iter([OperationalError("INSERT", {}, Exception("database is locked"))])
+    insert = importer._insert
+
+    def insert_after_a_lock_error(rows):
+        for error in errors:
+            raise error
+        return insert(rows)
+
+    monkeypatch.setattr(importer, "_insert", insert_after_a_lock_error)
+    importer.import_chunk([(1, rows[0].encode())])
+    importer.import_chunk([(2, rows[1].encode())])
+    assert importer.result.failed == 1
+    assert importer.result.errors[0].line == 1
+    assert importer.result.listings_created == 1
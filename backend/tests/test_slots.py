@@ -0,0 +1,156 @@
+from datetime import date, datetime, time, timedelta
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.api.deps import get_db, get_read_db
+from app.api.routes.users import list_free_slots
+from app.core.slots import compute_free_slots, fits_availability, provider_free_slots
+from app.models import Availability, DayOfWeek
+from tests.conftest import auth_headers
+
+
+def at(day: date, hour: int, minute: int = 0) -> datetime:
+    return datetime.combine(day, time(hour, minute))
+
+
+def test_compute_free_slots_subtracts_bookings_and_closed_windows() -> None:
+    monday = date(2030, 1, 7)
+    windows = [
+        Availability(day_of_week=DayOfWeek.MONDAY, start_time=time(9), end_time=time(17)),
+        Availability(
+            day_of_week=DayOfWeek.MONDAY,
+            start_time=time(12),
+            end_time=time(13),
+            is_available=False,
+        ),
+        Availability(day_of_week=DayOfWeek.TUESDAY, start_time=time(9), end_time=time(11)),
+    ]
+    bookings = [
+        (at(monday, 8), at(monday, 10)),  # starts before opening
+        (at(monday, 10, 30), at(monday, 11)),
+        (at(monday, 15), at(monday, 16)),
+        (at(monday, 15, 30), at(monday, 17, 30)),  # overlaps the previous one and closing
+    ]
+
+    free = compute_free_slots(windows, bookings, monday, monday + timedelta(days=7))
+    assert free == [
+        (at(monday, 10), at(monday, 10, 30)),
+        (at(monday, 11), at(monday, 12)),
+        (at(monday, 13), at(monday, 15)),
+        (at(monday + timedelta(days=1), 9), at(monday + timedelta(days=1), 11)),
+    ]
+
+    long_enough = compute_free_slots(
+        windows, bookings, monday, monday + timedelta(days=7), timedelta(hours=1)
+    )
+    assert long_enough == free[1:]
+
+
+def test_bookings_fit_exactly_the_time_offered_as_free() -> None:
+    monday = date(2030, 1, 7)
+    windows = [
+        Availability(day_of_week=DayOfWeek.MONDAY, start_time=time(9), end_time=time(12)),
+        Availability(day_of_week=DayOfWeek.MONDAY, start_time=time(12), end_time=time(17)),
+        Availability(
+            day_of_week=DayOfWeek.MONDAY,
+            start_time=time(15),
+            end_time=time(16),
+            is_available=False,
+        ),
+    ]
+
+    assert compute_free_slots(windows, [], monday, monday + timedelta(days=1)) == [
+        (at(monday, 9), at(monday, 15)),
+        (at(monday, 16), at(monday, 17)),
+    ]
+    assert fits_availability(windows, at(monday, 11), at(monday, 13))  # across adjacent windows
+    assert not fits_availability(windows, at(monday, 14), at(monday, 16))  # into a closed one
+    assert not fits_availability(windows, at(monday, 16, 30), at(monday, 17, 30))
+
+
+def test_free_slots_never_start_in_the_past(session: Session) -> None:
+    session.add_all(
+        Availability(user_id=999, day_of_week=day, start_time=time(0), end_time=time(23, 59))
+        for day in DayOfWeek
+    )
+    session.commit()
+    today = datetime.utcnow().date()
+
+    before = datetime.utcnow()
+    slots = provider_free_slots(session, 999, today, today + timedelta(days=2))
+    assert all(slot.start >= before for slot in slots)
+    assert slots[-1].start == at(today + timedelta(days=1), 0)
+
+
+def test_slots_endpoint_reflects_new_bookings(client: TestClient) -> None:
+    availability = [{"day_of_week": "Monday", "start_time": "09:00", "end_time": "17:00"}]
+    provider = {
+        "phone": "08000000071",
+        "password": "Passw0rd!",
+        "first_name": "Pro",
+        "last_name": "Helper",
+        "role": "SERVICE_PROVIDER",
+        "availability": availability,
+    }
+    assert client.post("/api/v1/auth/register", json=provider).status_code == 201
+    provider_token = client.post(
+        "/api/v1/auth/login", data={"username": provider["phone"], "password": "Passw0rd!"}
+    ).json()["access_token"]
+    provider_id = client.get("/api/v1/users/me", headers=auth_headers(provider_token)).json()["id"]
+    seeker = {**provider, "phone": "08000000072", "role": "SERVICE_SEEKER", "availability": None}
+    assert client.post("/api/v1/auth/register", json=seeker).status_code == 201
+    seeker_token = client.post(
+        "/api/v1/auth/login", data={"username": seeker["phone"], "password": "Passw0rd!"}
+    ).json()["access_token"]
+
+    category_id = client.post("/api/v1/services/categories", json={"name": "Tiling"}).json()["id"]
+    listing = {
+        "category_id": category_id,
+        "title": "Tiling",
+        "description": "Floors",
+        "base_price": 30,
+    }
+    listing_id = client.post(
+        "/api/v1/services/listings", json=listing, headers=auth_headers(provider_token)
+    ).json()["id"]
+
+    today = datetime.utcnow().date()
+    monday = today + timedelta(days=7 - today.weekday())
+    params = {"start": monday.isoformat(), "end": (monday + timedelta(days=1)).isoformat()}
+    url = f"/api/v1/users/{provider_id}/slots"
+    assert client.get(url, params=params).json() == [
+        {"start": at(monday, 9).isoformat(), "end": at(monday, 17).isoformat()}
+    ]
+
+    booking = client.post(
+        "/api/v1/bookings/",
+        json={
+            "listing_id": listing_id,
+            "provider_id": provider_id,
+            "scheduled_at": at(monday, 11).isoformat(),
+            "duration_hours": 2,
+            "location": "Site",
+            "total_price": 60,
+        },
+        headers=auth_headers(seeker_token),
+    )
+    assert booking.status_code == 201
+    # The cached result for this range was dropped when the booking committed.
+    assert client.get(url, params=params).json() == [
+        {"start": at(monday, 9).isoformat(), "end": at(monday, 11).isoformat()},
+        {"start": at(monday, 13).isoformat(), "end": at(monday, 17).isoformat()},
+    ]
+
+    seeker_id = client.get("/api/v1/users/me", headers=auth_headers(seeker_token)).json()["id"]
+    assert client.get(f"/api/v1/users/{seeker_id}/slots").status_code == 404
+    bad_range = {"start": monday.isoformat(), "end": (monday + timedelta(days=60)).isoformat()}
+    assert client.get(url, params=bad_range).status_code == 400
+
+
+def test_slots_are_computed_from_the_primary() -> None:
+    # Cached per slot version, which only the primary's commits bump.
+    defaults = list_free_slots.__defaults__
+    dependencies = {getattr(default, "dependency", None) for default in defaults}
+    assert get_db in dependencies
+    assert get_read_db not in dependencies
@@ -0,0 +1,106 @@
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from app.models import User, UserSkill
+from tests.conftest import auth_headers, register
+
+
+def register_provider(client: TestClient, phone: str, city: str, **coordinates) -> str:
+    address = {"street": "1 Main St", "city": city, "state": "LA", **coordinates}
+    return register(client, phone, "SERVICE_PROVIDER", address=address)[0]
+
+
+def test_provider_search_filters_and_rating_order(
+    client: TestClient, session: Session, query_budget
+) -> None:
+    cleaning = client.post("/api/v1/services/categories", json={"name": "Cleaning"}).json()["id"]
+    tokens = {
+        "lagos_cleaner": register_provider(client, "08000000081", "Lagos"),
+        "lagos_plumber": register_provider(client, "08000000082", "lagos"),
+        "abuja_cleaner": register_provider(client, "08000000083", "Abuja"),
+    }
+    for name in ("lagos_cleaner", "abuja_cleaner"):
+        client.post(
+            "/api/v1/services/listings",
+            json={
+                "category_id": cleaning,
+                "title": "Cleaning",
+                "description": "Homes",
+                "base_price": 25,
+            },
+            headers=auth_headers(tokens[name]),
+        )
+
+    users = {user.phone: user for user in session.exec(select(User)).all()}
+    ratings = {"08000000081": 4.2, "08000000082": 4.8, "08000000083": 3.5}
+    for phone, rating in ratings.items():
+        users[phone].rating_avg = rating
+        session.add(users[phone])
+    session.add(UserSkill(user_id=users["08000000082"].id, skill_tag="plumbing"))
+    session.commit()
+    ids = {name: users[f"0800000008{i + 1}"].id for i, name in enumerate(tokens)}
+
+    def search(**params) -> list[int]:
+        resp = client.get("/api/v1/users/providers", params=params)
+        assert resp.status_code == 200
+        return [item["id"] for item in resp.json()]
+
+    assert search() == [ids["lagos_plumber"], ids["lagos_cleaner"], ids["abuja_cleaner"]]
+    assert search(city="LAGOS") == [ids["lagos_plumber"], ids["lagos_cleaner"]]
+    assert search(category_id=cleaning) == [ids["lagos_cleaner"], ids["abuja_cleaner"]]
+    assert search(category_id=cleaning, city="lagos") == [ids["lagos_cleaner"]]
+    assert search(skill="plumbing") == [ids["lagos_plumber"]]
+    assert search(min_rating=4) == [ids["lagos_plumber"], ids["lagos_cleaner"]]
+
+    with query_budget(1):
+        first = client.get("/api/v1/users/providers", params={"limit": 2})
+    assert "X-Next-Cursor" in first.headers
+    assert search(limit=2, after=first.headers["X-Next-Cursor"]) == [ids["abuja_cleaner"]]
+    assert set(first.json()[0]) == {
+        "id", "phone", "first_name", "last_name", "email", "avatar_url", "bio", "role",
+        "rating_avg", "rating_count",
+    }
+
+
+def test_proximity_filters_providers_and_listings(client: TestClient) -> None:
+    category = client.post("/api/v1/services/categories", json={"name": "Repairs"}).json()["id"]
+    places = {
+        "08000000091": {"city": "Lagos", "latitude": 6.5244, "longitude": 3.3792},
+        "08000000092": {"city": "Ikeja", "latitude": 6.6018, "longitude": 3.3515},  # ~9 km
+        "08000000093": {"city": "Abuja", "latitude": 9.0765, "longitude": 7.3986},
+    }
+    listing_ids = {}
+    for phone, place in places.items():
+        token = register_provider(client, phone, **place)
+        body = {
+            "category_id": category,
+            "title": "Repairs",
+            "description": "Fix things",
+            "base_price": 20,
+            # The Ikeja provider only travels 5 km.
+            "service_radius_km": 5 if place["city"] == "Ikeja" else None,
+        }
+        listing = client.post(
+            "/api/v1/services/listings", json=body, headers=auth_headers(token)
+        ).json()
+        listing_ids[place["city"]] = listing["id"]
+
+    def providers(**params) -> set[str]:
+        resp = client.get("/api/v1/users/providers", params=params)
+        assert resp.status_code == 200
+        return {item["phone"] for item in resp.json()}
+
+    assert providers(near="6.5244,3.3792", radius_km=5) == {"08000000091"}
+    assert providers(near="6.5244,3.3792", radius_km=15) == {"08000000091", "08000000092"}
+    assert len(providers(near="6.5244,3.3792", radius_km=200)) == 2
+    assert client.get("/api/v1/users/providers", params={"near": "north"}).status_code == 400
+
+    listings = client.get(
+        "/api/v1/services/listings", params={"near": "6.5244,3.3792", "radius_km": 15}
+    ).json()
+    # Ikeja is within the search radius but outside its own 5 km service radius.
+    assert [item["id"] for item in listings] == [listing_ids["Lagos"]]
+    near_ikeja = client.get(
+        "/api/v1/services/listings", params={"near": "6.6,3.35", "radius_km": 15}
+    ).json()
+    assert {item["id"] for item in near_ikeja} == {listing_ids["Lagos"], listing_ids["Ikeja"]}